@@ -0,0 +1,21 @@
+import os
+
+import pytest
+
+from benchmarks.routes import respond
+from iexfinance.tests.standin import LocalServer
+
+
+@pytest.fixture(scope="session")
+def https_standin():
+    with LocalServer(fallback=respond, tls=True) as server:
+        # trust the throwaway certificate in sessions created by requests
+        os.environ["REQUESTS_CA_BUNDLE"] = server.certfile
+        yield server
+        del os.environ["REQUESTS_CA_BUNDLE"]
+
+
+@pytest.fixture(scope="session")
+def standin():
+    with LocalServer(fallback=respond) as server:
+        yield server
@@ -0,0 +1,329 @@
+"""
+Synthetic IEX Cloud response bodies shaped like the real endpoints, used by
+the stand-in routes and the decoding and conversion benchmarks.
+"""
+
+import datetime
+import json
+import random
+
+EXCHANGES = ("NAS", "NYS", "ASE", "PSE", "BATS")
+TYPES = ("cs", "et", "ps", "ad", "wt")
+SECTORS = (
+    "Communication Services",
+    "Consumer Discretionary",
+    "Consumer Staples",
+    "Energy",
+    "Financials",
+    "Health Care",
+    "Industrials",
+    "Information Technology",
+    "Materials",
+    "Real Estate",
+    "Utilities",
+)
+
+
+def symbols(count):
+    """Returns ``count`` distinct ticker-like symbols"""
+    out = []
+    for i in range(count):
+        name = ""
+        i += 26
+        while i:
+            i, r = divmod(i, 26)
+            name = chr(65 + r) + name
+        out.append(name)
+    return out
+
+
+def quote(symbol, rng):
+    price = round(rng.uniform(5, 500), 2)
+    return {
+        "symbol": symbol,
+        "companyName": "%s Inc." % symbol,
+        "primaryExchange": rng.choice(EXCHANGES),
+        "calculationPrice": "tops",
+        "open": price,
+        "openTime": 1596634200000,
+        "close": price,
+        "closeTime": 1596657600000,
+        "high": round(price * 1.02, 2),
+        "low": round(price * 0.98, 2),
+        "latestPrice": price,
+        "latestSource": "IEX real time price",
+        "latestTime": "11:02:49 AM",
+        "latestUpdate": 1596639769652,
+        "latestVolume": rng.randint(10**4, 10**8),
+        "iexRealtimePrice": price,
+        "iexRealtimeSize": rng.randint(1, 500),
+        "delayedPrice": price,
+        "previousClose": round(price * 0.99, 2),
+        "change": round(price * 0.01, 2),
+        "changePercent": 0.01,
+        "marketCap": rng.randint(10**7, 10**12),
+        "peRatio": round(rng.uniform(5, 80), 2),
+        "week52High": round(price * 1.3, 2),
+        "week52Low": round(price * 0.7, 2),
+        "ytdChange": round(rng.uniform(-0.5, 0.5), 6),
+        "isUSMarketOpen": True,
+    }
+
+
+def quote_one(symbol, seed=0):
+    """Body of a single-symbol ``quote`` response"""
+    return quote(symbol, random.Random("%s-%s" % (seed, symbol)))
+
+
+def quote_batch(count=100, seed=0):
+    """Body of a ``stock/market/batch?types=quote`` response"""
+    rng = random.Random(seed)
+    return {symbol: {"quote": quote(symbol, rng)} for symbol in symbols(count)}
+
+
+def ref_symbols(count=10000, seed=0):
+    """Body of a ``ref-data/symbols`` response"""
+    rng = random.Random(seed)
+    return [
+        {
+            "symbol": symbol,
+            "exchange": rng.choice(EXCHANGES),
+            "name": "%s Corp." % symbol,
+            "date": "2020-08-05",
+            "type": rng.choice(TYPES),
+            "iexId": "IEX_%s" % symbol,
+            "region": "US",
+            "currency": "USD",
+            "isEnabled": True,
+        }
+        for symbol in symbols(count)
+    ]
+
+
+def encode(body):
+    return json.dumps(body).encode()
+
+
+def _trading_days(count, end=None):
+    """Last ``count`` weekdays up to ``end`` (default today), oldest first"""
+    day = end or datetime.date.today()
+    out = []
+    while len(out) < count:
+        if day.weekday() < 5:
+            out.append(day)
+        day -= datetime.timedelta(days=1)
+    return out[::-1]
+
+
+def chart(symbol, days=252, close_only=False, seed=0):
+    """Daily bars of a ``chart`` response (oldest first)"""
+    rng = random.Random("%s-%s" % (seed, symbol))
+    price = rng.uniform(5, 500)
+    out = []
+    for day in _trading_days(days):
+        price = max(1.0, price * (1 + rng.gauss(0, 0.02)))
+        close = round(price, 2)
+        volume = rng.randint(10**5, 10**8)
+        if close_only:
+            out.append({"date": day.isoformat(), "close": close, "volume": volume})
+            continue
+        out.append(
+            {
+                "date": day.isoformat(),
+                "open": round(price * rng.uniform(0.98, 1.02), 2),
+                "close": close,
+                "high": round(price * 1.03, 2),
+                "low": round(price * 0.97, 2),
+                "volume": volume,
+                "uOpen": close,
+                "uClose": close,
+                "uHigh": round(price * 1.03, 2),
+                "uLow": round(price * 0.97, 2),
+                "uVolume": volume,
+                "change": round(rng.gauss(0, 1), 2),
+                "changePercent": round(rng.gauss(0, 0.02), 4),
+                "label": day.strftime("%b %d, %y"),
+                "changeOverTime": round(rng.gauss(0, 0.1), 6),
+            }
+        )
+    return out
+
+
+def history(count=500, days=1260, seed=0):
+    """Body of a ``stock/market/batch?types=chart`` response for ``count``
+    symbols (copies of the bars of one symbol, which are quicker to generate
+    and cost the same to convert)"""
+    bars = chart("HIST", days=days, seed=seed)
+    return {symbol: {"chart": [dict(bar) for bar in bars]} for symbol in symbols(count)}
+
+
+def intraday(symbol, minutes=390, seed=0):
+    """Minute bars of a ``chart/1d`` or ``intraday-prices`` response"""
+    rng = random.Random("%s-%s" % (seed, symbol))
+    price = rng.uniform(5, 500)
+    day = _trading_days(1)[0]
+    out = []
+    for i in range(minutes):
+        hour, minute = divmod(9 * 60 + 30 + i, 60)
+        price = max(1.0, price * (1 + rng.gauss(0, 0.001)))
+        out.append(
+            {
+                "date": day.isoformat(),
+                "minute": "%02d:%02d" % (hour, minute),
+                "label": "%d:%02d %s"
+                % ((hour - 1) % 12 + 1, minute, "AM" if hour < 12 else "PM"),
+                "high": round(price * 1.001, 2),
+                "low": round(price * 0.999, 2),
+                "open": round(price, 2),
+                "close": round(price, 2),
+                "average": round(price, 3),
+                "volume": rng.randint(0, 5000),
+                "notional": round(price * rng.randint(0, 5000), 2),
+                "numberOfTrades": rng.randint(0, 50),
+            }
+        )
+    return out
+
+
+def key_stats(symbol, seed=0):
+    """Body of a ``stats`` (key stats) response"""
+    rng = random.Random("%s-%s" % (seed, symbol))
+    return {
+        "companyName": "%s Inc." % symbol,
+        "marketcap": rng.randint(10**7, 10**12),
+        "week52high": round(rng.uniform(50, 500), 2),
+        "week52low": round(rng.uniform(5, 50), 2),
+        "sharesOutstanding": rng.randint(10**6, 10**10),
+        "avg10Volume": rng.randint(10**4, 10**8),
+        "avg30Volume": rng.randint(10**4, 10**8),
+        "employees": rng.randint(10, 10**5),
+        "ttmEPS": round(rng.uniform(-5, 20), 2),
+        "ttmDividendRate": round(rng.uniform(0, 5), 2),
+        "dividendYield": round(rng.uniform(0, 0.05), 4),
+        "nextEarningsDate": "2020-10-29",
+        "peRatio": round(rng.uniform(5, 80), 2),
+        "beta": round(rng.uniform(0.5, 2), 4),
+        "day200MovingAvg": round(rng.uniform(5, 500), 2),
+        "day50MovingAvg": round(rng.uniform(5, 500), 2),
+    }
+
+
+def company(symbol, seed=0):
+    """Body of a ``company`` response"""
+    rng = random.Random("%s-%s" % (seed, symbol))
+    return {
+        "symbol": symbol,
+        "companyName": "%s Inc." % symbol,
+        "exchange": rng.choice(EXCHANGES),
+        "industry": "Software",
+        "website": "http://www.%s.com" % symbol.lower(),
+        "description": "%s designs and sells things." % symbol,
+        "CEO": "Jane Doe",
+        "securityName": "%s Inc." % symbol,
+        "issueType": "cs",
+        "sector": "Technology",
+        "employees": rng.randint(10, 10**5),
+        "tags": ["Technology", "Software"],
+        "country": "US",
+    }
+
+
+def tops(symbols, seed=0):
+    """Body of a ``tops`` response"""
+    rng = random.Random(seed)
+    out = []
+    for symbol in symbols:
+        price = round(rng.uniform(5, 500), 2)
+        out.append(
+            {
+                "symbol": symbol,
+                "sector": "technology",
+                "securityType": "commonstock",
+                "bidPrice": round(price * 0.999, 2),
+                "bidSize": rng.randint(0, 1000),
+                "askPrice": round(price * 1.001, 2),
+                "askSize": rng.randint(0, 1000),
+                "lastUpdated": 1596639769652,
+                "lastSalePrice": price,
+                "lastSaleSize": rng.randint(1, 500),
+                "lastSaleTime": 1596639769000,
+                "volume": rng.randint(10**3, 10**7),
+            }
+        )
+    return out
+
+
+def deep(symbol, levels=10, seed=0):
+    """Body of a ``deep`` response"""
+    rng = random.Random("%s-%s" % (seed, symbol))
+    price = round(rng.uniform(5, 500), 2)
+    return {
+        "symbol": symbol,
+        "marketPercent": 0.02,
+        "volume": rng.randint(10**3, 10**7),
+        "lastSalePrice": price,
+        "lastSaleSize": rng.randint(1, 500),
+        "lastSaleTime": 1596639769000,
+        "lastUpdated": 1596639769652,
+        "bids": [
+            {
+                "price": round(price - 0.01 * i, 2),
+                "size": rng.randint(1, 1000),
+                "timestamp": 1596639769000,
+            }
+            for i in range(levels)
+        ],
+        "asks": [
+            {
+                "price": round(price + 0.01 * i, 2),
+                "size": rng.randint(1, 1000),
+                "timestamp": 1596639769000,
+            }
+            for i in range(levels)
+        ],
+        "systemEvent": {"systemEvent": "R", "timestamp": 1596634200000},
+        "tradingStatus": {"status": "T", "reason": "", "timestamp": 1596634200000},
+        "trades": [],
+    }
+
+
+def stats_intraday(seed=0):
+    """Body of a ``stats/intraday`` response"""
+    rng = random.Random(seed)
+    return {
+        name: {"value": rng.randint(10**6, 10**9), "lastUpdated": 1596639769652}
+        for name in ("volume", "symbolsTraded", "routedVolume", "notional")
+    }
+
+
+def stats_recent(days=90, seed=0):
+    """Body of a ``stats/recent`` response"""
+    rng = random.Random(seed)
+    return [
+        {
+            "date": day.isoformat(),
+            "volume": rng.randint(10**8, 10**9),
+            "routedVolume": rng.randint(10**7, 10**8),
+            "marketShare": round(rng.uniform(0.01, 0.05), 5),
+            "isHalfday": False,
+            "litVolume": rng.randint(10**7, 10**8),
+        }
+        for day in _trading_days(days)
+    ]
+
+
+def time_series(count=1000, seed=0):
+    """Body of a ``time-series/<id>/<key>`` response (e.g. filings)"""
+    rng = random.Random(seed)
+    return [
+        {
+            "dateFiled": day.isoformat(),
+            "formFiled": rng.choice(("10-K", "10-Q")),
+            "revenue": rng.randint(10**6, 10**11),
+            "netIncome": rng.randint(-(10**9), 10**10),
+            "totalAssets": rng.randint(10**7, 10**12),
+            "reportDate": day.isoformat(),
+            "updated": 1596639769652,
+        }
+        for day in _trading_days(count)
+    ]
@@ -0,0 +1,162 @@
+"""
+Stand-in routes for the IEX Cloud endpoints wrapped by the library.
+
+Bodies are synthesised from ``payloads`` on first request and encoded once,
+so that the stand-in spends as little time as possible (and holds the GIL as
+briefly as possible) while the client is being measured.
+"""
+
+from functools import lru_cache
+
+from benchmarks import payloads
+
+# Trading days returned for each chart range
+CHART_DAYS = {
+    "5d": 5,
+    "1m": 21,
+    "3m": 63,
+    "6m": 126,
+    "ytd": 200,
+    "1y": 252,
+    "2y": 504,
+    "5y": 1260,
+    "max": 3780,
+}
+
+
+def _symbol_payload(kind, symbol, params):
+    if kind == "quote":
+        return payloads.quote_one(symbol)
+    if kind == "chart":
+        if params.get("range") in ("1d", "date"):
+            return payloads.intraday(symbol)
+        return payloads.chart(
+            symbol,
+            CHART_DAYS.get(params.get("range", "1m"), 21),
+            close_only=params.get("chartCloseOnly") == "True",
+        )
+    if kind == "intraday-prices":
+        return payloads.intraday(symbol)
+    if kind == "stats":
+        return payloads.key_stats(symbol)
+    if kind == "company":
+        return payloads.company(symbol)
+    if kind == "price":
+        return payloads.quote_one(symbol)["latestPrice"]
+    return {}
+
+
+@lru_cache(maxsize=None)
+def _batch(symbols, types, params):
+    params = dict(params)
+    return payloads.encode(
+        {
+            symbol: {kind: _symbol_payload(kind, symbol, params) for kind in types}
+            for symbol in symbols
+        }
+    )
+
+
+@lru_cache(maxsize=None)
+def _stock(path, params):
+    # stock/<symbol>/<endpoint>[/<range>[/<date>]]
+    parts = path.split("/")
+    symbol, kind, rest = parts[1], parts[2], parts[3:]
+    params = dict(params)
+    if kind == "chart" and rest:
+        params["range"] = rest[0]
+    return payloads.encode(_symbol_payload(kind, symbol, params))
+
+
+def batch(path, params):
+    if path.startswith("stock/market/batch"):
+        symbols = tuple(params.get("symbols", "AAPL").split(","))
+        types = tuple(params.get("types", "quote").split(","))
+        other = tuple(
+            sorted((k, v) for k, v in params.items() if k not in ("symbols", "types"))
+        )
+        return _batch(symbols, types, other)
+    return _stock(path, tuple(sorted(params.items())))
+
+
+@lru_cache(maxsize=None)
+def _tops(symbols):
+    return payloads.encode(
+        payloads.tops(symbols.split(",") if symbols else payloads.symbols(8000))
+    )
+
+
+def tops(path, params):
+    return _tops(params.get("symbols", ""))
+
+
+@lru_cache(maxsize=None)
+def _deep(symbols):
+    return payloads.encode(payloads.deep(symbols.split(",")[0]))
+
+
+def deep(path, params):
+    return _deep(params.get("symbols", "AAPL"))
+
+
+@lru_cache(maxsize=None)
+def _stats(path):
+    if path == "stats/intraday":
+        body = payloads.stats_intraday()
+    elif path == "stats/recent":
+        body = payloads.stats_recent()
+    else:
+        body = {}
+    return payloads.encode(body)
+
+
+def stats(path, params):
+    return _stats(path)
+
+
+@lru_cache(maxsize=None)
+def _ref_data(path):
+    if path.endswith("symbols"):
+        return payloads.encode(payloads.ref_symbols())
+    if path == "ref-data/sectors":
+        return payloads.encode([{"name": name} for name in payloads.SECTORS])
+    return payloads.encode([])
+
+
+def ref_data(path, params):
+    return _ref_data(path)
+
+
+@lru_cache(maxsize=None)
+def _time_series(path):
+    if path == "time-series":
+        return payloads.encode(
+            [{"id": "REPORTED_FINANCIALS", "description": "Financials"}]
+        )
+    return payloads.encode(payloads.time_series())
+
+
+def time_series(path, params):
+    return _time_series(path)
+
+
+ROUTES = [
+    ("stock/", batch),
+    ("tops", tops),
+    ("deep", deep),
+    ("stats", stats),
+    ("ref-data", ref_data),
+    ("time-series", time_series),
+]
+
+# Responses report one message used, as IEX Cloud does
+HEADERS = {"iexcloud-messages-used": "1"}
+
+
+def respond(path, params):
+    """Response of the first route whose prefix matches ``path`` (used as the
+    ``LocalServer`` fallback)"""
+    for prefix, handler in ROUTES:
+        if path.startswith(prefix):
+            return 200, handler(path, params), HEADERS
+    return 404, b"Not found"
@@ -0,0 +1,31 @@
+"""
+JSON decoding: the standard library against the optional fast decoders, on a
+100-symbol quote batch and a 10,000-symbol ``ref-data/symbols`` response.
+
+Run with ``pytest benchmarks/test_decoders.py``. Decoders which are not
+installed are skipped.
+"""
+
+import pytest
+
+from benchmarks import payloads
+from iexfinance.utils.decoders import DECODERS, get_decoder
+
+BODIES = {
+    "quote_batch_100": payloads.encode(payloads.quote_batch(100)),
+    "ref_symbols_10k": payloads.encode(payloads.ref_symbols(10000)),
+}
+
+
+@pytest.mark.parametrize("body", sorted(BODIES))
+@pytest.mark.parametrize("decoder", list(DECODERS))
+def test_decode(benchmark, decoder, body):
+    try:
+        _, loads = get_decoder(decoder)
+    except ImportError:
+        pytest.skip("%s is not installed" % decoder)
+    data = BODIES[body]
+    benchmark.group = body
+    benchmark.extra_info["bytes"] = len(data)
+    result = benchmark(loads, data)
+    assert len(result) in (100, 10000)
@@ -0,0 +1,97 @@
+"""
+DataFrame construction from decoded payloads: the former transposes of frames
+built with one column per symbol (or bar) against the column-wise builders
+used by ``Stock``, on a 100-symbol quote batch and on 5 years of daily bars of
+20 symbols, and the former and current conversions of ``get_historical_data``
+on 4 of 5 years of daily bars of 500 symbols.
+
+Run with ``pytest benchmarks/test_frames.py``.
+"""
+
+import datetime
+import functools
+
+import pandas as pd
+import pytest
+
+from benchmarks import payloads
+from iexfinance.stocks.historical import HistoricalReader
+from iexfinance.stocks.schemas import SCHEMAS
+from iexfinance.utils.columnar import records_to_frame
+
+QUOTES = {symbol: data["quote"] for symbol, data in payloads.quote_batch(100).items()}
+CHARTS = {symbol: payloads.chart(symbol, days=1260) for symbol in payloads.symbols(20)}
+
+
+def _transpose(out):
+    return pd.DataFrame(out).T
+
+
+def _columnar(out):
+    return records_to_frame(list(out.values()), index=list(out))
+
+
+@pytest.mark.parametrize(
+    "build", [_transpose, _columnar], ids=["transpose", "columnar"]
+)
+def test_quote_batch(benchmark, build):
+    benchmark.group = "quote_batch_100"
+    df = benchmark(build, QUOTES)
+    assert list(df.index) == list(QUOTES)
+
+
+def _chart_transpose(out):
+    out = {(symbol, day["date"]): day for symbol in out for day in out[symbol]}
+    return pd.DataFrame.from_dict(out, orient="columns").T
+
+
+def _chart_columnar(out):
+    bars = [day for symbol in out for day in out[symbol]]
+    data = records_to_frame(bars, schema=SCHEMAS["chart"])
+    symbols = [symbol for symbol in out for _ in out[symbol]]
+    data.index = pd.MultiIndex.from_arrays([symbols, data["date"]])
+    return data
+
+
+@pytest.mark.parametrize(
+    "build", [_chart_transpose, _chart_columnar], ids=["transpose", "columnar"]
+)
+def test_chart(benchmark, build):
+    benchmark.group = "chart_20x5y"
+    df = benchmark(build, CHARTS)
+    assert len(df) == 20 * 1260
+
+
+@functools.lru_cache()
+def _history():
+    """500 symbols x 5 years, and a reader of the last 4 years"""
+    out = payloads.history(500, days=1260)
+    dates = [bar["date"] for bar in next(iter(out.values()))["chart"]]
+    start = datetime.date.fromisoformat(dates[252])
+    end = datetime.date.fromisoformat(dates[-1])
+    reader = HistoricalReader(list(out), start, end, token="pk_benchmark")
+    return out, reader
+
+
+def _history_transpose(out, reader):
+    out = {(symbol, day["date"]): day for symbol in out for day in out[symbol]["chart"]}
+    result = pd.DataFrame.from_dict(out, orient="columns").T
+    result.index = result.index.set_levels(
+        [result.index.levels[0], pd.to_datetime(result.index.levels[1])]
+    )
+    return result.loc[pd.IndexSlice[:, reader.start : reader.end], :]
+
+
+def _history_long(out, reader):
+    return reader._format_output(out)
+
+
+@pytest.mark.parametrize(
+    "build", [_history_transpose, _history_long], ids=["transpose", "long"]
+)
+def test_history(benchmark, build):
+    out, reader = _history()
+    benchmark.group = "history_500x5y"
+    # a single round: the former conversion takes several seconds
+    df = benchmark.pedantic(build, args=(out, reader), rounds=1)
+    assert len(df) == 500 * 1008
@@ -0,0 +1,35 @@
+"""
+Import time: ``import iexfinance.stocks`` in a fresh interpreter, less the
+start-up time of the interpreter itself.
+
+Run with ``pytest benchmarks/test_imports.py``. The test fails if the median
+import time exceeds ``IMPORT_TIME_BUDGET``, which would typically mean that
+pandas or requests is imported eagerly again.
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+
+# Seconds; pandas alone takes several hundred milliseconds to import
+IMPORT_TIME_BUDGET = 0.15
+
+
+def _run(code):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True)
+    return time.perf_counter() - start
+
+
+def test_import_time(benchmark):
+    baseline = statistics.median(_run("pass") for _ in range(5))
+    elapsed = benchmark.pedantic(
+        _run, args=("import iexfinance.stocks",), rounds=10, iterations=1
+    )
+    # with --benchmark-disable, the import is timed once and no stats are kept
+    if benchmark.stats is not None:
+        elapsed = benchmark.stats.stats.median
+    median = elapsed - baseline
+    benchmark.extra_info["import_time"] = median
+    assert median < IMPORT_TIME_BUDGET
@@ -0,0 +1,91 @@
+"""
+Latency and throughput of the main readers against the local stand-in,
+covering request, decoding and output conversion end to end.
+
+``test_latency`` times one call of each reader; ``test_throughput`` makes
+``CALLS`` calls from ``THREADS`` threads sharing one client and reports the
+calls per second in ``extra_info``. The stand-in serves plain HTTP so that
+TLS does not dominate the small responses.
+
+Run with ``pytest benchmarks/test_readers.py``.
+"""
+
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from benchmarks import payloads
+from iexfinance import Client
+from iexfinance.data_apis import get_time_series
+from iexfinance.iexdata import get_deep, get_stats_intraday, get_stats_recent, get_tops
+from iexfinance.refdata import get_symbols
+from iexfinance.stocks import Stock, get_historical_data, get_historical_intraday
+
+TOKEN = "pk_benchmark"
+THREADS = 8
+CALLS = 64
+
+SYMBOLS_100 = payloads.symbols(100)
+START = datetime.date.today() - datetime.timedelta(days=300)
+END = datetime.date.today()
+
+# name -> callable(client, output_format)
+READERS = {
+    "quote_1": lambda c, f: Stock("AAPL", client=c, output_format=f).get_quote(),
+    "quote_100": lambda c, f: Stock(SYMBOLS_100, client=c, output_format=f).get_quote(),
+    "key_stats_100": lambda c, f: Stock(
+        SYMBOLS_100, client=c, output_format=f
+    ).get_key_stats(),
+    "chart_1y": lambda c, f: get_historical_data(
+        "AAPL", START, END, client=c, output_format=f
+    ),
+    "chart_1y_10": lambda c, f: get_historical_data(
+        SYMBOLS_100[:10], START, END, client=c, output_format=f
+    ),
+    "intraday": lambda c, f: get_historical_intraday("AAPL", client=c, output_format=f),
+    "intraday_prices": lambda c, f: Stock(
+        "AAPL", client=c, output_format=f
+    ).get_intraday_prices(),
+    "tops_all": lambda c, f: get_tops(client=c, output_format=f),
+    "deep": lambda c, f: get_deep("AAPL", client=c, output_format=f),
+    "stats_intraday": lambda c, f: get_stats_intraday(client=c, output_format=f),
+    "stats_recent": lambda c, f: get_stats_recent(client=c, output_format=f),
+    "ref_symbols_10k": lambda c, f: get_symbols(client=c, output_format=f),
+    "time_series": lambda c, f: get_time_series(
+        "REPORTED_FINANCIALS", "AAPL", client=c, output_format=f
+    ),
+}
+
+
+@pytest.fixture
+def client(standin):
+    client = Client(token=TOKEN, base_url=standin.base_url, coalesce=False)
+    yield client
+    client.close()
+
+
+@pytest.mark.parametrize("output_format", ["json", "pandas"])
+@pytest.mark.parametrize("reader", sorted(READERS))
+def test_latency(benchmark, client, reader, output_format):
+    call = READERS[reader]
+    benchmark.group = "latency-%s" % reader
+    call(client, output_format)  # warm the connection and the stand-in
+    result = benchmark(call, client, output_format)
+    assert result is not None
+
+
+@pytest.mark.parametrize("reader", ["quote_1", "quote_100", "chart_1y", "tops_all"])
+def test_throughput(benchmark, client, reader):
+    call = READERS[reader]
+    benchmark.group = "throughput"
+    call(client, "json")
+
+    def burst():
+        with ThreadPoolExecutor(THREADS) as pool:
+            list(pool.map(lambda _: call(client, "json"), range(CALLS)))
+
+    benchmark.pedantic(burst, rounds=5)
+    # no stats are kept with --benchmark-disable
+    if benchmark.stats is not None:
+        benchmark.extra_info["calls_per_second"] = CALLS / benchmark.stats.stats.mean
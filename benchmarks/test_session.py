@@ -0,0 +1,43 @@
+"""
+Connection reuse: a fresh ``requests.Session`` per call against a shared
+``iexfinance.Client``, both talking to a local HTTPS stand-in.
+
+Run with ``pytest benchmarks/test_session.py``.
+"""
+
+import requests
+
+from iexfinance import Client
+from iexfinance.stocks import Stock
+
+TOKEN = "pk_benchmark"
+
+
+def test_fresh_session_per_call(benchmark, https_standin):
+    def call():
+        session = requests.session()
+        client = Client(token=TOKEN, base_url=https_standin.base_url, session=session)
+        Stock("AAPL", client=client, output_format="json").get_quote()
+        session.close()
+
+    before = https_standin.connections
+    benchmark(call)
+    handshakes = https_standin.connections - before
+    benchmark.extra_info["handshakes"] = handshakes
+    # with --benchmark-disable, the call is made once and no stats are kept
+    rounds = 1 if benchmark.stats is None else benchmark.stats.stats.rounds
+    assert handshakes >= rounds
+
+
+def test_shared_client(benchmark, https_standin):
+    client = Client(token=TOKEN, base_url=https_standin.base_url)
+
+    def call():
+        Stock("AAPL", client=client, output_format="json").get_quote()
+
+    before = https_standin.connections
+    benchmark(call)
+    handshakes = https_standin.connections - before
+    benchmark.extra_info["handshakes"] = handshakes
+    client.close()
+    assert handshakes == 1
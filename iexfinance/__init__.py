@@ -1,6 +1,7 @@
 import logging
 import os
 
+from iexfinance.client import Client, get_default_client, set_default_client  # noqa
 from iexfinance.utils.exceptions import ImmediateDeprecationError
 
 __author__ = "Addison Lynch"
@@ -1,5 +1,3 @@
-import pandas as pd
-
 from iexfinance.base import _IEXBase
 
 
@@ -22,6 +20,8 @@ class Metadata(Account):
         return "metadata"
 
     def _convert_output(self, out):
+        import pandas as pd
+
         return pd.DataFrame({"metadata": out})
 
 
@@ -1,5 +1,3 @@
-import pandas as pd
-
 from iexfinance.base import _IEXBase
 
 
@@ -18,6 +16,8 @@ class CloudCrypto(_IEXBase):
         return super(CloudCrypto, self).fetch()
 
     def _convert_output(self, out):
+        import pandas as pd
+
         return pd.DataFrame(out, index=[out["symbol"]])
 
 
@@ -47,6 +47,12 @@ class SocialSentiment(_IEXBase):
         else:
             return "/stock/%s/sentiment/%s" % (self.symbol, self.period_type)
 
+    @property
+    def url_template(self):
+        if self.date:
+            return "stock/{symbol}/sentiment/%s/{date}" % self.period_type
+        return "stock/{symbol}/sentiment/%s" % self.period_type
+
     def fetch(self):
         return super(SocialSentiment, self).fetch()
 
@@ -64,4 +70,6 @@ class CEOCompensation(_IEXBase):
         return super(CEOCompensation, self).fetch()
 
     def _convert_output(self, out):
+        import pandas as pd
+
         return pd.DataFrame(out, index=[out["symbol"]])
@@ -1,7 +1,5 @@
 from datetime import datetime
 
-import pandas as pd
-
 from iexfinance.base import _IEXBase
 
 
@@ -14,5 +12,7 @@ class APIReader(_IEXBase):
         return super(APIReader, self).fetch()
 
     def _convert_output(self, out):
+        import pandas as pd
+
         converted_date = datetime.fromtimestamp(out["time"] / 1000).strftime("%c")
         return pd.DataFrame(out, index=[converted_date])
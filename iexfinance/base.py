@@ -1,12 +1,23 @@
+import copy
+import hashlib
 import logging
 import os
 import time
 
-import requests
-
-from iexfinance.utils import _init_session
+from iexfinance.client import get_default_client
+from iexfinance.utils import no_pandas
+from iexfinance.utils.cache import ResponseCache
+from iexfinance.utils.columnar import (
+    TABLE_FORMATS,
+    concat_tables,
+    json_to_records,
+    records_to_table,
+    require,
+)
 from iexfinance.utils.exceptions import IEXAuthenticationError as auth_error
+from iexfinance.utils.events import RequestEvent
 from iexfinance.utils.exceptions import IEXQueryError
+from iexfinance.utils.streaming import iter_json_array
 
 # Data provided for free by IEX
 # See https://iextrading.com/api-exhibit-a/ for additional information
@@ -14,6 +25,9 @@ from iexfinance.utils.exceptions import IEXQueryError
 
 logger = logging.getLogger(__name__)
 
+# Bytes read from the connection at a time when streaming responses
+_STREAM_READ_SIZE = 64 * 1024
+
 
 class _IEXBase(object):
     """
@@ -24,20 +38,40 @@ class _IEXBase(object):
     Attributes
     ----------
     retry_count: int, default 3, optional
-        Desired number of retries if a request fails
+        Desired number of retries if a request fails with a transient error
     pause: float default 0.5, optional
-        Pause time between retry attempts
+        Base pause time between retry attempts (see ``RetryPolicy``)
+    retry_policy: iexfinance.utils.retry.RetryPolicy, optional
+        Retry, backoff and timeout policy. Defaults to the policy of
+        ``client``.
     session: requests_cache.session, default None, optional
-        A cached requests-cache session
+        A cached requests-cache session. Defaults to the session of
+        ``client``.
     json_parse_int: datatype, default int, optional
         Desired integer parsing datatype
     json_parse_float: datatype, default float, optional
         Desired floating point parsing datatype
     output_format: str, default "pandas", optional
-        Desired output format (json or pandas DataFrame). This can also be
-        set using the environment variable ``IEX_OUTPUT_FORMAT``.
+        Desired output format (json, pandas DataFrame, arrow for a
+        ``pyarrow.Table`` or polars for a ``polars.DataFrame``). This can also
+        be set using the environment variable ``IEX_OUTPUT_FORMAT``.
     token: str, optional
         Authentication token (required for use with IEX Cloud)
+    client: iexfinance.Client, optional
+        Client whose pooled session, token, version and retry settings are
+        shared by this reader. Defaults to the process-wide default client.
+    stream: bool, default False, optional
+        Parse large array responses incrementally while they are downloaded,
+        rather than buffering and parsing the whole response (only supported
+        by readers of array endpoints, such as ``get_symbols``). Streamed
+        responses bypass the response caches.
+    chunk_size: int, default 10000, optional
+        Number of array elements parsed and converted at a time when
+        streaming, which bounds peak memory use (see ``iter_chunks``)
+    hooks: list of callable, optional
+        Functions called with a ``RequestEvent`` (phase timings, response
+        size and endpoint label) after every call of this reader, in addition
+        to the hooks of ``client``
     """
 
     _URLS = {
@@ -50,7 +84,7 @@ class _IEXBase(object):
         "iexcloud-sandbox": "https://sandbox.iexapis.com/stable/",
     }
 
-    _VALID_FORMATS = ("json", "pandas")
+    _VALID_FORMATS = ("json", "pandas") + TABLE_FORMATS
     _VALID_API_VERSIONS = (
         "stable",
         "latest",
@@ -61,21 +95,47 @@ class _IEXBase(object):
         "iexcloud-sandbox",
     )
 
+    # Whether the data being formatted was served from the response cache
+    _from_cache = False
+    # Whether responses may be stored as snapshots in the client's disk cache
+    _persist = False
+    # Whether responses are JSON arrays which may be parsed incrementally
+    _streamable = False
+    # Axis along which converted chunks of a streamed response are joined
+    _chunk_axis = 0
+    # RequestEvent of the last call
+    last_event = None
+
     def __init__(self, **kwargs):
 
-        self.retry_count = kwargs.get("retry_count", 3)
-        self.pause = kwargs.get("pause", 0.5)
-        self.session = _init_session(kwargs.get("session"))
+        self.client = kwargs.get("client") or get_default_client()
+        self.retry_count = kwargs.get("retry_count", self.client.retry_count)
+        self.pause = kwargs.get("pause", self.client.pause)
+        self.retry_policy = kwargs.get("retry_policy") or self.client.retry_policy
+        if "retry_count" in kwargs or "pause" in kwargs:
+            self.retry_policy = self.retry_policy.replace(
+                retries=self.retry_count, backoff_factor=self.pause
+            )
+        self._session = kwargs.get("session")
         self.json_parse_int = kwargs.get("json_parse_int")
         self.json_parse_float = kwargs.get("json_parse_float")
+        self.stream = kwargs.get("stream", False)
+        if self.stream and not self._streamable:
+            raise ValueError("%s does not support streaming." % type(self).__name__)
+        self.chunk_size = kwargs.get("chunk_size", 10000)
+        self.hooks = list(kwargs.get("hooks") or [])
         self._output_format = kwargs.get(
             "output_format", os.getenv("IEX_OUTPUT_FORMAT")
         )
         if self.output_format not in self._VALID_FORMATS:
-            raise ValueError("Please enter a valid output format (json or pandas).")
+            raise ValueError(
+                "Please enter a valid output format (json, pandas, arrow or polars)."
+            )
+        if self.output_format in TABLE_FORMATS:
+            require(self.output_format)
         self.token = kwargs.get("token")
         if self.token is None:
-            self.token = os.getenv("IEX_TOKEN")
+            self.token = self.client.get_token()
         if not self.token or not isinstance(self.token, str):
             raise auth_error(
                 "The IEX Cloud API key must be provided "
@@ -88,7 +148,7 @@ class _IEXBase(object):
             os.environ["IEX_API_VERSION"] = "sandbox"
         # Get desired API version from environment variables
         # Defaults to IEX Cloud
-        self.version = os.getenv("IEX_API_VERSION", "stable")
+        self.version = self.client.version or os.getenv("IEX_API_VERSION", "stable")
         if self.version not in self._VALID_API_VERSIONS:
             raise ValueError("Please select a valid API version.")
 
@@ -96,6 +156,12 @@ class _IEXBase(object):
     def output_format(self):
         return self._output_format or "pandas"
 
+    @property
+    def session(self):
+        if self._session is not None:
+            return self._session
+        return self.client.session
+
     @property
     def params(self):
         return {}
@@ -104,6 +170,22 @@ class _IEXBase(object):
     def url(self):
         raise NotImplementedError
 
+    @property
+    def url_template(self):
+        """URL with the symbol and dates replaced by placeholders, used to
+        label requests (e.g. ``stock/{symbol}/chart/1d``). Readers whose URL
+        holds other request values (ids, keys or counts) override it, so that
+        the number of distinct labels stays bounded."""
+        symbol = getattr(self, "symbol", None)
+        segments = []
+        for segment in self.url.strip("/").split("/"):
+            if symbol and segment == symbol:
+                segment = "{symbol}"
+            elif segment.isdigit() and len(segment) in (6, 8):
+                segment = "{date}"
+            segments.append(segment)
+        return "/".join(segments)
+
     def _validate_response(self, response):
         """Ensures response from IEX server is valid.
 
@@ -125,31 +207,29 @@ class _IEXBase(object):
             If the JSON response is empty or throws an error
 
         """
-        # log the number of messages used
-        key = "iexcloud-messages-used"
-        if key in response.headers:
-            msg = response.headers[key]
-        else:
-            msg = "N/A"
-        logger.info("MESSAGES USED: %s" % msg)
-
         if response.text == "Unknown symbol":
             raise IEXQueryError(response.status_code, response.text)
         try:
-            json_response = response.json(
-                parse_int=self.json_parse_int, parse_float=self.json_parse_float
-            )
+            json_response = self._decode(response)
             if isinstance(json_response, str) and ("Error Message" in json_response):
                 raise IEXQueryError(response.status_code, response.text)
         except ValueError:
             raise IEXQueryError(response.status_code, response.text)
         return json_response
 
+    def _decode(self, response):
+        """Decodes a JSON response body with the client's decoder, or with
+        the standard library if custom parse hooks were requested"""
+        if self.json_parse_int or self.json_parse_float:
+            return response.json(
+                parse_int=self.json_parse_int, parse_float=self.json_parse_float
+            )
+        return self.client.decode(response.content)
+
     def _execute_iex_query(self, url):
         """Executes HTTP Request
-        Given a URL, execute HTTP request from IEX server. If request is
-        unsuccessful, attempt is made self.retry_count times with pause of
-        self.pause in between.
+        Given a URL, execute HTTP request from IEX server. Transient failures
+        are retried according to self.retry_policy.
 
         Parameters
         ----------
@@ -166,16 +246,183 @@ class _IEXBase(object):
         IEXQueryError
             If problems arise when making the query
         """
+        started = time.perf_counter()
+        self._from_cache = False
         params = self.params
+        event = self._new_event(url, params)
+        event.started = started
+        cache = self.client.cache
+        max_age = 0 if cache is None else self._cache_max_age(params)
+        key = ResponseCache.make_key(
+            url, params, self.json_parse_int, self.json_parse_float
+        )
+        if max_age != 0:
+            self._from_cache, data = cache.get(key, max_age)
+            if self._from_cache:
+                logger.debug("CACHE HIT: %s" % url)
+                event.cache = "memory"
+                event.build = time.perf_counter() - started
+                return data
+        event.build = time.perf_counter() - started
+        flight = self.client.singleflight
+        if flight is None:
+            return self._fetch_uncached(url, params, key, max_age)
+        # readers with different tokens must not share errors such as a 401
+        token = hashlib.sha256(self.token.encode()).hexdigest()
+        data, shared = flight.do(
+            key + (token,), self._fetch_uncached, url, params, key, max_age
+        )
+        if shared:
+            # the same data was handed to concurrent callers
+            self._from_cache = True
+            if not event.attempts:
+                event.cache = "shared"
+        return data
+
+    def _fetch_uncached(self, url, params, key, max_age):
+        """Requests (or loads from the disk cache) a response which is not
+        in the response cache, and caches it"""
+        cache = self.client.cache
+        disk = self._disk_cache()
+        if disk is not None:
+            snapshot_key = disk.make_key(url, params)
+            found, data = disk.get_snapshot(snapshot_key)
+            if found:
+                logger.debug("DISK CACHE HIT: %s" % url)
+                if self.last_event is not None:
+                    self.last_event.cache = "disk"
+                if max_age != 0:
+                    cache.set(key, data)
+                    self._from_cache = True
+                return data
         params["token"] = self.token
+        response = self._request(url, params)
+        started = time.perf_counter()
+        data = self._validate_response(response)
+        if self.last_event is not None:
+            self.last_event.decode = time.perf_counter() - started
+        if disk is not None:
+            disk.put_snapshot(snapshot_key, data)
+        if max_age != 0:
+            cache.set(key, data, size=len(response.content))
+            # cached data is shared, so it must not be handed out as-is
+            self._from_cache = True
+        return data
+
+    def _new_event(self, url, params):
+        """Starts the ``RequestEvent`` of a call"""
+        event = self.last_event = RequestEvent(
+            type(self).__name__, self.url_template, url, params.get("types")
+        )
+        return event
+
+    def _finish_event(self, convert=None, error=None):
+        """Completes the ``RequestEvent`` of a call and calls the hooks"""
+        event = self.last_event
+        if event is None or event.total is not None:
+            return
+        hooks = self.client.hooks + self.hooks
+        event.finish(hooks, convert=convert, error=error)
+
+    def _disk_cache(self):
+        """The client's disk cache if responses of this reader may be stored
+        in it (only standard JSON types can be stored)"""
+        if not self._persist or self.json_parse_int or self.json_parse_float:
+            return None
+        return self.client.disk_cache
+
+    def _cache_max_age(self, params):
+        """Maximum age (seconds) of a cached response usable for a request
+        with the given parameters (``None`` for any age, ``0`` to bypass the
+        cache)"""
+        return self.client.cache.ttl_for(self.url_template, params)
+
+    def _request(self, url, params, stream=False):
+        """Sends a GET request, retrying transient failures
+
+        Connection errors, timeouts and retryable statuses (see
+        ``RetryPolicy``) are retried with exponential backoff until the
+        policy's retries or total deadline are exhausted.
+
+        Returns
+        -------
+        response: requests.response
+            A successful response
+
+        Raises
+        ------
+        IEXQueryError
+            If the final response has an error status
+        requests.RequestException
+            If the final attempt fails with a connection error or timeout
+        """
+        import requests
+
+        from iexfinance.utils.adapters import take_connect_time
+
+        event = self.last_event
+        policy = self.retry_policy
+        limiter = self.client.rate_limiter
+        meter = self.client.meter
+        meter.check()
+        deadline = policy.deadline()
         headers = {"project": "iexfinance/stable (Language=Python)"}
-        for _ in range(self.retry_count + 1):
-            response = self.session.get(url=url, params=params, headers=headers)
-            logger.debug("REQUEST: %s" % response.request.url)
-            logger.debug("RESPONSE: %s" % response.status_code)
-            if response.status_code == requests.codes.ok:
-                return self._validate_response(response)
-            time.sleep(self.pause)
+        attempt = 0
+        while True:
+            response = error = None
+            if limiter is not None:
+                limiter.acquire()
+            take_connect_time()
+            started = time.perf_counter()
+            try:
+                response = self.session.get(
+                    url=url,
+                    params=params,
+                    headers=headers,
+                    timeout=policy.attempt_timeout(deadline),
+                    stream=stream,
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+                logger.debug("REQUEST FAILED: %s" % e)
+            else:
+                logger.debug("REQUEST: %s" % response.request.url)
+                logger.debug("RESPONSE: %s" % response.status_code)
+                if event is not None:
+                    elapsed = time.perf_counter() - started
+                    event.requests = 1
+                    event.attempts = attempt + 1
+                    event.status = response.status_code
+                    event.connect = take_connect_time()
+                    event.round_trip = response.elapsed.total_seconds()
+                    if not stream:
+                        event.download = max(elapsed - event.round_trip, 0.0)
+                        event.bytes = len(response.content)
+                if response.status_code == requests.codes.ok:
+                    meter.record_response(
+                        response,
+                        endpoint=self.url_template,
+                        symbols=params.get("symbols"),
+                    )
+                    return response
+            if not policy.should_retry(
+                attempt,
+                status=getattr(response, "status_code", None),
+                error=error,
+            ):
+                break
+            delay = policy.backoff(attempt, response)
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                logger.debug("RETRY DEADLINE EXCEEDED")
+                break
+            logger.debug("RETRYING IN %.3fs (attempt %s)" % (delay, attempt + 1))
+            if response is not None:
+                # release the connection of an unread (streamed) response
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+        if error is not None:
+            raise error
         return self._handle_error(response)
 
     def _handle_error(self, response):
@@ -192,7 +439,8 @@ class _IEXBase(object):
         url: str
             A formatted URL
         """
-        return "%s%s" % (self._URLS[self.version], self.url)
+        base_url = self.client.base_url or self._URLS[self.version]
+        return "%s/%s" % (base_url.rstrip("/"), self.url.lstrip("/"))
 
     def fetch(self, format=None):
         """Fetches latest data
@@ -204,15 +452,96 @@ class _IEXBase(object):
         response: requests.response
             A response object
         """
+        if self.stream:
+            return self._join_chunks(list(self.iter_chunks(format=format)))
+        self.last_event = None
+        try:
+            url = self._prepare_query()
+            data = self._execute_iex_query(url)
+            started = time.perf_counter()
+            result = self._format_output(data, format=format)
+        except Exception as e:
+            self._finish_event(error=e)
+            raise
+        self._finish_event(convert=time.perf_counter() - started)
+        return result
+
+    def iter_chunks(self, format=None):
+        """Streams the response, yielding it in formatted chunks
+
+        The response array is parsed incrementally while it is downloaded.
+        Every ``chunk_size`` elements are formatted (as a DataFrame or a
+        list, depending on ``output_format``) and yielded, so that only one
+        chunk of parsed elements is held in memory at a time.
+
+        Yields
+        ------
+        list or DataFrame
+            Formatted chunk of the response
+
+        Raises
+        ------
+        IEXQueryError
+            If the response is not a JSON array
+        """
+        if not self._streamable:
+            raise ValueError("%s does not support streaming." % type(self).__name__)
         url = self._prepare_query()
-        data = self._execute_iex_query(url)
-        return self._format_output(data, format=format)
+        params = self.params
+        event = self._new_event(url, params)
+        event.build = time.perf_counter() - event.started
+        params["token"] = self.token
+        self._from_cache = False
+        convert = 0.0
+        try:
+            response = self._request(url, params, stream=True)
+            try:
+                started = time.perf_counter()
+                chunks = iter_json_array(
+                    response.iter_content(_STREAM_READ_SIZE),
+                    chunk_size=self.chunk_size,
+                    parse_int=self.json_parse_int,
+                    parse_float=self.json_parse_float,
+                )
+                for chunk in chunks:
+                    converting = time.perf_counter()
+                    formatted = self._format_output(chunk, format=format)
+                    convert += time.perf_counter() - converting
+                    yield formatted
+                # the body is downloaded and decoded at once
+                event.download = time.perf_counter() - started - convert
+            except ValueError as e:
+                raise IEXQueryError(response.status_code, str(e))
+            finally:
+                response.close()
+        except Exception as e:
+            self._finish_event(convert=convert, error=e)
+            raise
+        self._finish_event(convert=convert)
+
+    def _join_chunks(self, chunks):
+        """Joins the formatted chunks of a streamed response"""
+        if not chunks:
+            return self._format_output([])
+        if isinstance(chunks[0], list):
+            return [item for chunk in chunks for item in chunk]
+        if self.output_format in TABLE_FORMATS:
+            return concat_tables(chunks)
+        import pandas as pd
+
+        axis = self._chunk_axis
+        return pd.concat(chunks, axis=axis, ignore_index=axis == 0)
 
     def _convert_output(self, out):
         import pandas as pd
 
         return pd.DataFrame(out)
 
+    def _convert_table(self, out):
+        """Converts the response to a table (``arrow`` or ``polars`` output
+        formats), built from the JSON values directly"""
+        return records_to_table(json_to_records(out), format=self.output_format)
+
     def _format_output(self, out, format=None):
         """
         Output formatting handler
@@ -220,10 +549,18 @@ class _IEXBase(object):
 
         # If JSON output format, return exactly as received
         if self.output_format == "json":
-            return out
+            result = out
+        # Tables ignore the (pandas) custom formatters
+        elif self.output_format in TABLE_FORMATS:
+            result = out if format is no_pandas else self._convert_table(out)
         # Use custom formatter if supplied
         elif format is not None:
-            return format(out)
+            result = format(out)
         # Use default (or subclass) output conversion
         else:
-            return self._convert_output(out)
+            result = self._convert_output(out)
+        # Cached responses are shared between calls, so never return them
+        # unconverted for the caller to modify
+        if self._from_cache and result is out:
+            result = copy.deepcopy(result)
+        return result
@@ -0,0 +1,326 @@
+import os
+import threading
+
+from iexfinance.utils import (
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
+    _init_session,
+)
+from iexfinance.utils.cache import ResponseCache
+from iexfinance.utils.decoders import get_decoder
+from iexfinance.utils.metering import MessageMeter
+from iexfinance.utils.metrics import MetricsRegistry
+from iexfinance.utils.ratelimit import RateLimiter
+from iexfinance.utils.retry import RetryPolicy
+from iexfinance.utils.singleflight import SingleFlight
+
+
+class Client(object):
+    """
+    Shared connection state for IEX Cloud requests.
+
+    A ``Client`` owns a single pooled HTTP session together with the
+    authentication token, API version and retry settings. Every reader which
+    is passed a ``Client`` (through the ``client`` keyword argument) reuses
+    its session, so that TCP and TLS connections to IEX Cloud are kept alive
+    across calls. Readers which are not passed a ``Client`` use the
+    process-wide default client (see ``get_default_client``).
+
+    Parameters
+    ----------
+    token: str, optional
+        Authentication token. Defaults to the ``IEX_TOKEN`` environment
+        variable, which is read at request time.
+    version: str, optional
+        Desired API version. Defaults to the ``IEX_API_VERSION`` environment
+        variable, which is read at request time.
+    session: requests.Session, optional
+        Session to use for all requests made through this client. A new
+        session is created on first use if none is passed.
+    retry_count: int, default 3, optional
+        Desired number of retries if a request fails with a transient error
+    pause: float, default 0.5, optional
+        Base pause time between retry attempts
+    retry_policy: iexfinance.utils.retry.RetryPolicy, optional
+        Retry, backoff and timeout policy. Defaults to a ``RetryPolicy``
+        built from ``retry_count`` and ``pause``.
+    base_url: str, optional
+        Override the IEX Cloud URL selected by ``version`` (useful for
+        proxies and local test servers)
+    pool_connections: int, default 10, optional
+        Number of per-host connection pools to cache
+    pool_maxsize: int, default 32, optional
+        Maximum number of connections kept alive per host. Should be at least
+        the number of threads making concurrent requests.
+    pool_block: bool, default False, optional
+        Whether to wait for a free connection once ``pool_maxsize``
+        connections are in use, rather than opening (and discarding) extra
+        connections
+    keep_alive: bool, default True, optional
+        Whether to reuse connections between requests
+    rate_limit: float, optional
+        Maximum sustained requests per second made through this client, shared
+        by all threads and readers. Defaults to no limit.
+    burst: int, optional
+        Maximum number of requests made at once when below ``rate_limit``.
+        Defaults to ``max(1, rate_limit)``.
+    rate_limiter: iexfinance.utils.ratelimit.RateLimiter, optional
+        Rate limiter to use instead of one built from ``rate_limit`` and
+        ``burst`` (e.g. to share a limiter between clients)
+    message_budget: int, optional
+        Maximum number of IEX Cloud messages which may be used through this
+        client. Defaults to no budget.
+    on_budget_exceeded: str, default "raise", optional
+        Whether requests made once the budget is used up raise
+        ``IEXMessageBudgetError`` (``raise``) or wait until the budget is
+        raised or the meter is reset (``defer``)
+    meter: iexfinance.utils.metering.MessageMeter, optional
+        Message meter to use instead of one built from ``message_budget``
+        and ``on_budget_exceeded`` (e.g. to share a budget between clients)
+    cache: bool or iexfinance.utils.cache.ResponseCache, optional
+        Cache parsed responses in memory, with per-endpoint maximum ages.
+        Pass ``True`` for a ``ResponseCache`` with default settings. Disabled
+        by default.
+    disk_cache: str or iexfinance.utils.diskcache.DiskCache, optional
+        Persistent cache of historical daily prices and reference data,
+        shared between processes. Pass the path of a cache file or a
+        ``DiskCache``. Disabled by default.
+    coalesce: bool or iexfinance.utils.singleflight.SingleFlight, default True
+        Share one in-flight request between concurrent callers requesting the
+        same URL and parameters. The number of requests saved is reported by
+        ``singleflight.saved``.
+    json_decoder: str or callable, default "auto", optional
+        JSON decoder for responses: ``orjson``, ``simdjson``, ``ujson``,
+        ``json`` (the standard library) or a callable decoding ``bytes``.
+        ``auto`` selects the fastest installed decoder. Readers passed custom
+        ``json_parse_int`` or ``json_parse_float`` hooks always use the
+        standard library.
+    hooks: list of callable, optional
+        Functions called with a ``RequestEvent`` (phase timings, response
+        size and endpoint label) after every call of a reader using this
+        client (see ``add_hook``)
+    metrics: bool or iexfinance.utils.metrics.MetricsRegistry, optional
+        Aggregate request, error and retry counts and latency histograms per
+        endpoint. Pass ``True`` for a ``MetricsRegistry`` with default
+        settings. Disabled by default.
+    record: str, optional
+        Path of an archive to which every response received through this
+        client is appended (see ``iexfinance.utils.recording.Archive``)
+    replay: str, optional
+        Path of an archive from which responses are served instead of
+        making requests. A token is not required when replaying.
+    replay_latency: float or str, default 0, optional
+        Simulated time (seconds) to respond to each replayed request, or
+        ``recorded`` to wait as long as the recorded response took
+    """
+
+    def __init__(
+        self,
+        token=None,
+        version=None,
+        session=None,
+        retry_count=3,
+        pause=0.5,
+        retry_policy=None,
+        base_url=None,
+        pool_connections=DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize=DEFAULT_POOL_MAXSIZE,
+        pool_block=False,
+        keep_alive=True,
+        rate_limit=None,
+        burst=None,
+        rate_limiter=None,
+        message_budget=None,
+        on_budget_exceeded="raise",
+        meter=None,
+        cache=None,
+        disk_cache=None,
+        coalesce=True,
+        json_decoder="auto",
+        hooks=None,
+        metrics=None,
+        record=None,
+        replay=None,
+        replay_latency=0,
+    ):
+        self.token = token
+        self.version = version
+        self.retry_count = retry_count
+        self.pause = pause
+        self.retry_policy = retry_policy or RetryPolicy(
+            retries=retry_count, backoff_factor=pause
+        )
+        self.base_url = base_url
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        if rate_limiter is None and rate_limit is not None:
+            rate_limiter = RateLimiter(rate_limit, burst)
+        self.rate_limiter = rate_limiter
+        self.meter = meter or MessageMeter(
+            budget=message_budget, on_exceeded=on_budget_exceeded
+        )
+        if cache is True:
+            cache = ResponseCache()
+        elif cache is False:
+            cache = None
+        self.cache = cache
+        if disk_cache is not None:
+            from iexfinance.utils.diskcache import DiskCache
+
+            if not isinstance(disk_cache, DiskCache):
+                disk_cache = DiskCache(disk_cache)
+        self.disk_cache = disk_cache
+        if coalesce is True:
+            coalesce = SingleFlight()
+        elif coalesce is False:
+            coalesce = None
+        self.singleflight = coalesce
+        self.json_decoder, self.decode = get_decoder(json_decoder)
+        self.hooks = list(hooks or [])
+        if metrics is True:
+            metrics = MetricsRegistry()
+        elif metrics is False:
+            metrics = None
+        self.metrics = metrics
+        if metrics is not None:
+            self.hooks.append(metrics.record)
+        if record is not None and replay is not None:
+            raise ValueError("Please select either record or replay.")
+        self.record = record
+        self.replay = replay
+        self.replay_latency = replay_latency
+        self._session = session
+        self._archive = None
+        if session is not None and (record is not None or replay is not None):
+            self._mount_archive(session)
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "{}(version={!r}, base_url={!r})".format(
+            self.__class__.__name__, self.version, self.base_url
+        )
+
+    @property
+    def session(self):
+        """The shared session, created on first use"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = _init_session(
+                        None,
+                        pool_connections=self.pool_connections,
+                        pool_maxsize=self.pool_maxsize,
+                        pool_block=self.pool_block,
+                        keep_alive=self.keep_alive,
+                    )
+                    if self.record is not None or self.replay is not None:
+                        self._mount_archive(self._session)
+        return self._session
+
+    def _mount_archive(self, session):
+        from iexfinance.utils.recording import (
+            Archive,
+            RecordingAdapter,
+            ReplayAdapter,
+        )
+
+        if self.replay is not None:
+            self._archive = Archive(self.replay)
+            adapter = ReplayAdapter(self._archive, latency=self.replay_latency)
+        else:
+            self._archive = Archive(self.record)
+            adapter = RecordingAdapter(
+                self._archive,
+                pool_connections=self.pool_connections,
+                pool_maxsize=self.pool_maxsize,
+                pool_block=self.pool_block,
+            )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+    def pool_stats(self):
+        """Connection pool utilisation counters
+
+        Returns
+        -------
+        dict or None
+            See ``IEXHTTPAdapter.pool_stats``. ``None`` if the session was
+            supplied by the user and does not use an ``IEXHTTPAdapter``.
+        """
+        from iexfinance.utils.adapters import IEXHTTPAdapter
+
+        adapter = self.session.get_adapter("https://")
+        if isinstance(adapter, IEXHTTPAdapter):
+            return adapter.pool_stats()
+        return None
+
+    def messages_used(self):
+        """Running totals of the IEX Cloud messages used by this client
+
+        Returns
+        -------
+        dict
+            See ``MessageMeter.totals``
+        """
+        return self.meter.totals()
+
+    def add_hook(self, hook):
+        """Calls ``hook`` with the ``RequestEvent`` of every reader call"""
+        self.hooks = self.hooks + [hook]
+
+    def remove_hook(self, hook):
+        """Removes a hook added with ``add_hook``"""
+        self.hooks = [h for h in self.hooks if h is not hook]
+
+    def get_token(self):
+        token = self.token or os.getenv("IEX_TOKEN")
+        if token is None and self.replay is not None:
+            # replayed requests are never sent, so any token will do
+            return "replay"
+        return token
+
+    def close(self):
+        """Closes the underlying session and its pooled connections"""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_default_client():
+    """
+    Returns the process-wide default ``Client``, creating it on first use
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_lock:
+            if _default_client is None:
+                _default_client = Client()
+    return _default_client
+
+
+def set_default_client(client):
+    """
+    Replaces the process-wide default ``Client``
+
+    Parameters
+    ----------
+    client: Client or None
+        New default client. Passing ``None`` resets the default so that a
+        fresh client is created on next use.
+    """
+    global _default_client
+    with _default_lock:
+        _default_client = client
@@ -1,5 +1,3 @@
-import pandas as pd
-
 from iexfinance.base import _IEXBase
 
 
@@ -16,6 +14,8 @@ class Crypto(_IEXBase):
         return "crypto/%s/%s" % (self.symbol, self._endpoint)
 
     def _convert_output(self, out):
+        import pandas as pd
+
         if self._endpoint == "book":
             return out
         return pd.DataFrame(out, index=[out["symbol"]])
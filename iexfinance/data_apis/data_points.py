@@ -1,5 +1,3 @@
-import pandas as pd
-
 from iexfinance.base import _IEXBase
 
 
@@ -15,7 +13,15 @@ class DataPoints(_IEXBase):
             return "data-points/%s" % self.symbol
         return "data-points/%s/%s" % (self.symbol, self.key)
 
+    @property
+    def url_template(self):
+        if self.key is None:
+            return "data-points/{symbol}"
+        return "data-points/{symbol}/{key}"
+
     def _convert_output(self, out):
+        import pandas as pd
+
         if self.key is not None:
             return out
         return pd.DataFrame(out)
@@ -1,11 +1,29 @@
 import os
 
-import pandas as pd
-
 from iexfinance.base import _IEXBase
 
 
 class TimeSeries(_IEXBase):
+
+    _streamable = True
+    # Each item is converted to a column
+    _chunk_axis = 1
+
+    _BASE_KWARGS = (
+        "retry_count",
+        "pause",
+        "retry_policy",
+        "session",
+        "json_parse_int",
+        "json_parse_float",
+        "output_format",
+        "token",
+        "client",
+        "stream",
+        "chunk_size",
+        "hooks",
+    )
+
     def __init__(self, id_=None, key=None, subkey=None, **kwargs):
         self.id_ = id_
         self.key = key
@@ -13,26 +31,15 @@ class TimeSeries(_IEXBase):
 
         # Base class parameters. Pop from kwargs stored in _params
         # Need to do this since arbitrary number of params allowed in call
-        retry_count = kwargs.pop("retry_count", 3)
-        pause = kwargs.pop("pause", 0.5)
-        session = kwargs.pop("session", None)
-        json_parse_int = kwargs.pop("json_parse_int", None)
-        json_parse_float = kwargs.pop("json_parse_float", None)
-        output_format = kwargs.pop(
+        base_kwargs = {
+            key: kwargs.pop(key) for key in self._BASE_KWARGS if key in kwargs
+        }
+        base_kwargs.setdefault(
             "output_format", os.getenv("IEX_OUTPUT_FORMAT", "pandas")
         )
-        token = kwargs.pop("token", None)
 
         self._params = kwargs
-        super(TimeSeries, self).__init__(
-            retry_count=retry_count,
-            pause=pause,
-            session=session,
-            json_parse_int=json_parse_int,
-            json_parse_float=json_parse_float,
-            output_format=output_format,
-            token=token,
-        )
+        super(TimeSeries, self).__init__(**base_kwargs)
 
     @property
     def url(self):
@@ -45,11 +52,23 @@ class TimeSeries(_IEXBase):
                 return "time-series/%s/%s" % (self.id_, self.key)
             return "time-series/%s" % self.id_
 
+    @property
+    def url_template(self):
+        if self.id_ is None:
+            return "time-series"
+        if self.key:
+            if self.subkey:
+                return "time-series/{id}/{key}/{subkey}"
+            return "time-series/{id}/{key}"
+        return "time-series/{id}"
+
     @property
     def params(self):
         return self._params
 
     def _convert_output(self, out):
+        import pandas as pd
+
         if self.id_ is None:
             return pd.DataFrame({item["id"]: item for item in out})
         df = pd.DataFrame({item["dateFiled"]: item for item in out})
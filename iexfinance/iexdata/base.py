@@ -275,9 +275,7 @@ class DailySummaryReader(Stats):
         )
 
     def _validate_response(self, response):
-        return response.json(
-            parse_int=self.json_parse_int, parse_float=self.json_parse_float
-        )
+        return self._decode(response)
 
     @property
     def url(self):
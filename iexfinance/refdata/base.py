@@ -1,11 +1,11 @@
 import datetime
 
-import pandas as pd
-
 from iexfinance.base import _IEXBase
 
 
 class ReferenceData(_IEXBase):
+    _persist = True
+
     @property
     def url(self):
         return "ref-data/%s" % self.endpoint
@@ -20,6 +20,9 @@ class TradingDatesReader(ReferenceData):
     Base class to retrieve trading holiday information
     """
 
+    # Next and last trading dates change daily
+    _persist = False
+
     def __init__(self, type_, direction=None, last=1, startDate=None, **kwargs):
         if isinstance(startDate, datetime.date) or isinstance(
             startDate, datetime.datetime
@@ -41,24 +44,54 @@ class TradingDatesReader(ReferenceData):
             ret += "/%s" % self.startDate
         return ret
 
+    @property
+    def url_template(self):
+        ret = "ref-data/us/dates/%s/%s/{last}" % (self.type, self.direction)
+        if self.startDate:
+            ret += "/{date}"
+        return ret
+
+    def _cache_max_age(self, params):
+        max_age = super(TradingDatesReader, self)._cache_max_age(params)
+        if max_age == 0 or self.startDate:
+            return max_age
+        # Dates relative to today are only reused until the next UTC
+        # midnight (after the US close)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        midnight = datetime.datetime.combine(
+            now.date(), datetime.time(0), tzinfo=datetime.timezone.utc
+        )
+        since_midnight = (now - midnight).total_seconds()
+        if max_age is None:
+            return since_midnight
+        return min(max_age, since_midnight)
+
     def _format_output(self, out, format=None):
+        import pandas as pd
+
         out = [{k: pd.to_datetime(v) for k, v in day.items()} for day in out]
         return super(TradingDatesReader, self)._format_output(out)
 
 
 class Symbols(ReferenceData):
+    _streamable = True
+
     @property
     def endpoint(self):
         return "symbols"
 
 
 class IEXSymbols(ReferenceData):
+    _streamable = True
+
     @property
     def endpoint(self):
         return "iex/symbols"
 
 
 class IntlRegionSymbols(ReferenceData):
+    _streamable = True
+
     def __init__(self, region, **kwargs):
         self.region = region
         super(IntlRegionSymbols, self).__init__(**kwargs)
@@ -69,6 +102,8 @@ class IntlRegionSymbols(ReferenceData):
 
 
 class IntlExchangeSymbols(ReferenceData):
+    _streamable = True
+
     def __init__(self, exchange, **kwargs):
         self.exchange = exchange
         super(IntlExchangeSymbols, self).__init__(**kwargs)
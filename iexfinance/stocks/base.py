@@ -1,9 +1,85 @@
-import pandas as pd
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 from iexfinance.base import _IEXBase
+from iexfinance.stocks.schemas import SCHEMAS
 from iexfinance.utils import _handle_lists, no_pandas
+from iexfinance.utils.columnar import (
+    TABLE_FORMATS,
+    apply_schema,
+    bars_to_frame,
+    records_to_frame,
+    records_to_table,
+)
 from iexfinance.utils.exceptions import ImmediateDeprecationError
 
+# Maximum number of symbols per batch request
+BATCH_LIMIT = 100
+# Maximum number of endpoints (types) per batch request
+TYPES_LIMIT = 10
+
+
+def _rows(format):
+    """Marks an output formatter whose DataFrames already have one row per
+    item, so that they are not transposed"""
+    format.rows = True
+    return format
+
+
+class DeferredField(object):
+    """
+    Result of a field method call deferred with ``Stock.deferred``
+
+    Attributes
+    ----------
+    endpoint: str
+        Endpoint method of the field (e.g. ``quote`` or ``key_stats``)
+    field: str
+        Field name
+    done: bool
+        Whether the field has been retrieved (or failed)
+    """
+
+    __slots__ = ("endpoint", "field", "done", "_value", "_error")
+
+    def __init__(self, endpoint, field):
+        self.endpoint = endpoint
+        self.field = field
+        self.done = False
+        self._value = None
+        self._error = None
+
+    def __repr__(self):
+        state = repr(self._value) if self.done and not self._error else "pending"
+        return "{}({}.{}, {})".format(
+            self.__class__.__name__, self.endpoint, self.field, state
+        )
+
+    @property
+    def value(self):
+        """Value of the field, as returned by the field method
+
+        Raises
+        ------
+        ValueError
+            If the ``deferred`` block has not exited yet
+        """
+        if not self.done:
+            raise ValueError("The deferred field has not been retrieved yet.")
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+    def set_value(self, value):
+        self._value = value
+        self.done = True
+
+    def set_error(self, error):
+        self._error = error
+        self.done = True
+
 
 class Stock(_IEXBase):
     """
@@ -12,24 +88,36 @@ class Stock(_IEXBase):
     Attributes
     ----------
     symbols: str or list-like (list, tuple, pandas.Series, pandas.Index)
-        Symbol or list-like collection of symbols
+        Symbol or list-like collection of symbols. Repeated symbols are
+        ignored. Lists of more than 100 symbols are split into batch requests
+        of 100 symbols, which are made concurrently.
     output_format: str, default 'pandas', optional
     token: str, optional
         Authentication token (required for use with IEX Cloud)
     """
 
+    # get_* methods of endpoints whose names differ from the endpoint's
+    _ENDPOINT_METHODS = {
+        "chart": "get_historical_prices",
+        "income": "get_income_statement",
+        "previous": "get_previous_day_prices",
+        "stats": "get_key_stats",
+    }
+
+    # Endpoint calls collected instead of executed (see get_endpoints)
+    _planned = None
+    # Deferred field method calls (see deferred)
+    _deferred = None
+
     def __init__(self, symbols=None, **kwargs):
         if isinstance(symbols, str) and symbols:
             self.symbols = [symbols]
-        elif isinstance(symbols, list) and 0 < len(symbols) <= 100:
+        elif isinstance(symbols, list) and symbols:
             self.symbols = symbols
-        elif isinstance(symbols, list) and 100 < len(symbols):
-            raise ValueError(
-                "Please input a symbols list containing between" " 0 and 100 symbols"
-            )
         else:
             raise ValueError("Please input a symbol or list of symbols")
-        self.symbols = list(map(lambda x: x.upper(), _handle_lists(symbols)))
+        # deduplicate, preserving order
+        self.symbols = list(dict.fromkeys(x.upper() for x in _handle_lists(symbols)))
         self.endpoints = []
         super(Stock, self).__init__(**kwargs)
 
@@ -51,7 +139,7 @@ class Stock(_IEXBase):
         temp = {"symbols": ",".join(self.symbols), "types": ",".join(self.endpoints)}
         temp.update(self.optional_params)
         if "filter_" in temp:
-            if isinstance(temp["filter_"], list):
+            if isinstance(temp["filter_"], (list, tuple)):
                 temp["filter"] = ",".join(temp.pop("filter_"))
             else:
                 temp["filter"] = temp.pop("filter_")
@@ -63,14 +151,86 @@ class Stock(_IEXBase):
         }
         return params
 
+    def _execute_iex_query(self, url):
+        return self._execute_batch(url)
+
+    def _execute_batch(self, url):
+        """Requests the symbols in one batch, or in shards (see
+        ``_execute_sharded``) if there are more than ``BATCH_LIMIT``"""
+        if len(self.symbols) <= BATCH_LIMIT:
+            return super(Stock, self)._execute_iex_query(url)
+        return self._execute_sharded(url)
+
+    def _execute_sharded(self, url):
+        """Requests the symbols in concurrent batches of ``BATCH_LIMIT``
+        symbols over the client's connection pool, and merges the responses
+        in symbol order"""
+        started = time.perf_counter()
+        self._from_cache = False
+        event = self._new_event(url, self.params)
+        event.started = started
+        shards = []
+        for i in range(0, len(self.symbols), BATCH_LIMIT):
+            shard = copy.copy(self)
+            shard.symbols = self.symbols[i : i + BATCH_LIMIT]
+            shards.append(shard)
+        event.build = time.perf_counter() - started
+        workers = min(len(shards), self.client.pool_maxsize)
+        with ThreadPoolExecutor(workers) as pool:
+            # results are returned in shard order; the first error is raised
+            results = list(pool.map(lambda shard: shard._execute_batch(url), shards))
+        out = {}
+        for shard, data in zip(shards, results):
+            if isinstance(data, list):
+                data = data[0]
+            out.update(data)
+            self._from_cache = self._from_cache or shard._from_cache
+            self._merge_event(event, shard.last_event)
+        caches = {shard.last_event.cache for shard in shards}
+        if len(caches) == 1:
+            event.cache = caches.pop()
+        return out
+
+    @staticmethod
+    def _merge_event(event, shard_event):
+        """Adds the event of a shard to the event of a sharded call. Shards
+        run concurrently, so phase timings are those of the slowest shard."""
+        if shard_event is None:
+            return
+        event.requests += shard_event.requests
+        event.attempts += shard_event.attempts
+        if shard_event.bytes is not None:
+            event.bytes = (event.bytes or 0) + shard_event.bytes
+        if shard_event.status is not None:
+            event.status = shard_event.status
+        for phase in ("connect", "round_trip", "download", "decode"):
+            value = getattr(shard_event, phase)
+            if value is not None:
+                setattr(event, phase, max(getattr(event, phase) or 0.0, value))
+
     def _get_endpoint(self, endpoint, params=(), format=None, filter_=None):
-        result = {}
         if filter_:
             params.update({"filter": filter_})
+        if self._planned is not None:
+            self._planned.append((endpoint, format))
+            return None
         self.optional_params = params
         self.endpoints = [endpoint]
 
-        data = self.fetch(format=no_pandas)
+        self.last_event = None
+        try:
+            data = self._execute_iex_query(self._prepare_query())
+            started = time.perf_counter()
+            result = self._extract_endpoint(data, endpoint, format=format)
+        except Exception as e:
+            self._finish_event(error=e)
+            raise
+        self._finish_event(convert=time.perf_counter() - started)
+        return result
+
+    def _extract_endpoint(self, data, endpoint, format=None):
+        """Formats the data of one endpoint from a batch response"""
+        result = {}
         # IEX Cloud returns multiple symbol requests as as a list of dicts
         # so convert to dict of dicts
         if isinstance(data, list):
@@ -82,41 +242,248 @@ class Stock(_IEXBase):
                 result[symbol] = []
             else:
                 result[symbol] = data[symbol][endpoint]
-        return self._output_format_one(result, format=format)
+        return self._output_format_one(
+            result, format=format, schema=SCHEMAS.get(endpoint)
+        )
 
     def _get_field(self, endpoint, field):
+        if self._planned is not None:
+            # field methods are not endpoints
+            return None
+        if self._deferred is not None:
+            call = DeferredField(endpoint, field)
+            self._deferred.append(call)
+            return call
         try:
             data = getattr(self, "get_%s" % endpoint)(filter_=field)
         except AttributeError:
             raise NotImplementedError("Endpoint %s not implemented." % endpoint)
+        return self._select_field(data, endpoint, field)
+
+    def _select_field(self, data, endpoint, field):
+        # multi-symbol JSON output is keyed by symbol
+        if self.output_format == "json" and not self.single_symbol:
+            if not all(field in data.get(symbol, ()) for symbol in self.symbols):
+                raise KeyError("Field %s not found in %s." % (field, endpoint))
+            return {symbol: data[symbol][field] for symbol in self.symbols}
+        if self.output_format in TABLE_FORMATS:
+            columns = (
+                data.column_names if self.output_format == "arrow" else data.columns
+            )
+            if field not in columns:
+                raise KeyError("Field %s not found in %s." % (field, endpoint))
+            if self.single_symbol:
+                value = data[field][0]
+                return value.as_py() if self.output_format == "arrow" else value
+            # the data may hold other fields requested in the same call
+            return data.select(list(dict.fromkeys(["symbol", field])))
         if field not in data:
             raise KeyError("Field %s not found in %s." % (field, endpoint))
         if self.output_format == "json":
-            if self.single_symbol:
-                data = data[field]
-            else:
-                data = {symbol: data[symbol][field] for symbol in self.symbols}
+            data = data[field]
         else:
             if self.single_symbol:
-                return data[field][0]
+                return data[field].iloc[0]
+            data = data[[field]]
         return data
 
-    def _output_format_one(self, out, format=None):
+    def _output_format_one(self, out, format=None, schema=None):
+        if self.output_format in TABLE_FORMATS and format is not no_pandas:
+            return self._convert_table(out, schema=schema)
+        if (
+            format is None
+            and self.output_format == "pandas"
+            and out
+            and all(isinstance(value, dict) for value in out.values())
+        ):
+            # one row per symbol, built column by column
+            return records_to_frame(list(out.values()), index=list(out), schema=schema)
         data = super(Stock, self)._format_output(out, format=format)
         # transpose DF
         try:
-            data = data.T if self.output_format == "pandas" else data
+            if self.output_format == "pandas" and not getattr(format, "rows", False):
+                data = data.T
         except Exception:
             pass
-        if self.single_symbol and self.output_format == "json":
+        if self.single_symbol and self.output_format != "pandas":
             return data[self.symbols[0]]
         return data
 
-    def get_endpoints(self, endpoints=()):
+    def _convert_table(self, out, schema=None):
+        """Converts the data of one endpoint to a table with a ``symbol``
+        column: one row per symbol, or per item of each symbol's list"""
+        records = []
+        for symbol, value in out.items():
+            if not isinstance(value, list):
+                value = [value]
+            for item in value:
+                if isinstance(item, dict):
+                    records.append({"symbol": symbol, **item})
+                else:
+                    records.append({"symbol": symbol, "value": item})
+        return records_to_table(records, schema=schema, format=self.output_format)
+
+    def _bars_to_frame(self, out, endpoint, label):
+        """DataFrame of the bars (chart or intraday prices) of each symbol,
+        with one row per bar, labelled by ``label`` of the bar (and by symbol
+        when there are several symbols)"""
+        data = bars_to_frame(out, label, schema=SCHEMAS[endpoint])
+        if len(self.symbols) == 1:
+            data.index = data.index.droplevel(0)
+        return data
+
+    def get_endpoints(self, endpoints=(), **kwargs):
+        """Multiple endpoints
+
+        Retrieves several endpoints with as few batch requests as possible
+        (up to 10 endpoints per request), formatting each of them as its
+        ``get_*`` method would (e.g. ``quote`` as ``get_quote``).
+
+        Parameters
+        ----------
+        endpoints: str or list
+            Endpoint name(s), as used by the batch API (e.g. ``quote``,
+            ``company``, ``stats``, ``news``, ``chart``)
+        kwargs:
+            Additional parameters passed to every endpoint of the request
+            (e.g. ``range`` for ``chart`` or ``last`` for ``news``)
+
+        Returns
+        -------
+        dict
+            Output of each endpoint, keyed by endpoint name
+
+        Raises
+        ------
+        NotImplementedError
+            If an endpoint is not supported by ``Stock``
+        """
+        if isinstance(endpoints, str):
+            endpoints = [endpoints]
+        endpoints = list(dict.fromkeys(endpoints))
+        if not endpoints:
+            raise ValueError("Please input an endpoint or list of endpoints.")
+        return self._fetch_endpoints(self._plan_endpoints(endpoints), kwargs)
+
+    def _fetch_endpoints(self, formats, params):
+        """Requests endpoints in batches of up to ``TYPES_LIMIT`` endpoints
+        and formats each of them with its formatter (from ``formats``)"""
+        endpoints = list(formats)
+        result = {}
+        for i in range(0, len(endpoints), TYPES_LIMIT):
+            group = endpoints[i : i + TYPES_LIMIT]
+            self.optional_params = dict(params)
+            self.endpoints = group
+            self.last_event = None
+            try:
+                data = self._execute_iex_query(self._prepare_query())
+                started = time.perf_counter()
+                for endpoint in group:
+                    result[endpoint] = self._extract_endpoint(
+                        data, endpoint, format=formats[endpoint]
+                    )
+            except Exception as e:
+                self._finish_event(error=e)
+                raise
+            self._finish_event(convert=time.perf_counter() - started)
+        return result
+
+    def _plan_endpoints(self, endpoints):
+        """Collects the output formatter of each endpoint from its ``get_*``
+        method, without making requests"""
+        formats = {}
+        for endpoint in endpoints:
+            name = self._ENDPOINT_METHODS.get(
+                endpoint, "get_%s" % endpoint.replace("-", "_")
+            )
+            planned = self._plan_method(name)
+            if planned is None or planned[0] != endpoint:
+                raise NotImplementedError("Endpoint %s not implemented." % endpoint)
+            formats[endpoint] = planned[1]
+        return formats
+
+    def _plan_method(self, name):
+        """Returns the endpoint and output formatter of the ``get_*`` method
+        ``name`` (``None`` if there is none), without making a request"""
+        method = getattr(self, name, None)
+        if method is None:
+            return None
+        self._planned = []
+        try:
+            method()
+        except ImmediateDeprecationError:
+            pass
+        finally:
+            planned, self._planned = self._planned, None
+        return planned[0] if planned else None
+
+    def query(self):
+        """Starts a query of several endpoints, which is executed lazily
+        with as few requests as possible (see ``StockQuery``)
+
+        Returns
+        -------
+        iexfinance.stocks.query.StockQuery
         """
-        DEPRECATED: This method has been deprecated as of 0.5.0
+        from iexfinance.stocks.query import StockQuery
+
+        return StockQuery(self)
+
+    @contextmanager
+    def deferred(self):
+        """Defers field method calls (such as ``get_open`` or ``get_beta``)
+        made in the ``with`` block
+
+        Field method calls made in the block return a ``DeferredField``
+        instead of making a request. When the block exits, the fields are
+        retrieved with as few batch requests as possible (one per 10
+        endpoints, filtered to the requested fields) and the value of each
+        ``DeferredField`` is set.
         """
-        raise ImmediateDeprecationError("get_endpoints")
+        if self._deferred is not None:
+            raise ValueError("Field method calls are already deferred.")
+        self._deferred = []
+        try:
+            yield self
+        finally:
+            calls, self._deferred = self._deferred, None
+        self._resolve_fields(calls)
+
+    def _resolve_fields(self, calls):
+        """Retrieves the fields of deferred field method calls"""
+        formats = {}
+        endpoints = {}
+        for call in calls:
+            if call.endpoint in endpoints:
+                continue
+            planned = self._plan_method("get_%s" % call.endpoint)
+            if planned is None:
+                call.set_error(
+                    NotImplementedError("Endpoint %s not implemented." % call.endpoint)
+                )
+                continue
+            endpoint, format = planned
+            endpoints[call.endpoint] = endpoint
+            formats[endpoint] = format
+        calls = [call for call in calls if call.endpoint in endpoints]
+        if not calls:
+            return
+        fields = list(dict.fromkeys(call.field for call in calls))
+        try:
+            data = self._fetch_endpoints(formats, {"filter_": fields})
+        except Exception as e:
+            for call in calls:
+                call.set_error(e)
+            raise
+        for call in calls:
+            try:
+                value = self._select_field(
+                    data[endpoints[call.endpoint]], call.endpoint, call.field
+                )
+            except KeyError as e:
+                call.set_error(e)
+            else:
+                call.set_value(value)
 
     """
     STOCK PRICES
@@ -190,15 +557,9 @@ class Stock(_IEXBase):
             data
         """
 
+        @_rows
         def format(out):
-            if len(self.symbols) > 1:
-                out = {
-                    (symbol, day["date"]): day for symbol in out for day in out[symbol]
-                }
-                return pd.DataFrame.from_dict(out, orient="columns")
-            else:
-                out = {entr["date"]: entr for entr in out[self.symbols[0]]}
-                return pd.DataFrame.from_dict(out, orient="columns")
+            return self._bars_to_frame(out, "chart", lambda bar: bar["date"])
 
         return self._get_endpoint("chart", format=format, params=kwargs)
 
@@ -249,20 +610,13 @@ class Stock(_IEXBase):
             that are null will be populated with IEX data if available.
         """
 
+        @_rows
         def format(out):
-            if len(self.symbols) > 1:
-                out = {
-                    (symbol, "{} {}".format(day["date"], day["label"])): day
-                    for symbol in out
-                    for day in out[symbol]
-                }
-                return pd.DataFrame.from_dict(out, orient="columns")
-            else:
-                out = {
-                    "{} {}".format(entr["date"], entr["label"]): entr
-                    for entr in out[self.symbols[0]]
-                }
-                return pd.DataFrame.from_dict(out, orient="columns")
+            return self._bars_to_frame(
+                out,
+                "intraday-prices",
+                lambda bar: "{} {}".format(bar["date"], bar["label"]),
+            )
 
         return self._get_endpoint("intraday-prices", format=format, params=kwargs)
 
@@ -317,6 +671,8 @@ class Stock(_IEXBase):
         """
 
         def format(out):
+            import pandas as pd
+
             return pd.DataFrame.from_dict(out, orient="index", columns=["price"])
 
         return self._get_endpoint("price", format=format)
@@ -352,6 +708,8 @@ class Stock(_IEXBase):
         """
 
         def format(out):
+            import pandas as pd
+
             data = {
                 (symbol, sheet["venueName"]): sheet
                 for symbol in out
@@ -385,6 +743,8 @@ class Stock(_IEXBase):
         """
 
         def format(out):
+            import pandas as pd
+
             out = {
                 (symbol, owner["entityName"]): owner
                 for symbol in out
@@ -405,6 +765,8 @@ class Stock(_IEXBase):
         """
 
         def format(out):
+            import pandas as pd
+
             out = {
                 (symbol, owner["fullName"]): owner
                 for symbol in out
@@ -425,6 +787,8 @@ class Stock(_IEXBase):
         """
 
         def format(out):
+            import pandas as pd
+
             out = {
                 (symbol, owner["fullName"]): owner
                 for symbol in out
@@ -478,12 +842,17 @@ class Stock(_IEXBase):
         """
 
         def format(out):
+            import pandas as pd
+
             results = {}
             for symbol in out:
                 if out[symbol]:
-                    results[symbol] = pd.DataFrame.from_dict(
-                        {d["reportDate"]: d for d in out[symbol]["balancesheet"]},
-                        orient="index",
+                    results[symbol] = apply_schema(
+                        pd.DataFrame.from_dict(
+                            {d["reportDate"]: d for d in out[symbol]["balancesheet"]},
+                            orient="index",
+                        ),
+                        SCHEMAS["balance-sheet"],
                     )
                 else:
                     results[symbol] = pd.DataFrame()
@@ -512,12 +881,17 @@ class Stock(_IEXBase):
         """
 
         def format(out):
+            import pandas as pd
+
             results = {}
             for symbol in out:
                 if out[symbol]:
-                    results[symbol] = pd.DataFrame.from_dict(
-                        {d["reportDate"]: d for d in out[symbol]["cashflow"]},
-                        orient="index",
+                    results[symbol] = apply_schema(
+                        pd.DataFrame.from_dict(
+                            {d["reportDate"]: d for d in out[symbol]["cashflow"]},
+                            orient="index",
+                        ),
+                        SCHEMAS["cash-flow"],
                     )
                 else:
                     results[symbol] = pd.DataFrame()
@@ -540,6 +914,8 @@ class Stock(_IEXBase):
         """
 
         def format(out):
+            import pandas as pd
+
             results = {}
             for symbol in out:
                 if out[symbol]:
@@ -574,6 +950,8 @@ class Stock(_IEXBase):
         """
 
         def format(out):
+            import pandas as pd
+
             results = {}
             for symbol in out:
                 if out[symbol]:
@@ -605,12 +983,17 @@ class Stock(_IEXBase):
         """
 
         def format(out):
+            import pandas as pd
+
             results = {}
             for symbol in out:
                 if out[symbol]:
-                    results[symbol] = pd.DataFrame.from_dict(
-                        {d["reportDate"]: d for d in out[symbol]["financials"]},
-                        orient="index",
+                    results[symbol] = apply_schema(
+                        pd.DataFrame.from_dict(
+                            {d["reportDate"]: d for d in out[symbol]["financials"]},
+                            orient="index",
+                        ),
+                        SCHEMAS["financials"],
                     )
                 else:
                     results[symbol] = pd.DataFrame()
@@ -636,12 +1019,17 @@ class Stock(_IEXBase):
         """
 
         def format(out):
+            import pandas as pd
+
             results = {}
             for symbol in out:
                 if out[symbol]:
-                    results[symbol] = pd.DataFrame.from_dict(
-                        {d["reportDate"]: d for d in out[symbol]["income"]},
-                        orient="index",
+                    results[symbol] = apply_schema(
+                        pd.DataFrame.from_dict(
+                            {d["reportDate"]: d for d in out[symbol]["income"]},
+                            orient="index",
+                        ),
+                        SCHEMAS["income"],
                     )
                 else:
                     results[symbol] = pd.DataFrame()
@@ -663,6 +1051,8 @@ class Stock(_IEXBase):
         """
 
         def format(out):
+            import pandas as pd
+
             results = {}
             for symbol in out:
                 if out[symbol]:
@@ -707,6 +1097,8 @@ class Stock(_IEXBase):
         """
 
         def format(out):
+            import pandas as pd
+
             data = {
                 (symbol, sheet["reportDate"]): sheet
                 for symbol in out
@@ -730,6 +1122,8 @@ class Stock(_IEXBase):
         """
 
         def format(out):
+            import pandas as pd
+
             out = {
                 (symbol, owner["entityProperName"]): owner
                 for symbol in out
@@ -751,6 +1145,8 @@ class Stock(_IEXBase):
         """
 
         def format(out):
+            import pandas as pd
+
             out = {
                 (symbol, owner["entityProperName"]): owner
                 for symbol in out
@@ -809,6 +1205,8 @@ class Stock(_IEXBase):
         """
 
         def format(out):
+            import pandas as pd
+
             if len(self.symbols) > 1:
                 out = {
                     (symbol, day["datetime"]): day
@@ -11,6 +11,7 @@ class CollectionsReader(_IEXBase):
     """
 
     _COLLECTION_TYPES = ["tag", "sector", "list"]
+    _streamable = True
 
     def __init__(self, collection_name, collection_type, **kwargs):
         self.collection_name = collection_name
@@ -1,23 +1,60 @@
+import copy
 import datetime
-
-import pandas as pd
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from iexfinance.base import _IEXBase
 from iexfinance.stocks.base import Stock
+from iexfinance.stocks.schemas import SCHEMAS
 from iexfinance.utils import _sanitize_dates
+from iexfinance.utils.columnar import (
+    DATE,
+    TABLE_FORMATS,
+    bars_to_frame,
+    records_to_frame,
+    records_to_table,
+)
+
+logger = logging.getLogger(__name__)
+
+# Messages per symbol per daily bar returned (see IEX Cloud data weighting)
+BAR_MESSAGES = 10
+CLOSE_ONLY_BAR_MESSAGES = 2
+
+
+def _last_closed_date():
+    """Latest date whose daily bars are final (midnight UTC is after the
+    US close)"""
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    return today - datetime.timedelta(days=1)
 
 
 class HistoricalReader(Stock):
     """
     Base class to download historical data from the chart endpoint
 
+    The requests are planned to minimise their message cost (see ``plan``).
+
     Reference: https://iextrading.com/developer/docs/#chart
+
+    Parameters
+    ----------
+    max_requests: int, default 10, optional
+        Maximum number of ``exactDate`` requests (one per weekday) which a
+        plan may use instead of a single ``range`` request
     """
 
-    def __init__(self, symbols, start=None, end=None, close_only=False, **kwargs):
+    # Parameters of the request being made, from the plan
+    _step = None
+
+    def __init__(
+        self, symbols, start=None, end=None, close_only=False, max_requests=10, **kwargs
+    ):
         start = start or datetime.datetime.today() - datetime.timedelta(days=365)
         self.start, self.end = _sanitize_dates(start, end)
         self.close_only = close_only
+        self.max_requests = max_requests
         super(HistoricalReader, self).__init__(symbols, **kwargs)
 
     @property
@@ -59,37 +96,221 @@ class HistoricalReader(Stock):
             "chartByDay": self.single_day,
             "chartCloseOnly": self.close_only,
         }
-        if self.single_day:
+        if self._step is not None:
+            params.update(self._step)
+        elif self.single_day:
             try:
                 params["exactDate"] = self.start.strftime("%Y%m%d")
             except AttributeError:
                 params["exactDate"] = self.start
         return params
 
-    def _format_output(self, out, format=None):
-        if self.output_format == "json":
-            return out
-        if len(self.symbols) > 1:
-            out = {
-                (symbol, day["date"]): day
-                for symbol in out
-                for day in out[symbol]["chart"]
+    def plan(self):
+        """Requests which ``fetch`` makes, chosen to minimise message cost
+
+        A ``range`` request returns the bars from the start of the range to
+        the latest trading day; with ``chartLast``, only those from
+        ``start``. An ``exactDate`` request returns the bar of one day. The
+        plan is either a single ``range`` request trimmed by ``chartLast``,
+        which also pays for the bars after ``end``, or one ``exactDate``
+        request per weekday from ``start`` to ``end``, which pays for those
+        bars only, when it is cheaper and needs at most ``max_requests``
+        requests.
+
+        Bars are counted as weekdays, since market holidays are not known,
+        so estimates are upper bounds.
+
+        Returns
+        -------
+        list of dict
+            One item per request, with the chart ``params`` of the request,
+            the ``end`` date of the bars it returns, the number of ``bars``
+            returned per symbol and the estimated ``messages`` for all
+            symbols
+        """
+        import numpy as np
+
+        weight = CLOSE_ONLY_BAR_MESSAGES if self.close_only else BAR_MESSAGES
+        weight *= len(self.symbols)
+        chart_range = self.chart_range
+        one_day = datetime.timedelta(days=1)
+        start, end = self.start.date(), self.end.date()
+        today = datetime.date.today()
+        trailing = int(np.busday_count(start, today + one_day))
+        days = np.arange(start, end + one_day, dtype="datetime64[D]")
+        days = days[np.is_busday(days)].tolist()
+        if 0 < len(days) < trailing and len(days) <= self.max_requests:
+            return [
+                {
+                    "params": {
+                        "range": "date",
+                        "exactDate": day.strftime("%Y%m%d"),
+                        "chartByDay": True,
+                    },
+                    "end": day,
+                    "bars": 1,
+                    "messages": weight,
+                }
+                for day in days
+            ]
+        return [
+            {
+                "params": {"range": chart_range, "chartLast": trailing},
+                "end": today,
+                "bars": trailing,
+                "messages": weight * trailing,
             }
-            result = pd.DataFrame.from_dict(out, orient="columns").T
-            result.index = result.index.set_levels(
-                [result.index.levels[0], pd.to_datetime(result.index.levels[1])]
+        ]
+
+    @property
+    def estimate(self):
+        """Estimated message cost of ``fetch`` (see ``plan``)"""
+        return sum(step["messages"] for step in self.plan())
+
+    def _execute_plan(self, url, steps):
+        """Makes the requests of a plan (concurrently) and joins the bars of
+        each symbol in date order"""
+        estimate = sum(step["messages"] for step in steps)
+        logger.info(
+            "Historical prices of %s symbols: %s requests, about %s messages"
+            % (len(self.symbols), len(steps), estimate)
+        )
+        self.client.meter.check(estimate)
+        self._from_cache = False
+        if len(steps) == 1:
+            self._step = steps[0]["params"]
+            try:
+                return self._execute_batch(url)
+            finally:
+                self._step = None
+        started = time.perf_counter()
+        event = self._new_event(url, self.params)
+        event.started = started
+        readers = []
+        for step in steps:
+            reader = copy.copy(self)
+            reader._step = step["params"]
+            readers.append(reader)
+        event.build = time.perf_counter() - started
+        workers = min(len(readers), self.client.pool_maxsize)
+        with ThreadPoolExecutor(workers) as pool:
+            # results are returned in step (date) order; steps are not
+            # planned again, but are sharded by symbol
+            results = list(pool.map(lambda reader: reader._execute_batch(url), readers))
+        out = {}
+        for reader, data in zip(readers, results):
+            if isinstance(data, list):
+                data = data[0]
+            for symbol, values in data.items():
+                chart = out.setdefault(symbol, {"chart": []})["chart"]
+                chart.extend(values.get("chart") or [])
+            self._from_cache = self._from_cache or reader._from_cache
+            self._merge_event(event, reader.last_event)
+        return out
+
+    def _cache_max_age(self, params):
+        max_age = super(HistoricalReader, self)._cache_max_age(params)
+        if max_age == 0:
+            return max_age
+        # Bars of closed dates do not change, so any response fetched after
+        # the end date has closed (midnight UTC is after the US close) can be
+        # reused indefinitely
+        closed = datetime.datetime.combine(
+            self.end.date() + datetime.timedelta(days=1),
+            datetime.time(0),
+            tzinfo=datetime.timezone.utc,
+        )
+        since_close = (
+            datetime.datetime.now(datetime.timezone.utc) - closed
+        ).total_seconds()
+        if since_close > 0:
+            return since_close
+        return max_age
+
+    def _execute_iex_query(self, url):
+        disk = self.client.disk_cache
+        if (
+            disk is None
+            or self.single_day
+            or self.json_parse_int
+            or self.json_parse_float
+        ):
+            return self._execute_plan(url, self.plan())
+        last_closed = _last_closed_date()
+        closed = self.end.date() <= last_closed
+        end = min(self.end.date(), last_closed)
+        out = {}
+        for symbol in self.symbols:
+            rows = disk.get_chart(symbol, self.start, end, self.close_only)
+            if rows is not None:
+                out[symbol] = {"chart": rows}
+        if closed and len(out) == len(self.symbols):
+            logger.debug("DISK CACHE HIT: %s" % ",".join(self.symbols))
+            self._new_event(url, self.params).cache = "disk"
+            self._from_cache = False
+            return out
+        # Ranges ending on a closed date only need the symbols which are not
+        # stored; open ranges need fresh bars for every symbol
+        symbols = self.symbols
+        if closed:
+            self.symbols = [symbol for symbol in symbols if symbol not in out]
+        try:
+            steps = self.plan()
+            data = self._execute_plan(url, steps)
+        finally:
+            self.symbols = symbols
+        # the bars are complete up to the end of the last request
+        covered = min(max(step["end"] for step in steps), last_closed)
+        for symbol, values in data.items():
+            disk.put_chart(
+                symbol,
+                values.get("chart") or [],
+                self.start,
+                covered,
+                self.close_only,
             )
-            idx = pd.IndexSlice
-            result = result.loc[idx[:, self.start : self.end], :]
-        else:
-            out = {entr["date"]: entr for entr in out[self.symbols[0]]["chart"]}
-            result = pd.DataFrame.from_dict(out, orient="columns").T
-            result.index = pd.to_datetime(result.index)
-            result = result.loc[self.start : self.end, :]
+        out.update(data)
+        return out
+
+    def _format_output(self, out, format=None):
+        if self.output_format == "json":
+            return super(HistoricalReader, self)._format_output(out)
+        if self.output_format in TABLE_FORMATS:
+            return self._convert_table(out)
+        import pandas as pd
+
+        result = bars_to_frame(
+            {symbol: out[symbol]["chart"] for symbol in out},
+            "date",
+            schema=SCHEMAS["chart"],
+            start=self.start,
+            end=self.end,
+        )
+        if len(self.symbols) == 1:
+            result.index = pd.DatetimeIndex(result.index.droplevel(0))
         if self.close_only is True:
             result = result.loc[:, ["close", "volume"]]
         return result
 
+    def _convert_table(self, out, schema=None):
+        """One row per symbol and day within the date range"""
+        start = self.start.strftime("%Y-%m-%d")
+        end = self.end.strftime("%Y-%m-%d")
+        records = [
+            {"symbol": symbol, **day}
+            for symbol in out
+            for day in out[symbol]["chart"]
+            if start <= day["date"] <= end
+        ]
+        if self.close_only is True:
+            records = [
+                {key: record.get(key) for key in ("symbol", "date", "close", "volume")}
+                for record in records
+            ]
+        return records_to_table(
+            records, schema={"date": DATE}, format=self.output_format
+        )
+
 
 class IntradayReader(_IEXBase):
     """
@@ -119,11 +340,34 @@ class IntradayReader(_IEXBase):
         else:
             return "stock/%s/chart/date/%s" % (self.symbol, self.date)
 
+    @property
+    def url_template(self):
+        if self.date is None:
+            return "stock/{symbol}/chart/1d"
+        return "stock/{symbol}/chart/date/{date}"
+
+    def _cache_max_age(self, params):
+        max_age = super(IntradayReader, self)._cache_max_age(params)
+        if max_age == 0 or self.date is None:
+            return max_age
+        try:
+            date = datetime.datetime.strptime(str(self.date), "%Y%m%d").date()
+        except ValueError:
+            return max_age
+        # Minute bars of closed dates do not change, while those of the
+        # current date are still being added
+        if date <= _last_closed_date():
+            return None
+        return max_age
+
     def _convert_output(self, out):
+        import pandas as pd
+
         if out:
-            df = pd.DataFrame(out).set_index("minute")
-            df.index = df.date + " " + df.index
-            df.index = pd.DatetimeIndex([pd.to_datetime(x) for x in df.index])
-            return df
+            df = records_to_frame(out, schema=SCHEMAS["intraday-prices"])
+            df.index = pd.DatetimeIndex(
+                pd.to_datetime(["%s %s" % (bar["date"], bar["minute"]) for bar in out])
+            )
+            return df.drop(columns="minute")
         else:
             return pd.DataFrame()
@@ -1,5 +1,3 @@
-import pandas as pd
-
 from iexfinance.base import _IEXBase
 
 
@@ -34,6 +32,8 @@ class MoversReader(_IEXBase):
         return "stock/market/list/" + self.mover
 
     def _convert_output(self, out):
+        import pandas as pd
+
         if out:
             return pd.DataFrame(out).set_index("symbol")
         else:
@@ -1,5 +1,3 @@
-import pandas as pd
-
 from iexfinance.base import _IEXBase
 
 
@@ -22,7 +20,17 @@ class OptionsReader(_IEXBase):
             self.option_side,
         )
 
+    @property
+    def url_template(self):
+        if self.expiration is None:
+            return "stock/{symbol}/options"
+        if self.option_side is None:
+            return "stock/{symbol}/options/{expiration}"
+        return "stock/{symbol}/options/{expiration}/{side}"
+
     def _convert_output(self, out):
+        import pandas as pd
+
         if self.expiration is None:
             return pd.DataFrame(out)
         else:
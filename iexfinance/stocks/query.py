@@ -0,0 +1,163 @@
+import copy
+from concurrent.futures import ThreadPoolExecutor
+
+from iexfinance.stocks.base import BATCH_LIMIT, TYPES_LIMIT
+
+
+def _normalize(params):
+    """Query parameters in the form used by ``Stock.params``, with hashable
+    values for comparison"""
+    out = {}
+    for key, value in params.items():
+        if key in ("filter", "range"):
+            key += "_"
+        if isinstance(value, (list, tuple)):
+            value = tuple(value)
+        out[key] = value
+    return out
+
+
+def _compatible(a, b):
+    """Whether two endpoints' parameters can be sent in one request
+
+    ``filter`` applies to every endpoint of a request, so it must be the
+    same; other parameters only need to agree where both set them."""
+    if a.get("filter_") != b.get("filter_"):
+        return False
+    return all(a[key] == b[key] for key in a.keys() & b.keys())
+
+
+class StockQuery(object):
+    """
+    Lazily executed query of several endpoints of a ``Stock``
+
+    Endpoints are added by calling methods named after the ``get_*`` methods
+    of ``Stock`` (e.g. ``quote`` for ``get_quote``), with their parameters.
+    Nothing is requested until ``execute`` is called, which groups the
+    endpoints into as few batch requests as possible and makes them
+    concurrently:
+
+    - endpoints whose parameters agree share a request (up to 10 endpoints
+      per request). ``filter`` applies to every endpoint of a request, so
+      only endpoints with the same ``filter`` are grouped.
+    - each request is split into batches of 100 symbols
+
+    Created with ``Stock.query``.
+
+    Parameters
+    ----------
+    stock: Stock
+        Symbols, client and output format of the query
+    """
+
+    def __init__(self, stock):
+        self.stock = stock
+        self._steps = []
+
+    def __repr__(self):
+        return "{}({}, endpoints={})".format(
+            self.__class__.__name__,
+            ",".join(self.stock.symbols),
+            [name for name, _, _, _ in self._steps],
+        )
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def add(**params):
+            return self.add(name, **params)
+
+        add.__name__ = name
+        return add
+
+    def add(self, name, **params):
+        """Adds an endpoint to the query
+
+        Parameters
+        ----------
+        name: str
+            Name of the ``get_*`` method of the endpoint, without ``get_``
+            (e.g. ``quote``, ``key_stats`` or ``chart``)
+        params:
+            Parameters of the endpoint (e.g. ``filter`` or ``range``)
+
+        Returns
+        -------
+        StockQuery
+            The query, to chain calls
+        """
+        if any(step[0] == name for step in self._steps):
+            raise ValueError("%s is already part of the query." % name)
+        planned = self.stock._plan_method("get_%s" % name)
+        if planned is None:
+            raise AttributeError("Stock has no endpoint method get_%s." % name)
+        endpoint, format = planned
+        self._steps.append((name, endpoint, format, _normalize(params)))
+        return self
+
+    def _groups(self):
+        groups = []
+        for name, endpoint, format, params in self._steps:
+            for group in groups:
+                if (
+                    len(group["formats"]) < TYPES_LIMIT
+                    and endpoint not in group["formats"]
+                    and _compatible(group["params"], params)
+                ):
+                    break
+            else:
+                group = {"names": {}, "formats": {}, "params": {}}
+                groups.append(group)
+            group["names"][name] = endpoint
+            group["formats"][endpoint] = format
+            group["params"].update(params)
+        return groups
+
+    def plan(self):
+        """Batch requests which ``execute`` will make
+
+        Returns
+        -------
+        list of dict
+            One item per group of endpoints, with the batch ``types``, the
+            query ``params`` and the number of ``requests`` (one per 100
+            symbols)
+        """
+        requests = -(-len(self.stock.symbols) // BATCH_LIMIT)
+        return [
+            {
+                "types": list(group["formats"]),
+                "params": dict(group["params"]),
+                "requests": requests,
+            }
+            for group in self._groups()
+        ]
+
+    def execute(self):
+        """Makes the requests of the query
+
+        Returns
+        -------
+        dict
+            Output of each endpoint, keyed by name, formatted as by its
+            ``get_*`` method
+        """
+        groups = self._groups()
+
+        def run(group):
+            stock = copy.copy(self.stock)
+            return stock._fetch_endpoints(group["formats"], group["params"])
+
+        if len(groups) == 1:
+            results = [run(groups[0])]
+        else:
+            workers = min(len(groups), self.stock.client.pool_maxsize)
+            with ThreadPoolExecutor(workers) as pool:
+                results = list(pool.map(run, groups))
+        out = {}
+        for group, data in zip(groups, results):
+            for name, endpoint in group["names"].items():
+                out[name] = data[endpoint]
+        # in the order the endpoints were added
+        return {name: out[name] for name, _, _, _ in self._steps}
@@ -0,0 +1,249 @@
+"""
+Column types of the pandas output of ``Stock`` endpoints
+
+Each schema maps a field of an endpoint to the type of its column:
+
+- a NumPy or pandas dtype (``"float64"``, or ``"Int64"`` for counts, which
+  keeps integers exact when some values are null)
+- ``"category"``, for strings repeated across symbols or periods
+- ``DATE``, for ``YYYY-MM-DD`` strings, converted to ``datetime64``
+- ``EPOCH_MS``, for times in milliseconds since the epoch, converted to
+  ``datetime64``
+
+Fields which are not listed keep the type inferred from the JSON values.
+"""
+
+from iexfinance.utils.columnar import DATE, EPOCH_MS
+
+_PRICE = "float64"
+_COUNT = "Int64"
+_CATEGORY = "category"
+
+
+def _fields(kind, *names):
+    return dict.fromkeys(names, kind)
+
+
+QUOTE = {
+    **_fields(
+        _CATEGORY,
+        "primaryExchange",
+        "calculationPrice",
+        "openSource",
+        "closeSource",
+        "highSource",
+        "lowSource",
+        "latestSource",
+        "currency",
+    ),
+    **_fields(
+        _PRICE,
+        "open",
+        "close",
+        "high",
+        "low",
+        "latestPrice",
+        "iexRealtimePrice",
+        "delayedPrice",
+        "oddLotDelayedPrice",
+        "extendedPrice",
+        "extendedChange",
+        "extendedChangePercent",
+        "previousClose",
+        "change",
+        "changePercent",
+        "iexMarketPercent",
+        "iexBidPrice",
+        "iexAskPrice",
+        "iexOpen",
+        "iexClose",
+        "peRatio",
+        "week52High",
+        "week52Low",
+        "ytdChange",
+    ),
+    **_fields(
+        _COUNT,
+        "latestVolume",
+        "iexRealtimeSize",
+        "previousVolume",
+        "volume",
+        "iexVolume",
+        "avgTotalVolume",
+        "iexBidSize",
+        "iexAskSize",
+        "marketCap",
+    ),
+    **_fields(
+        EPOCH_MS,
+        "openTime",
+        "closeTime",
+        "highTime",
+        "lowTime",
+        "latestUpdate",
+        "iexLastUpdated",
+        "delayedPriceTime",
+        "oddLotDelayedPriceTime",
+        "extendedPriceTime",
+        "iexOpenTime",
+        "iexCloseTime",
+        "lastTradeTime",
+    ),
+}
+
+DELAYED_QUOTE = {
+    **_fields(_PRICE, "delayedPrice", "high", "low"),
+    **_fields(_COUNT, "delayedSize", "totalVolume"),
+    **_fields(EPOCH_MS, "delayedPriceTime", "processedTime"),
+}
+
+PREVIOUS = {
+    "date": DATE,
+    **_fields(
+        _PRICE,
+        "open",
+        "close",
+        "high",
+        "low",
+        "uOpen",
+        "uClose",
+        "uHigh",
+        "uLow",
+        "change",
+        "changePercent",
+        "changeOverTime",
+    ),
+    **_fields(_COUNT, "volume", "uVolume"),
+}
+
+CHART = {
+    "date": DATE,
+    **_fields(
+        _PRICE,
+        "open",
+        "close",
+        "high",
+        "low",
+        "uOpen",
+        "uClose",
+        "uHigh",
+        "uLow",
+        "fOpen",
+        "fClose",
+        "fHigh",
+        "fLow",
+        "change",
+        "changePercent",
+        "changeOverTime",
+        "average",
+        "notional",
+        "marketOpen",
+        "marketClose",
+        "marketHigh",
+        "marketLow",
+        "marketAverage",
+        "marketNotional",
+        "marketChangeOverTime",
+    ),
+    **_fields(
+        _COUNT,
+        "volume",
+        "uVolume",
+        "fVolume",
+        "numberOfTrades",
+        "marketVolume",
+        "marketNumberOfTrades",
+    ),
+}
+
+KEY_STATS = {
+    **_fields(
+        _PRICE,
+        "week52high",
+        "week52low",
+        "week52highSplitAdjustOnly",
+        "week52lowSplitAdjustOnly",
+        "week52change",
+        "avg10Volume",
+        "avg30Volume",
+        "day200MovingAvg",
+        "day50MovingAvg",
+        "ttmEPS",
+        "ttmDividendRate",
+        "dividendYield",
+        "peRatio",
+        "beta",
+        "maxChangePercent",
+        "year5ChangePercent",
+        "year2ChangePercent",
+        "year1ChangePercent",
+        "ytdChangePercent",
+        "month6ChangePercent",
+        "month3ChangePercent",
+        "month1ChangePercent",
+        "day30ChangePercent",
+        "day5ChangePercent",
+    ),
+    **_fields(_COUNT, "marketcap", "sharesOutstanding", "float", "employees"),
+    **_fields(DATE, "nextDividendDate", "exDividendDate", "nextEarningsDate"),
+}
+
+ADVANCED_STATS = {
+    **KEY_STATS,
+    **_fields(
+        _PRICE,
+        "totalCash",
+        "currentDebt",
+        "revenue",
+        "grossProfit",
+        "totalRevenue",
+        "EBITDA",
+        "revenuePerShare",
+        "revenuePerEmployee",
+        "debtToEquity",
+        "profitMargin",
+        "enterpriseValue",
+        "enterpriseValueToRevenue",
+        "priceToSales",
+        "priceToBook",
+        "forwardPERatio",
+        "pegRatio",
+        "peHigh",
+        "peLow",
+        "putCallRatio",
+    ),
+    **_fields(DATE, "week52highDate", "week52lowDate"),
+}
+
+COMPANY = {
+    **_fields(
+        _CATEGORY,
+        "exchange",
+        "industry",
+        "sector",
+        "issueType",
+        "country",
+        "state",
+    ),
+    "employees": _COUNT,
+}
+
+STATEMENT = {
+    **_fields(DATE, "reportDate", "fiscalDate"),
+    **_fields(_CATEGORY, "filingType", "currency"),
+}
+
+SCHEMAS = {
+    "quote": QUOTE,
+    "delayed-quote": DELAYED_QUOTE,
+    "previous": PREVIOUS,
+    "chart": CHART,
+    "intraday-prices": CHART,
+    "stats": KEY_STATS,
+    "advanced-stats": ADVANCED_STATS,
+    "company": COMPANY,
+    "balance-sheet": STATEMENT,
+    "cash-flow": STATEMENT,
+    "income": STATEMENT,
+    "financials": STATEMENT,
+}
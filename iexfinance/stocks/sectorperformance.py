@@ -1,5 +1,3 @@
-import pandas as pd
-
 from iexfinance.base import _IEXBase
 
 
@@ -9,6 +7,8 @@ class SectorPerformanceReader(_IEXBase):
         return "stock/market/sector-performance"
 
     def _convert_output(self, out):
+        import pandas as pd
+
         if out:
             out = {item["name"]: item for item in out}
             return pd.DataFrame(out).T
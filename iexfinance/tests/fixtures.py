@@ -2,11 +2,17 @@ import os
 
 import pytest
 
+from iexfinance import Client
 from iexfinance.stocks import Stock
+from iexfinance.tests.standin import LocalServer
 
 __all__ = [
     "block_keys",
     "set_keys",
+    "local_server",
+    "make_client",
+    "local_client",
+    "batch_route",
     "stock_single",
     "stock_multiple",
     "stock_etf",
@@ -36,6 +42,84 @@ def set_keys(scope="function"):
     os.environ["IEX_TOKEN"] = token
 
 
+#######################
+# Local HTTP fixtures #
+#######################
+
+
+@pytest.fixture
+def local_server():
+    with LocalServer() as server:
+        yield server
+
+
+@pytest.fixture
+def make_client(local_server):
+    """Creates clients of ``local_server`` (keyword arguments are passed to
+    ``Client``), which are closed after the test"""
+    clients = []
+
+    def make(**kwargs):
+        kwargs.setdefault("token", "TESTKEY")
+        kwargs.setdefault("base_url", local_server.base_url)
+        client = Client(**kwargs)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+@pytest.fixture
+def local_client(make_client):
+    return make_client(pause=0)
+
+
+def _quote(symbol, params):
+    return {"symbol": symbol, "latestPrice": 100.0}
+
+
+class BatchRoute(object):
+    """
+    Stand-in for the ``stock/market/batch`` route of ``LocalServer``. The
+    body of each requested type is looked up in ``bodies``, whose values are
+    either the body or callables taking the symbol and the query parameters
+    (by default, quotes with a ``latestPrice`` of 100). Other types get
+    ``default``, or an empty object. As by IEX Cloud, ``filter`` is applied
+    to object bodies.
+    """
+
+    def __init__(self, bodies=None, default=None):
+        self.bodies = {"quote": _quote} if bodies is None else dict(bodies)
+        self.default = default
+
+    def _body(self, kind, symbol, params):
+        body = self.bodies.get(kind, self.default)
+        if callable(body):
+            return body(symbol, params)
+        return {} if body is None else body
+
+    def __call__(self, params):
+        fields = params.get("filter")
+        fields = fields.split(",") if fields else None
+        out = {}
+        for symbol in params["symbols"].split(","):
+            out[symbol] = {}
+            for kind in params["types"].split(","):
+                body = self._body(kind, symbol, params)
+                if fields and isinstance(body, dict):
+                    body = {k: v for k, v in body.items() if k in fields}
+                out[symbol][kind] = body
+        return 200, out
+
+
+@pytest.fixture
+def batch_route(local_server):
+    route = local_server.routes["stock/market/batch"] = BatchRoute()
+    return route
+
+
 ###################
 # Stocks fixtures #
 ###################
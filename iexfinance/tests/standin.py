@@ -0,0 +1,159 @@
+"""
+Local stand-in for the IEX Cloud HTTP API, used by the offline tests and the
+benchmark suite.
+
+The server speaks HTTP/1.1 with keep-alive (optionally over TLS with a
+throwaway self-signed certificate), so that requests can be made and
+client-side overhead measured without network access or an IEX Cloud token.
+"""
+
+import json
+import os
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+
+def _make_certificate(directory):
+    certfile = os.path.join(directory, "cert.pem")
+    keyfile = os.path.join(directory, "key.pem")
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-days",
+            "1",
+            "-subj",
+            "/CN=localhost",
+            "-addext",
+            "subjectAltName=DNS:localhost,IP:127.0.0.1",
+            "-keyout",
+            keyfile,
+            "-out",
+            certfile,
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return certfile, keyfile
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        # strip the leading version segment (e.g. /stable/)
+        path = parts.path.lstrip("/").split("/", 1)[-1]
+        params = dict(parse_qsl(parts.query))
+        status, body, headers = self.server.respond(path, params)
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _not_found(path, params):
+    return 404, b"Not found"
+
+
+class LocalServer(ThreadingHTTPServer):
+    """
+    Threaded local IEX Cloud stand-in
+
+    Responses are looked up by request path (without the version segment) in
+    ``routes``, whose values are either ``(status, body, headers)`` tuples
+    (``headers`` being optional), lists of such tuples (served in order, the
+    last one repeating) or callables taking the query parameters. Other
+    paths are answered by ``fallback``. All requests are logged in
+    ``requests`` as ``(path, params)``.
+
+    Parameters
+    ----------
+    fallback: callable, optional
+        Called with the path and the query parameters of requests which are
+        not in ``routes``, returning a response tuple. Responds ``404`` by
+        default.
+    tls: bool, default False
+        Serve over HTTPS with a self-signed certificate. The certificate path
+        is available as ``certfile`` for use as a ``verify`` bundle.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, fallback=None, tls=False):
+        super(LocalServer, self).__init__(("127.0.0.1", 0), _Handler)
+        self.routes = {}
+        self.fallback = fallback or _not_found
+        self.requests = []
+        self.connections = 0
+        self.tls = tls
+        self.certfile = None
+        self._tmpdir = None
+        self._lock = threading.Lock()
+        if tls:
+            self._tmpdir = tempfile.mkdtemp()
+            self.certfile, keyfile = _make_certificate(self._tmpdir)
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(self.certfile, keyfile)
+            self.socket = context.wrap_socket(self.socket, server_side=True)
+
+    @property
+    def base_url(self):
+        scheme = "https" if self.tls else "http"
+        return "%s://127.0.0.1:%s/stable/" % (scheme, self.server_port)
+
+    def get_request(self):
+        request = super(LocalServer, self).get_request()
+        with self._lock:
+            self.connections += 1
+        return request
+
+    def respond(self, path, params):
+        with self._lock:
+            self.requests.append((path, params))
+            route = self.routes.get(path)
+            if isinstance(route, list):
+                route = route.pop(0) if len(route) > 1 else route[0]
+        if route is None:
+            route = self.fallback(path, params)
+        elif callable(route):
+            route = route(params)
+        if len(route) == 2:
+            route = route + ({},)
+        return route
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._tmpdir is not None:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
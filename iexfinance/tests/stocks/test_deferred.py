@@ -0,0 +1,104 @@
+import pandas as pd
+import pytest
+
+from iexfinance.stocks import Stock
+from iexfinance.stocks.base import DeferredField
+
+QUOTE = {"companyName": "Apple Inc.", "open": 1.0, "close": 2.0, "marketCap": 3}
+STATS = {"beta": 1.2, "float": 100}
+
+
+class TestDeferred(object):
+    def test_single_request(self, local_server, local_client, batch_route):
+        batch_route.bodies.update(quote=QUOTE, stats=STATS)
+        aapl = Stock("AAPL", client=local_client)
+        with aapl.deferred():
+            name = aapl.get_company_name()
+            open_ = aapl.get_open()
+            close = aapl.get_close()
+            beta = aapl.get_beta()
+            float_ = aapl.get_float()
+            assert isinstance(name, DeferredField)
+            assert not name.done
+
+        assert len(local_server.requests) == 1
+        params = local_server.requests[0][1]
+        assert params["types"] == "quote,stats"
+        assert params["filter"] == "companyName,open,close,beta,float"
+        assert name.value == "Apple Inc."
+        assert open_.value == 1.0
+        assert close.value == 2.0
+        assert beta.value == 1.2
+        assert float_.value == 100
+
+    def test_matches_immediate_calls(self, local_server, local_client, batch_route):
+        batch_route.bodies.update(quote=QUOTE, stats=STATS)
+        stocks = Stock(["AAPL", "TSLA"], client=local_client, output_format="json")
+        with stocks.deferred():
+            cap = stocks.get_market_cap()
+
+        assert cap.value == stocks.get_market_cap()
+        assert cap.value == {"AAPL": 3, "TSLA": 3}
+
+    def test_pending_value(self, local_server, local_client, batch_route):
+        batch_route.bodies.update(quote=QUOTE, stats=STATS)
+        aapl = Stock("AAPL", client=local_client)
+        with aapl.deferred():
+            name = aapl.get_company_name()
+            with pytest.raises(ValueError):
+                name.value
+
+    def test_missing_field(self, local_client, batch_route):
+        batch_route.bodies["quote"] = {"open": 1.0}
+        aapl = Stock("AAPL", client=local_client, output_format="json")
+        with aapl.deferred():
+            name = aapl.get_company_name()
+            open_ = aapl.get_open()
+
+        assert open_.value == 1.0
+        with pytest.raises(KeyError):
+            name.value
+
+    def test_matches_immediate_calls_pandas(self, local_client, batch_route):
+        batch_route.bodies.update(quote=QUOTE, stats=STATS)
+        stocks = Stock(["AAPL", "TSLA"], client=local_client)
+        with stocks.deferred():
+            stocks.get_open()
+            cap = stocks.get_market_cap()
+
+        pd.testing.assert_frame_equal(cap.value, stocks.get_market_cap())
+        assert list(cap.value.columns) == ["marketCap"]
+
+    def test_matches_immediate_calls_arrow(self, local_client, batch_route):
+        pytest.importorskip("pyarrow")
+        batch_route.bodies.update(quote=QUOTE, stats=STATS)
+        stocks = Stock(["AAPL", "TSLA"], client=local_client, output_format="arrow")
+        with stocks.deferred():
+            stocks.get_open()
+            cap = stocks.get_market_cap()
+
+        assert cap.value.equals(stocks.get_market_cap())
+        assert cap.value.column_names == ["symbol", "marketCap"]
+
+    def test_error_in_block(self, local_server, local_client):
+        aapl = Stock("AAPL", client=local_client)
+        with pytest.raises(RuntimeError):
+            with aapl.deferred():
+                name = aapl.get_company_name()
+                raise RuntimeError
+
+        assert not name.done
+        assert len(local_server.requests) == 0
+        # calls are no longer deferred
+        assert aapl._deferred is None
+
+    def test_request_error(self, local_server, local_client):
+        local_server.routes["stock/market/batch"] = (400, b"Bad request")
+        aapl = Stock("AAPL", client=local_client)
+        with pytest.raises(Exception):
+            with aapl.deferred():
+                name = aapl.get_company_name()
+
+        assert name.done
+        with pytest.raises(Exception):
+            name.value
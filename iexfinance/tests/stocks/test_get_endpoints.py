@@ -0,0 +1,96 @@
+import pandas as pd
+import pytest
+
+from iexfinance.stocks import Stock
+
+BODIES = {
+    "quote": lambda symbol, params: {"symbol": symbol, "latestPrice": 1.0},
+    "company": lambda symbol, params: {
+        "symbol": symbol,
+        "companyName": symbol + " Inc.",
+    },
+    "stats": lambda symbol, params: {"companyName": symbol + " Inc.", "beta": 1.1},
+    "news": lambda symbol, params: [
+        {"datetime": 1596634200000, "headline": symbol + " up"},
+        {"datetime": 1596634300000, "headline": symbol + " down"},
+    ],
+    "book": lambda symbol, params: {
+        "quote": {"symbol": symbol},
+        "bids": [],
+        "asks": [],
+    },
+}
+
+
+class TestGetEndpoints(object):
+    def test_one_request(self, local_server, local_client, batch_route):
+        batch_route.bodies.update(BODIES)
+        stock = Stock(["AAPL", "TSLA"], client=local_client)
+        data = stock.get_endpoints(["quote", "company", "stats", "news"])
+
+        assert len(local_server.requests) == 1
+        assert local_server.requests[0][1]["types"] == "quote,company,stats,news"
+        assert list(data) == ["quote", "company", "stats", "news"]
+        assert all(isinstance(df, pd.DataFrame) for df in data.values())
+        # each endpoint is formatted as its get_* method formats it
+        assert list(data["quote"].index) == ["AAPL", "TSLA"]
+        assert data["stats"].loc["AAPL", "beta"] == 1.1
+        assert len(data["news"]) == 4
+
+    def test_matches_get_methods(self, local_server, local_client, batch_route):
+        batch_route.bodies.update(BODIES)
+        stock = Stock(["AAPL", "TSLA"], client=local_client)
+        data = stock.get_endpoints(["news", "book"])
+
+        pd.testing.assert_frame_equal(data["news"], stock.get_news())
+        assert data["book"] == stock.get_book()
+
+    def test_json_single_symbol(self, local_server, local_client, batch_route):
+        batch_route.bodies.update(BODIES)
+        stock = Stock("AAPL", client=local_client, output_format="json")
+        data = stock.get_endpoints("quote")
+
+        assert data == {"quote": {"symbol": "AAPL", "latestPrice": 1.0}}
+
+    def test_split_by_ten(self, local_server, local_client, batch_route):
+        batch_route.bodies.update(BODIES)
+        endpoints = [
+            "quote",
+            "company",
+            "stats",
+            "news",
+            "book",
+            "logo",
+            "peers",
+            "price-target",
+            "ohlc",
+            "previous",
+            "delayed-quote",
+            "advanced-stats",
+        ]
+        hooked = []
+        local_client.add_hook(hooked.append)
+        data = Stock("AAPL", client=local_client, output_format="json").get_endpoints(
+            endpoints
+        )
+
+        assert [len(p["types"].split(",")) for _, p in local_server.requests] == [
+            10,
+            2,
+        ]
+        assert list(data) == endpoints
+        assert len(hooked) == 2
+
+    def test_params(self, local_server, local_client, batch_route):
+        batch_route.bodies.update(BODIES)
+        Stock("AAPL", client=local_client).get_endpoints(["news", "chart"], last=5)
+
+        assert local_server.requests[0][1]["last"] == "5"
+
+    def test_invalid(self, local_client):
+        stock = Stock("AAPL", client=local_client)
+
+        with pytest.raises(NotImplementedError):
+            stock.get_endpoints(["quote", "not-an-endpoint"])
+        with pytest.raises(ValueError):
+            stock.get_endpoints([])
@@ -0,0 +1,161 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from iexfinance.stocks.historical import HistoricalReader
+from iexfinance.utils.exceptions import IEXMessageBudgetError
+
+BARS = [
+    {"date": "2017-01-03", "close": 116.15, "volume": 28781865},
+    {"date": "2017-01-04", "close": 116.02, "volume": 21118116},
+    {"date": "2017-01-05", "close": 116.61, "volume": 22193587},
+]
+
+
+def _chart(symbol, params):
+    # the bar of an exactDate request, or all bars of a range
+    day = params.get("exactDate")
+    return [bar for bar in BARS if day in (None, bar["date"].replace("-", ""))]
+
+
+def _weekdays(start, end):
+    return int(np.busday_count(start, end + datetime.timedelta(days=1)))
+
+
+class TestPlan(object):
+    def test_exact_dates(self):
+        reader = HistoricalReader(
+            ["AAPL", "MSFT"], start="2017-01-02", end="2017-01-05"
+        )
+        plan = reader.plan()
+
+        assert [step["params"]["exactDate"] for step in plan] == [
+            "20170102",
+            "20170103",
+            "20170104",
+            "20170105",
+        ]
+        assert all(step["params"]["range"] == "date" for step in plan)
+        assert plan[-1]["end"] == datetime.date(2017, 1, 5)
+        assert reader.estimate == 4 * 2 * 10
+
+    def test_trailing_range(self):
+        today = datetime.date.today()
+        start = today - datetime.timedelta(days=30)
+        reader = HistoricalReader("AAPL", start=start, end=today)
+        (step,) = reader.plan()
+
+        assert step["params"]["range"] == reader.chart_range
+        assert step["params"]["chartLast"] == _weekdays(start, today)
+        assert reader.estimate == 10 * _weekdays(start, today)
+
+    def test_max_requests(self):
+        reader = HistoricalReader(
+            "AAPL", start="2017-01-02", end="2017-01-05", max_requests=3
+        )
+        (step,) = reader.plan()
+
+        assert step["params"]["range"] == reader.chart_range
+        assert step["params"]["chartLast"] == _weekdays(
+            datetime.date(2017, 1, 2), datetime.date.today()
+        )
+
+    def test_weekend(self):
+        # no weekday to request by date, so the range is requested
+        reader = HistoricalReader("AAPL", start="2017-01-07", end="2017-01-08")
+
+        assert "chartLast" in reader.plan()[0]["params"]
+
+    def test_close_only(self):
+        reader = HistoricalReader(
+            "AAPL", start="2017-01-02", end="2017-01-05", close_only=True
+        )
+
+        assert reader.estimate == 4 * 2
+
+
+class TestExecutePlan(object):
+    def test_exact_dates(self, local_server, local_client, batch_route):
+        batch_route.bodies["chart"] = _chart
+        data = HistoricalReader(
+            ["AAPL", "MSFT"],
+            start="2017-01-02",
+            end="2017-01-05",
+            client=local_client,
+        ).fetch()
+
+        assert len(local_server.requests) == 4
+        assert {params["range"] for _, params in local_server.requests} == {"date"}
+        assert list(data.loc["AAPL", "close"]) == [116.15, 116.02, 116.61]
+        assert list(data.loc["MSFT"].index.strftime("%Y-%m-%d")) == [
+            "2017-01-03",
+            "2017-01-04",
+            "2017-01-05",
+        ]
+
+    def test_exact_dates_sharded(self, local_server, local_client, batch_route):
+        batch_route.bodies["chart"] = _chart
+        symbols = ["S%03d" % i for i in range(150)]
+        data = HistoricalReader(
+            symbols, start="2017-01-02", end="2017-01-05", client=local_client
+        ).fetch()
+
+        # four exactDate requests of two shards each
+        assert len(local_server.requests) == 8
+        assert len(data) == 150 * 3
+        assert not data.index.has_duplicates
+
+    def test_metrics(self, local_server, batch_route, make_client):
+        batch_route.bodies["chart"] = _chart
+        client = make_client(metrics=True)
+        HistoricalReader(
+            "AAPL", start="2017-01-02", end="2017-01-05", client=client
+        ).fetch()
+
+        batch = client.metrics.snapshot()["stock/market/batch"]
+        # exactDate requests are requests, not retries
+        assert (batch["calls"], batch["requests"], batch["retries"]) == (1, 4, 0)
+
+    def test_trailing_range(self, local_server, local_client, batch_route):
+        batch_route.bodies["chart"] = _chart
+        today = datetime.date.today()
+        reader = HistoricalReader(
+            "AAPL",
+            start=today - datetime.timedelta(days=30),
+            end=today,
+            client=local_client,
+            output_format="json",
+        )
+        reader.fetch()
+
+        ((_, params),) = local_server.requests
+        assert params["chartLast"] == str(reader.plan()[0]["bars"])
+        assert "exactDate" not in params
+
+    def test_default_end(self, local_server, local_client, batch_route):
+        # end defaults to today
+        start = datetime.date.today() - datetime.timedelta(days=14)
+        days = np.arange(start, datetime.date.today(), dtype="datetime64[D]")
+        bars = [
+            {"date": str(day), "close": 1.0, "volume": 10}
+            for day in days[np.is_busday(days)]
+        ]
+        batch_route.bodies["chart"] = bars
+        reader = HistoricalReader("AAPL", start=start, client=local_client)
+        data = reader.fetch()
+
+        assert reader.end.date() == datetime.date.today()
+        assert "chartLast" in local_server.requests[0][1]
+        assert len(data) == len(bars)
+
+    def test_budget_checked_first(self, local_server, batch_route, make_client):
+        batch_route.bodies["chart"] = _chart
+        client = make_client(message_budget=30)
+        reader = HistoricalReader(
+            "AAPL", start="2017-01-02", end="2017-01-05", client=client
+        )
+
+        with pytest.raises(IEXMessageBudgetError):
+            reader.fetch()
+        assert local_server.requests == []
@@ -0,0 +1,103 @@
+import pandas as pd
+import pytest
+
+from iexfinance.stocks import Stock
+
+SYMBOLS = ["S%03d" % i for i in range(150)]
+
+
+def _news(symbol, params):
+    return [{"datetime": 1, "headline": "x"}] * int(params.get("last", 1))
+
+
+def _object(symbol, params):
+    # quote, stats and other object endpoints
+    return {"symbol": symbol, "latestPrice": 1.0, "beta": 1.1}
+
+
+BODIES = {"chart": [{"date": "2020-01-02", "close": 1.0}], "news": _news}
+
+
+class TestStockQuery(object):
+    def test_single_request(self, local_server, local_client, batch_route):
+        batch_route.bodies = dict(BODIES)
+        batch_route.default = _object
+        query = (
+            Stock(["AAPL", "TSLA"], client=local_client)
+            .query()
+            .quote()
+            .key_stats()
+            .chart(range_="1m")
+        )
+
+        assert query.plan() == [
+            {
+                "types": ["quote", "stats", "chart"],
+                "params": {"range_": "1m"},
+                "requests": 1,
+            }
+        ]
+        data = query.execute()
+
+        assert len(local_server.requests) == 1
+        assert local_server.requests[0][1]["range"] == "1m"
+        assert list(data) == ["quote", "key_stats", "chart"]
+        assert isinstance(data["quote"], pd.DataFrame)
+        assert list(data["quote"].index) == ["AAPL", "TSLA"]
+
+    def test_filters_split_requests(self, local_server, local_client, batch_route):
+        batch_route.bodies = dict(BODIES)
+        batch_route.default = _object
+        data = (
+            Stock("AAPL", client=local_client, output_format="json")
+            .query()
+            .quote(filter=["latestPrice"])
+            .key_stats(filter=["beta"])
+            .company()
+            .execute()
+        )
+
+        # filters apply to every endpoint of a request
+        assert len(local_server.requests) == 3
+        filters = sorted(p.get("filter", "") for _, p in local_server.requests)
+        assert filters == ["", "beta", "latestPrice"]
+        assert data["quote"] == {"latestPrice": 1.0}
+        assert data["key_stats"] == {"beta": 1.1}
+        assert len(data["company"]) == 3
+
+    def test_conflicting_params(self, local_server, local_client, batch_route):
+        batch_route.bodies = dict(BODIES)
+        batch_route.default = _object
+        query = (
+            Stock("AAPL", client=local_client, output_format="json")
+            .query()
+            .news(last=2)
+            .earnings(last=4)
+        )
+
+        assert len(query.plan()) == 2
+        data = query.execute()
+        assert len(data["news"]) == 2
+
+    def test_sharded_and_concurrent(self, local_server, local_client, batch_route):
+        batch_route.bodies = dict(BODIES)
+        batch_route.default = _object
+        query = Stock(SYMBOLS, client=local_client).query().quote(filter=["beta"])
+        query.company()
+
+        assert [p["requests"] for p in query.plan()] == [2, 2]
+        data = query.execute()
+
+        assert len(local_server.requests) == 4
+        assert list(data["quote"].index) == SYMBOLS
+
+    def test_invalid(self, local_client):
+        query = Stock("AAPL", client=local_client).query()
+
+        with pytest.raises(AttributeError):
+            query.not_an_endpoint()
+        with pytest.raises(AttributeError):
+            query.company_name()
+        query.quote()
+        with pytest.raises(ValueError):
+            query.quote()
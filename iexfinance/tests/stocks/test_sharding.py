@@ -0,0 +1,100 @@
+import datetime
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from iexfinance.stocks import Stock, get_historical_data
+from iexfinance.utils.exceptions import IEXQueryError
+
+SYMBOLS = ["S%03d" % i for i in range(250)]
+
+
+BARS = [
+    {"date": "2020-01-02", "close": 1.0, "volume": 10},
+    {"date": "2020-01-03", "close": 2.0, "volume": 20},
+]
+
+
+class TestSharding(object):
+    def test_quote(self, local_server, local_client, batch_route):
+        symbols = list(reversed(SYMBOLS))
+        stock = Stock(symbols, client=local_client, output_format="json")
+        data = stock.get_quote()
+
+        assert list(data) == symbols
+        assert len(local_server.requests) == 3
+        batches = [params["symbols"].split(",") for _, params in local_server.requests]
+        assert sorted(len(batch) for batch in batches) == [50, 100, 100]
+        assert sorted(sum(batches, [])) == sorted(symbols)
+
+        event = stock.last_event
+        assert event.requests == event.attempts == 3
+        assert event.retries == 0
+        assert event.status == 200
+        assert event.bytes > 0
+
+    def test_metrics(self, local_server, batch_route, make_client):
+        client = make_client(metrics=True)
+        Stock(SYMBOLS, client=client, output_format="json").get_quote()
+
+        batch = client.metrics.snapshot()["stock/market/batch"]
+        # shards are requests, not retries
+        assert (batch["calls"], batch["requests"], batch["retries"]) == (1, 3, 0)
+
+    def test_quote_pandas(self, local_server, local_client, batch_route):
+        data = Stock(SYMBOLS, client=local_client).get_quote()
+
+        assert isinstance(data, pd.DataFrame)
+        assert list(data.index) == SYMBOLS
+
+    def test_duplicates(self, local_server, local_client, batch_route):
+        symbols = SYMBOLS[:150] * 2
+        data = Stock(symbols, client=local_client, output_format="json").get_quote()
+
+        assert list(data) == SYMBOLS[:150]
+        assert len(local_server.requests) == 2
+
+    def test_concurrent(self, local_server, local_client, batch_route):
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow(params):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.2)
+            with lock:
+                active.pop()
+            return batch_route(params)
+
+        local_server.routes["stock/market/batch"] = slow
+        Stock(SYMBOLS, client=local_client, output_format="json").get_quote()
+
+        assert max(peak) == 3
+
+    def test_error(self, local_server, local_client, batch_route):
+        def fail_second(params):
+            if params["symbols"].startswith("S100"):
+                return 400, b"Bad request"
+            return batch_route(params)
+
+        local_server.routes["stock/market/batch"] = fail_second
+
+        with pytest.raises(IEXQueryError):
+            Stock(SYMBOLS, client=local_client).get_quote()
+
+    def test_historical(self, local_server, local_client, batch_route):
+        batch_route.bodies["chart"] = BARS
+        data = get_historical_data(
+            SYMBOLS,
+            datetime.date(2020, 1, 1),
+            datetime.date(2020, 1, 31),
+            client=local_client,
+        )
+
+        assert len(local_server.requests) == 3
+        assert list(data.index.get_level_values(0).unique()) == SYMBOLS
+        assert len(data) == 2 * len(SYMBOLS)
@@ -30,10 +30,10 @@ class TestBase(object):
             ls = []
             Stock(ls)
 
-    def test_symbol_list_too_long(self):
-        with pytest.raises(ValueError):
-            x = ["tsla"] * 102
-            Stock(x)
+    def test_symbol_list_deduplicated(self):
+        x = ["tsla"] * 102 + ["aapl", "TSLA"]
+
+        assert Stock(x).symbols == ["TSLA", "AAPL"]
 
     def test_filter(self):
         data = self.a.get_quote(filter_="ytdChange")
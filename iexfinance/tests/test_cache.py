@@ -0,0 +1,205 @@
+import datetime
+import time
+
+import pandas as pd
+
+from iexfinance import Client
+from iexfinance.refdata.base import Sectors, TradingDatesReader
+from iexfinance.stocks import Stock
+from iexfinance.stocks.historical import HistoricalReader, IntradayReader
+from iexfinance.utils.cache import DAY, ResponseCache
+
+
+class TestResponseCache(object):
+    def test_ttl_for(self):
+        cache = ResponseCache()
+
+        assert cache.ttl_for("stock/market/batch", {"types": "quote"}) == 5
+        assert cache.ttl_for("stock/market/batch", {"types": "company"}) == DAY
+        assert cache.ttl_for("stock/market/batch", {"types": "company,quote"}) == 5
+        assert cache.ttl_for("ref-data/symbols", {}) == DAY
+        assert cache.ttl_for("stock/{symbol}/chart/date/{date}", {}) == 60
+        assert cache.ttl_for("stock/{symbol}/chart/1d", {}) == 60
+        assert cache.ttl_for("account/usage/messages", {}) == 0
+        assert cache.ttl_for("stock/market/batch", {"types": "unknown"}) == 0
+
+    def test_custom_ttls(self):
+        cache = ResponseCache(ttls={"quote": 0, "ref-data": None}, default_ttl=10)
+
+        assert cache.ttl_for("stock/market/batch", {"types": "quote"}) == 0
+        assert cache.ttl_for("ref-data/symbols", {}) is None
+        assert cache.ttl_for("tops", {}) == 10
+
+    def test_key_ignores_token(self):
+        key1 = ResponseCache.make_key("url", {"a": 1, "token": "x"})
+        key2 = ResponseCache.make_key("url", {"token": "y", "a": "1"})
+
+        assert key1 == key2
+
+    def test_get_set(self):
+        cache = ResponseCache()
+        cache.set("key", [1, 2], size=10)
+
+        assert cache.get("key") == (True, [1, 2])
+        assert cache.get("missing") == (False, None)
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_max_age(self):
+        cache = ResponseCache()
+        cache.set("key", 1)
+        time.sleep(0.02)
+
+        assert cache.get("key", max_age=10) == (True, 1)
+        assert cache.get("key", max_age=0.01) == (False, None)
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") == (False, None)
+        assert cache.get("a") == (True, 1)
+        assert cache.stats()["evictions"] == 1
+
+    def test_memory_cap(self):
+        cache = ResponseCache(max_bytes=100)
+        cache.set("a", 1, size=60)
+        cache.set("b", 2, size=60)
+        cache.set("c", 3, size=1000)
+
+        assert cache.get("a") == (False, None)
+        assert cache.get("c") == (False, None)
+        assert cache.bytes == 60
+
+
+class TestFetchCache(object):
+    def test_cache_disabled_by_default(self, local_server, local_client):
+        local_server.routes["ref-data/sectors"] = (200, [{"name": "Energy"}])
+        Sectors(client=local_client).fetch()
+        Sectors(client=local_client).fetch()
+
+        assert local_client.cache is None
+        assert len(local_server.requests) == 2
+
+    def test_repeated_calls_cached(self, local_server, make_client):
+        client = make_client(cache=True)
+        local_server.routes["ref-data/sectors"] = (200, [{"name": "Energy"}])
+        first = Sectors(client=client).fetch()
+        second = Sectors(client=client).fetch()
+
+        assert len(local_server.requests) == 1
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_stock_cached(self, local_server, make_client):
+        client = make_client(cache=True)
+        local_server.routes["stock/market/batch"] = (
+            200,
+            {"AAPL": {"company": {"symbol": "AAPL", "sector": "Technology"}}},
+        )
+        a = Stock("AAPL", client=client, output_format="json")
+        a.get_company()
+        data = a.get_company()
+
+        assert data["sector"] == "Technology"
+        assert len(local_server.requests) == 1
+
+    def test_json_output_not_shared(self, local_server, make_client):
+        client = make_client(cache=True)
+        local_server.routes["ref-data/sectors"] = (200, [{"name": "Energy"}])
+        first = Sectors(client=client, output_format="json").fetch()
+        first[0]["name"] = "Modified"
+        second = Sectors(client=client, output_format="json").fetch()
+
+        assert second == [{"name": "Energy"}]
+
+    def test_cached_flag_reset(self, local_server, make_client):
+        client = make_client(cache=True)
+        local_server.routes["ref-data/sectors"] = (200, [{"name": "Energy"}])
+        reader = Sectors(client=client, output_format="json")
+        reader.fetch()
+        assert reader._from_cache
+
+        # later responses which are not shared are not copied
+        client.cache = None
+        reader.fetch()
+        assert not reader._from_cache
+
+    def test_uncacheable_endpoint(self, local_server, make_client):
+        local_server.routes["stock/market/batch"] = (
+            200,
+            {"AAPL": {"quote": {"symbol": "AAPL"}}},
+        )
+        cache = ResponseCache(ttls={"quote": 0})
+        client = make_client(cache=cache)
+        a = Stock("AAPL", client=client)
+        a.get_quote()
+        a.get_quote()
+
+        assert len(local_server.requests) == 2
+
+    def test_different_params(self, local_server, make_client):
+        client = make_client(cache=True)
+        local_server.routes["stock/market/batch"] = (
+            200,
+            {"AAPL": {"quote": {"symbol": "AAPL"}}},
+        )
+        a = Stock("AAPL", client=client)
+        a.get_quote()
+        a.get_quote(displayPercent=True)
+
+        assert len(local_server.requests) == 2
+
+
+class TestHistoricalCache(object):
+    def test_closed_dates_cached_forever(self):
+        client = Client(cache=True)
+        reader = HistoricalReader(
+            "AAPL", start="2017-01-01", end="2017-02-01", client=client
+        )
+        max_age = reader._cache_max_age(reader.params)
+
+        # any response fetched after 2017-02-02 00:00 UTC is accepted
+        assert max_age > 365 * DAY
+
+    def test_open_dates_use_endpoint_ttl(self):
+        client = Client(cache=True)
+        reader = HistoricalReader("AAPL", end=datetime.date.today(), client=client)
+
+        assert reader._cache_max_age(reader.params) == client.cache.ttls["chart"]
+
+    def test_intraday_closed_date_cached_forever(self):
+        client = Client(cache=True)
+        reader = IntradayReader("AAPL", datetime.date(2018, 11, 27), client=client)
+
+        assert reader._cache_max_age(reader.params) is None
+
+    def test_intraday_today_uses_endpoint_ttl(self):
+        client = Client(cache=True)
+        today = datetime.datetime.now(datetime.timezone.utc).date()
+        reader = IntradayReader("AAPL", today, client=client)
+
+        assert reader._cache_max_age(reader.params) == 60
+
+
+class TestTradingDatesCache(object):
+    def test_expires_at_midnight(self):
+        client = Client(cache=True)
+        reader = TradingDatesReader("trade", "next", client=client)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        since_midnight = now.hour * 3600 + now.minute * 60 + now.second
+
+        # responses fetched before the last UTC midnight are not reused
+        assert since_midnight <= reader._cache_max_age(reader.params) < DAY
+        assert reader._cache_max_age(reader.params) <= since_midnight + 1
+
+    def test_fixed_start_date(self):
+        client = Client(cache=True)
+        reader = TradingDatesReader(
+            "trade", "next", startDate=datetime.date(2017, 1, 3), client=client
+        )
+
+        assert reader._cache_max_age(reader.params) == DAY
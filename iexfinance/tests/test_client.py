@@ -0,0 +1,135 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from iexfinance import Client, get_default_client, set_default_client
+from iexfinance.base import _IEXBase
+from iexfinance.refdata.base import Sectors
+from iexfinance.stocks import Stock
+
+
+@pytest.fixture
+def reset_default_client():
+    yield
+    set_default_client(None)
+
+
+class TestClient(object):
+    def test_readers_share_default_session(self, reset_default_client):
+        a = Stock("AAPL")
+        b = Sectors()
+
+        assert a.client is get_default_client()
+        assert a.session is b.session
+
+    def test_readers_share_client_session(self):
+        client = Client(token="TESTKEY")
+        a = Stock("AAPL", client=client)
+        b = _IEXBase(client=client)
+
+        assert a.session is client.session
+        assert b.session is client.session
+        assert a.token == "TESTKEY"
+
+    def test_session_created_once(self):
+        client = Client()
+
+        assert client.session is client.session
+
+    def test_session_override(self):
+        client = Client()
+        session = object()
+        a = _IEXBase(client=client, session=session)
+
+        assert a.session is session
+
+    def test_client_settings(self):
+        client = Client(token="TESTKEY", version="stable", retry_count=5, pause=1)
+        a = _IEXBase(client=client)
+
+        assert a.token == "TESTKEY"
+        assert a.version == "stable"
+        assert a.retry_count == 5
+        assert a.pause == 1
+
+        b = _IEXBase(client=client, retry_count=0, token="TESTKEY2")
+
+        assert b.retry_count == 0
+        assert b.token == "TESTKEY2"
+
+    def test_base_url(self):
+        client = Client(base_url="http://localhost:8000/stable")
+        a = Sectors(client=client)
+
+        assert a._prepare_query() == "http://localhost:8000/stable/ref-data/sectors"
+
+    def test_set_default_client(self, reset_default_client):
+        client = Client()
+        set_default_client(client)
+
+        assert _IEXBase().client is client
+
+    def test_close(self):
+        client = Client()
+        session = client.session
+        client.close()
+
+        assert client.session is not session
+
+
+class TestConnectionPool(object):
+    def test_pool_settings(self):
+        client = Client(pool_maxsize=4, pool_block=True)
+        adapter = client.session.get_adapter("https://")
+
+        assert adapter._pool_maxsize == 4
+        assert adapter._pool_block is True
+        assert client.pool_stats()["maxsize"] == 4
+
+    def test_keep_alive_disabled(self):
+        client = Client(keep_alive=False)
+
+        assert client.session.headers["Connection"] == "close"
+
+    def test_user_session_stats(self):
+        client = Client(session=requests.session())
+
+        assert client.pool_stats() is None
+
+    def test_connection_reused(self, local_server, local_client):
+        local_server.routes["ref-data/sectors"] = (200, [{"name": "Energy"}])
+        for _ in range(3):
+            Sectors(client=local_client, output_format="json").fetch()
+        stats = local_client.pool_stats()
+
+        assert local_server.connections == 1
+        assert stats["connections_created"] == 1
+        assert stats["in_use"] == 0
+        assert stats["idle"] == 1
+        assert stats["pools"] == 1
+
+    def test_pool_waits_when_blocking(self, local_server, make_client):
+        def slow(params):
+            time.sleep(0.05)
+            return 200, []
+
+        local_server.routes["ref-data/sectors"] = slow
+        client = make_client(
+            pool_maxsize=1,
+            pool_block=True,
+            coalesce=False,
+        )
+        with ThreadPoolExecutor(4) as pool:
+            futures = [
+                pool.submit(Sectors(client=client, output_format="json").fetch)
+                for _ in range(4)
+            ]
+            for future in futures:
+                future.result()
+        stats = client.pool_stats()
+
+        assert stats["connections_created"] == 1
+        assert stats["waited"] >= 1
+        assert stats["in_use"] == 0
@@ -0,0 +1,215 @@
+import numpy as np
+import pandas as pd
+
+from iexfinance.stocks import Stock, get_historical_intraday
+from iexfinance.utils.columnar import (
+    DATE,
+    EPOCH_MS,
+    apply_schema,
+    bars_to_frame,
+    records_to_frame,
+)
+
+RECORDS = [
+    {"symbol": "AAPL", "price": 100.5, "volume": 10, "open": True, "pe": None},
+    {"symbol": "TSLA", "price": 200, "volume": 20, "open": False, "pe": 12.0},
+]
+
+
+class TestRecordsToFrame(object):
+    def test_dtypes(self):
+        df = records_to_frame(RECORDS, index=["AAPL", "TSLA"])
+
+        assert list(df.index) == ["AAPL", "TSLA"]
+        assert list(df.columns) == ["symbol", "price", "volume", "open", "pe"]
+        assert df["price"].dtype == np.float64
+        assert df["volume"].dtype == np.int64
+        assert df["open"].dtype == np.bool_
+        assert df["pe"].dtype == np.float64
+        assert np.isnan(df.loc["AAPL", "pe"])
+        assert not (df.dtypes == object).any()
+
+    def test_missing_keys(self):
+        df = records_to_frame([{"a": 1}, {"b": "x"}])
+
+        assert list(df.columns) == ["a", "b"]
+        assert df["a"].isna().tolist() == [False, True]
+
+    def test_large_ints(self):
+        df = records_to_frame([{"a": 2**70}, {"a": 1}])
+
+        assert df["a"].tolist() == [2**70, 1]
+
+    def test_matches_transpose(self):
+        out = {record["symbol"]: record for record in RECORDS}
+        expected = pd.DataFrame(out).T.infer_objects()
+
+        pd.testing.assert_frame_equal(
+            records_to_frame(list(out.values()), index=list(out)),
+            expected,
+            check_dtype=False,
+        )
+
+
+class TestSchema(object):
+    schema = {
+        "price": "float64",
+        "volume": "Int64",
+        "exchange": "category",
+        "updated": EPOCH_MS,
+        "date": DATE,
+    }
+    records = [
+        {
+            "price": 1,
+            "volume": 10,
+            "exchange": "NASDAQ",
+            "updated": 1596639769652,
+            "date": "2020-08-05",
+        },
+        {
+            "price": 2,
+            "volume": None,
+            "exchange": "NASDAQ",
+            "updated": None,
+            "date": "",
+        },
+    ]
+
+    def test_records(self):
+        df = records_to_frame(self.records, schema=self.schema)
+
+        assert df["price"].dtype == np.float64
+        assert df["volume"].dtype == "Int64"
+        assert df["volume"].isna().tolist() == [False, True]
+        assert isinstance(df["exchange"].dtype, pd.CategoricalDtype)
+        assert df.loc[0, "updated"] == pd.Timestamp("2020-08-05 15:02:49.652")
+        assert pd.isna(df.loc[1, "updated"])
+        assert df.loc[0, "date"] == pd.Timestamp("2020-08-05")
+        assert pd.isna(df.loc[1, "date"])
+
+    def test_apply(self):
+        df = apply_schema(pd.DataFrame(self.records), self.schema)
+
+        pd.testing.assert_frame_equal(
+            df, records_to_frame(self.records, schema=self.schema), check_dtype=False
+        )
+        assert df["volume"].dtype == "Int64"
+        assert df["updated"].dtype.kind == "M"
+
+    def test_mismatch(self):
+        df = records_to_frame([{"volume": "n/a"}], schema={"volume": "Int64"})
+
+        assert df.loc[0, "volume"] == "n/a"
+
+    def test_filled_mismatch(self):
+        df = records_to_frame(
+            [{"volume": 1.5, "date": "soon"}, {"volume": 2, "date": None}],
+            schema={"volume": "Int64", "date": DATE},
+        )
+
+        assert df["volume"].tolist() == [1.5, 2.0]
+        assert df["date"].isna().all()
+
+
+class TestBarsToFrame(object):
+    bars = {
+        "TSLA": [
+            {"date": "2020-01-02", "close": 1.0},
+            {"date": "2020-01-03", "close": 2.0},
+            {"date": "2020-01-06", "close": 3.0},
+        ],
+        "AAPL": [
+            {"date": "2020-01-03", "close": 4.0},
+            {"date": "2020-01-06", "close": 5.0},
+        ],
+    }
+
+    def test_index(self):
+        df = bars_to_frame(self.bars, "date", schema={"date": DATE})
+
+        assert df.index.tolist() == [
+            ("TSLA", pd.Timestamp("2020-01-02")),
+            ("TSLA", pd.Timestamp("2020-01-03")),
+            ("TSLA", pd.Timestamp("2020-01-06")),
+            ("AAPL", pd.Timestamp("2020-01-03")),
+            ("AAPL", pd.Timestamp("2020-01-06")),
+        ]
+        assert len(df.index.levels[1]) == 3
+        assert df["close"].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+        assert df.loc["AAPL", "close"].tolist() == [4.0, 5.0]
+
+    def test_date_filter(self):
+        df = bars_to_frame(
+            self.bars,
+            "date",
+            schema={"date": DATE},
+            start=pd.Timestamp("2020-01-03"),
+            end=pd.Timestamp("2020-01-03"),
+        )
+
+        assert df["close"].tolist() == [2.0, 4.0]
+        assert df["date"].tolist() == [pd.Timestamp("2020-01-03")] * 2
+
+    def test_label(self):
+        df = bars_to_frame(self.bars, lambda bar: bar["date"][5:])
+
+        assert df.index.tolist()[3] == ("AAPL", "01-03")
+
+
+BARS = [
+    {"date": "2020-08-05", "minute": "09:30", "label": "09:30 AM", "close": 1},
+    {"date": "2020-08-05", "minute": "09:31", "label": "09:31 AM", "close": 2.5},
+]
+
+
+def test_stock_chart(local_server, local_client):
+    local_server.routes["stock/market/batch"] = (
+        200,
+        {symbol: {"chart": BARS} for symbol in ["AAPL", "TSLA"]},
+    )
+    single = Stock("AAPL", client=local_client).get_historical_prices()
+    multi = Stock(["AAPL", "TSLA"], client=local_client).get_historical_prices()
+
+    # bars are rows, including bars of the same date
+    assert list(single.index) == ["2020-08-05", "2020-08-05"]
+    assert single["close"].tolist() == [1.0, 2.5]
+    assert single["close"].dtype == np.float64
+    assert single["date"].dtype.kind == "M"
+    assert multi.index.tolist()[2] == ("TSLA", "2020-08-05")
+    assert len(multi) == 4
+
+
+def test_intraday(local_server, local_client):
+    local_server.routes["stock/AAPL/chart/1d"] = (200, BARS)
+    df = get_historical_intraday("AAPL", client=local_client)
+
+    assert list(df.index) == [
+        pd.Timestamp("2020-08-05 09:30"),
+        pd.Timestamp("2020-08-05 09:31"),
+    ]
+    assert "minute" not in df.columns
+    assert df["close"].dtype == np.float64
+
+
+def test_stock_quote_typed(local_server, local_client):
+    body = {record["symbol"]: {"quote": record} for record in RECORDS}
+    local_server.routes["stock/market/batch"] = (200, body)
+    df = Stock(["AAPL", "TSLA"], client=local_client).get_quote()
+
+    assert list(df.index) == ["AAPL", "TSLA"]
+    assert df["price"].dtype == np.float64
+    assert df["volume"].dtype == "Int64"
+
+
+def test_stock_statements_typed(local_server, local_client):
+    report = {"reportDate": "2020-06-30", "filingType": "10-Q", "totalAssets": 1}
+    body = {
+        symbol: {"balance-sheet": {"balancesheet": [report]}}
+        for symbol in ["AAPL", "TSLA"]
+    }
+    local_server.routes["stock/market/batch"] = (200, body)
+    data = Stock(["AAPL", "TSLA"], client=local_client).get_balance_sheet()
+
+    assert data["AAPL"]["reportDate"].dtype.kind == "M"
+    assert isinstance(data["TSLA"]["filingType"].dtype, pd.CategoricalDtype)
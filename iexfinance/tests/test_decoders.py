@@ -0,0 +1,77 @@
+from decimal import Decimal
+
+import pytest
+
+from iexfinance.refdata.base import Sectors
+from iexfinance.utils.decoders import DECODERS, get_decoder
+from iexfinance.utils.exceptions import IEXQueryError
+
+BODY = b'[{"name": "Energy", "weight": 0.25, "count": 3}]'
+
+
+def _installed(name):
+    try:
+        get_decoder(name)
+    except ImportError:
+        return False
+    return True
+
+
+class TestGetDecoder(object):
+    @pytest.mark.parametrize("name", [name for name in DECODERS if _installed(name)])
+    def test_decoders_agree(self, name):
+        resolved, loads = get_decoder(name)
+
+        assert resolved == name
+        assert loads(BODY) == [{"name": "Energy", "weight": 0.25, "count": 3}]
+
+    @pytest.mark.parametrize("name", [name for name in DECODERS if _installed(name)])
+    def test_invalid_json_raises_value_error(self, name):
+        _, loads = get_decoder(name)
+
+        with pytest.raises(ValueError):
+            loads(b"Not found")
+
+    def test_auto_prefers_fastest_installed(self):
+        name, _ = get_decoder("auto")
+
+        assert name == next(name for name in DECODERS if _installed(name))
+
+    def test_custom_decoder(self):
+        def loads(data):
+            return data
+
+        assert get_decoder(loads) == ("loads", loads)
+
+    def test_unknown_decoder(self):
+        with pytest.raises(ValueError):
+            get_decoder("yaml")
+
+
+class TestClientDecoder(object):
+    def test_json_decoder(self, local_server, make_client):
+        local_server.routes["ref-data/sectors"] = (200, BODY)
+        client = make_client(json_decoder="json")
+        data = Sectors(client=client, output_format="json").fetch()
+
+        assert client.json_decoder == "json"
+        assert data[0]["weight"] == 0.25
+
+    def test_parse_hooks_use_stdlib(self, local_server, make_client):
+        local_server.routes["ref-data/sectors"] = (200, BODY)
+
+        def fail(data):
+            raise AssertionError("custom decoder used")
+
+        client = make_client(json_decoder=fail)
+        data = Sectors(
+            client=client, output_format="json", json_parse_float=Decimal
+        ).fetch()
+
+        assert data[0]["weight"] == Decimal("0.25")
+
+    def test_invalid_json(self, local_server, local_client):
+        local_server.routes["ref-data/sectors"] = (200, b"{invalid")
+
+        with pytest.raises(IEXQueryError):
+            Sectors(client=local_client).fetch()
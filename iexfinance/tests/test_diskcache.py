@@ -0,0 +1,195 @@
+import datetime
+import multiprocessing
+
+import pytest
+
+from iexfinance.refdata.base import Sectors, TradingDatesReader
+from iexfinance.stocks.historical import HistoricalReader
+from iexfinance.utils.diskcache import DiskCache
+
+JAN = [
+    {"date": "2017-01-03", "close": 116.15, "volume": 28781865},
+    {"date": "2017-01-04", "close": 116.02, "volume": 21118116},
+    {"date": "2017-01-05", "close": 116.61, "volume": 22193587},
+]
+
+
+def _jan(symbol, params):
+    # the bar of an exactDate request, or all bars of a range
+    day = params.get("exactDate")
+    return [bar for bar in JAN if day in (None, bar["date"].replace("-", ""))]
+
+
+def _write_rows(path, symbol):
+    cache = DiskCache(path)
+    for day in range(1, 29):
+        date = datetime.date(2017, 2, day)
+        row = {"date": date.isoformat(), "close": day}
+        cache.put_chart(symbol, [row], date, date)
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite"))
+    yield cache
+    cache.close()
+
+
+class TestDiskCache(object):
+    def test_chart_coverage(self, disk_cache):
+        disk_cache.put_chart(
+            "AAPL", JAN, datetime.date(2017, 1, 1), datetime.date(2017, 1, 4)
+        )
+
+        rows = disk_cache.get_chart(
+            "AAPL", datetime.date(2017, 1, 2), datetime.date(2017, 1, 4)
+        )
+        assert [row["date"] for row in rows] == ["2017-01-03", "2017-01-04"]
+        assert (
+            disk_cache.get_chart(
+                "AAPL", datetime.date(2017, 1, 2), datetime.date(2017, 1, 5)
+            )
+            is None
+        )
+        assert (
+            disk_cache.get_chart(
+                "AAPL", datetime.date(2017, 1, 2), datetime.date(2017, 1, 4), True
+            )
+            is None
+        )
+
+    def test_adjacent_ranges_merged(self, disk_cache):
+        disk_cache.put_chart(
+            "AAPL", JAN, datetime.date(2017, 1, 1), datetime.date(2017, 1, 3)
+        )
+        disk_cache.put_chart(
+            "AAPL", JAN, datetime.date(2017, 1, 4), datetime.date(2017, 1, 5)
+        )
+
+        rows = disk_cache.get_chart(
+            "AAPL", datetime.date(2017, 1, 1), datetime.date(2017, 1, 5)
+        )
+        assert rows == JAN
+
+    def test_invalidate(self, disk_cache):
+        disk_cache.put_chart(
+            "AAPL", JAN, datetime.date(2017, 1, 1), datetime.date(2017, 1, 5)
+        )
+        disk_cache.invalidate("AAPL")
+
+        assert (
+            disk_cache.get_chart(
+                "AAPL", datetime.date(2017, 1, 3), datetime.date(2017, 1, 3)
+            )
+            is None
+        )
+        assert disk_cache.stats()["chart_rows"] == 0
+
+    def test_snapshot_max_age(self, disk_cache):
+        key = DiskCache.make_key("url", {"a": 1, "token": "x"})
+        disk_cache.put_snapshot(key, [{"name": "Energy"}])
+
+        assert disk_cache.get_snapshot(key) == (True, [{"name": "Energy"}])
+        assert disk_cache.get_snapshot(key, max_age=-1) == (False, None)
+        assert DiskCache.make_key("url", {"a": "1", "token": "y"}) == key
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        DiskCache(path).put_snapshot("key", {"a": 1})
+
+        assert DiskCache(path).get_snapshot("key") == (True, {"a": 1})
+
+    def test_concurrent_processes(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        DiskCache(path)
+        ctx = multiprocessing.get_context("spawn")
+        procs = [
+            ctx.Process(target=_write_rows, args=(path, symbol))
+            for symbol in ("AAPL", "MSFT", "TSLA")
+        ]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join(60)
+            assert proc.exitcode == 0
+
+        cache = DiskCache(path)
+        for symbol in ("AAPL", "MSFT", "TSLA"):
+            rows = cache.get_chart(
+                symbol, datetime.date(2017, 2, 1), datetime.date(2017, 2, 28)
+            )
+            assert len(rows) == 28
+
+
+class TestHistoricalDiskCache(object):
+    def test_closed_range_reused(
+        self, local_server, disk_cache, batch_route, make_client
+    ):
+        batch_route.bodies["chart"] = _jan
+        kwargs = dict(start="2017-01-02", end="2017-01-05")
+        first = HistoricalReader(
+            "AAPL", client=make_client(disk_cache=disk_cache), **kwargs
+        ).fetch()
+        # a new client (e.g. in another process) reuses the stored bars
+        second = HistoricalReader(
+            "AAPL", client=make_client(disk_cache=disk_cache), **kwargs
+        ).fetch()
+
+        # one exactDate request per weekday, for the first fetch only
+        assert len(local_server.requests) == 4
+        assert list(second["close"]) == [116.15, 116.02, 116.61]
+        assert first.equals(second)
+
+    def test_only_missing_symbols_requested(
+        self, local_server, disk_cache, batch_route, make_client
+    ):
+        disk_cache.put_chart(
+            "AAPL", JAN, datetime.date(2016, 12, 1), datetime.date(2017, 1, 31)
+        )
+        batch_route.bodies["chart"] = _jan
+        data = HistoricalReader(
+            ["AAPL", "MSFT"],
+            start="2017-01-02",
+            end="2017-01-05",
+            client=make_client(disk_cache=disk_cache),
+        ).fetch()
+
+        assert {params["symbols"] for _, params in local_server.requests} == {"MSFT"}
+        assert len(data) == 6
+
+    def test_open_range_not_served(self, local_server, disk_cache, make_client):
+        local_server.routes["stock/market/batch"] = (200, {"AAPL": {"chart": JAN}})
+        client = make_client(disk_cache=disk_cache)
+        today = datetime.date.today()
+        for _ in range(2):
+            HistoricalReader(
+                "AAPL",
+                start=today - datetime.timedelta(days=10),
+                end=today,
+                client=client,
+                output_format="json",
+            ).fetch()
+
+        assert len(local_server.requests) == 2
+
+
+class TestRefDataDiskCache(object):
+    def test_snapshot_reused(self, local_server, disk_cache, make_client):
+        local_server.routes["ref-data/sectors"] = (200, [{"name": "Energy"}])
+        Sectors(client=make_client(disk_cache=disk_cache)).fetch()
+        data = Sectors(client=make_client(disk_cache=disk_cache)).fetch()
+
+        assert len(local_server.requests) == 1
+        assert list(data["name"]) == ["Energy"]
+
+    def test_trading_dates_not_stored(self, local_server, disk_cache, make_client):
+        local_server.routes["ref-data/us/dates/trade/next/1"] = (
+            200,
+            [{"date": "2017-01-03"}],
+        )
+        for _ in range(2):
+            TradingDatesReader(
+                "trade", "next", client=make_client(disk_cache=disk_cache)
+            ).fetch()
+
+        assert len(local_server.requests) == 2
@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from iexfinance.refdata.base import Sectors, Symbols
+from iexfinance.stocks import Stock
+from iexfinance.utils.exceptions import IEXQueryError
+
+
+@pytest.fixture
+def events():
+    return []
+
+
+class TestRequestEvents(object):
+    def test_stock_endpoint(self, local_server, make_client, events, batch_route):
+        client = make_client(hooks=[events.append])
+        Stock("AAPL", client=client).get_quote()
+
+        assert len(events) == 1
+        event = events[0]
+        assert event.reader == "Stock"
+        assert event.label == "stock/market/batch[quote]"
+        assert event.status == 200
+        assert event.attempts == 1
+        _, body = batch_route({"symbols": "AAPL", "types": "quote"})
+        assert event.bytes == len(json.dumps(body))
+        assert event.cache is None
+        assert event.error is None
+        for phase in ("build", "connect", "round_trip", "download", "decode"):
+            assert getattr(event, phase) >= 0
+        assert event.convert > 0
+        assert event.total >= event.round_trip + event.decode + event.convert
+
+    def test_connect_only_timed_for_new_connections(
+        self, local_server, make_client, events
+    ):
+        client = make_client(hooks=[events.append])
+        local_server.routes["ref-data/sectors"] = (200, [{"name": "Energy"}])
+        Sectors(client=client).fetch()
+        Sectors(client=client).fetch()
+
+        assert events[0].connect > 0
+        assert events[1].connect == 0
+
+    def test_reader_hooks(self, local_server, local_client):
+        local_server.routes["ref-data/sectors"] = (200, [{"name": "Energy"}])
+        reader_events = []
+        reader = Sectors(client=local_client, hooks=[reader_events.append])
+        reader.fetch()
+
+        assert reader_events == [reader.last_event]
+        assert reader.last_event.endpoint == "ref-data/sectors"
+
+    def test_cache_hit(self, local_server, events, make_client):
+        local_server.routes["ref-data/sectors"] = (200, [{"name": "Energy"}])
+        client = make_client(
+            cache=True,
+            hooks=[events.append],
+        )
+        Sectors(client=client).fetch()
+        Sectors(client=client).fetch()
+
+        assert events[1].cache == "memory"
+        assert events[1].attempts == 0
+        assert events[1].round_trip is None
+
+    def test_error(self, local_server, make_client, events):
+        client = make_client(hooks=[events.append])
+        local_server.routes["ref-data/sectors"] = (400, b"Bad request")
+
+        with pytest.raises(IEXQueryError):
+            Sectors(client=client).fetch()
+        assert isinstance(events[0].error, IEXQueryError)
+        assert events[0].status == 400
+
+    def test_failing_hook_ignored(self, local_server, local_client):
+        local_server.routes["ref-data/sectors"] = (200, [{"name": "Energy"}])
+
+        def hook(event):
+            raise RuntimeError("hook failed")
+
+        local_client.add_hook(hook)
+        data = Sectors(client=local_client).fetch()
+        local_client.remove_hook(hook)
+
+        assert list(data["name"]) == ["Energy"]
+        assert local_client.hooks == []
+
+    def test_streamed(self, local_server, make_client, events):
+        client = make_client(hooks=[events.append])
+        local_server.routes["ref-data/symbols"] = (
+            200,
+            [{"symbol": "S%s" % i} for i in range(100)],
+        )
+        Symbols(client=client, stream=True, chunk_size=10).fetch()
+
+        assert len(events) == 1
+        assert events[0].download >= 0
+        assert events[0].convert > 0
+
+    def test_as_dict(self, local_server, make_client, events):
+        client = make_client(hooks=[events.append])
+        local_server.routes["ref-data/sectors"] = (200, [{"name": "Energy"}])
+        Sectors(client=client).fetch()
+        data = events[0].as_dict()
+
+        assert data["label"] == "ref-data/sectors"
+        assert "started" not in data
@@ -0,0 +1,41 @@
+import subprocess
+import sys
+
+import pytest
+
+PACKAGES = [
+    "iexfinance",
+    "iexfinance.account",
+    "iexfinance.altdata",
+    "iexfinance.apidata",
+    "iexfinance.crypto",
+    "iexfinance.data_apis",
+    "iexfinance.iexdata",
+    "iexfinance.refdata",
+    "iexfinance.stocks",
+]
+
+
+def _imported_after(statement):
+    code = "import sys; %s; print(','.join(sorted(sys.modules)))" % statement
+    out = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    return set(out.strip().split(","))
+
+
+@pytest.mark.parametrize("package", PACKAGES)
+def test_import_is_lazy(package):
+    modules = _imported_after("import %s" % package)
+
+    assert "pandas" not in modules
+    assert "requests" not in modules
+
+
+def test_json_output_does_not_import_pandas(set_keys):
+    modules = _imported_after(
+        "from iexfinance.stocks import Stock; "
+        "Stock('AAPL', output_format='json', token='TESTKEY')"
+    )
+
+    assert "pandas" not in modules
@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pytest
+
+from iexfinance.data_apis import TimeSeries
+from iexfinance.refdata.base import Sectors, TradingDatesReader
+from iexfinance.stocks import Stock
+from iexfinance.stocks.historical import IntradayReader
+from iexfinance.stocks.options import OptionsReader
+from iexfinance.utils.exceptions import IEXMessageBudgetError
+from iexfinance.utils.metering import MessageMeter
+
+
+def _messages(count, body):
+    return 200, body, {"iexcloud-messages-used": str(count)}
+
+
+class TestMessageMeter(object):
+    def test_totals(self):
+        meter = MessageMeter()
+        meter.record(5, endpoint="stock/market/batch", symbols="AAPL,TSLA")
+        meter.record(3, endpoint="stock/market/batch", symbols="AAPL")
+        meter.record(1, endpoint="tops")
+        totals = meter.totals()
+
+        assert totals["used"] == 9
+        assert totals["requests"] == 3
+        assert totals["by_endpoint"] == {"stock/market/batch": 8, "tops": 1}
+        assert totals["by_batch"] == {"AAPL,TSLA": 5, "AAPL": 3}
+        assert totals["remaining"] is None
+
+    def test_invalid_on_exceeded(self):
+        with pytest.raises(ValueError):
+            MessageMeter(on_exceeded="ignore")
+
+    def test_budget_raises(self):
+        meter = MessageMeter(budget=10)
+        meter.check()
+        meter.record(10)
+
+        assert meter.remaining == 0
+        with pytest.raises(IEXMessageBudgetError):
+            meter.check()
+
+    def test_estimate(self):
+        meter = MessageMeter(budget=10)
+        meter.record(5)
+        meter.check(estimate=5)
+
+        with pytest.raises(IEXMessageBudgetError):
+            meter.check(estimate=6)
+
+    def test_reset(self):
+        meter = MessageMeter(budget=10)
+        meter.record(10)
+        meter.reset(used=2)
+
+        assert meter.totals()["used"] == 2
+        meter.check()
+
+    def test_defer_until_budget_raised(self):
+        meter = MessageMeter(budget=1, on_exceeded="defer")
+        meter.record(1)
+        timer = threading.Timer(0.05, meter.set_budget, args=(100,))
+        timer.start()
+        start = time.monotonic()
+        meter.check()
+
+        assert time.monotonic() - start >= 0.04
+
+    def test_defer_timeout(self):
+        meter = MessageMeter(budget=1, on_exceeded="defer", defer_timeout=0.01)
+        meter.record(1)
+
+        with pytest.raises(IEXMessageBudgetError):
+            meter.check()
+
+
+class TestClientMetering(object):
+    def test_messages_recorded(self, local_server, local_client):
+        local_server.routes["ref-data/sectors"] = _messages(1, [])
+        local_server.routes["stock/market/batch"] = _messages(
+            2, {"AAPL": {"quote": {}}}
+        )
+        Sectors(client=local_client).fetch()
+        Stock("AAPL", client=local_client).get_quote()
+        totals = local_client.messages_used()
+
+        assert totals["used"] == 3
+        assert totals["by_endpoint"] == {"ref-data/sectors": 1, "stock/market/batch": 2}
+        assert totals["by_batch"] == {"AAPL": 2}
+
+    def test_budget_stops_requests(self, local_server, make_client):
+        local_server.routes["ref-data/sectors"] = _messages(5, [])
+        client = make_client(message_budget=5)
+        Sectors(client=client).fetch()
+
+        with pytest.raises(IEXMessageBudgetError):
+            Sectors(client=client).fetch()
+        assert len(local_server.requests) == 1
+
+    def test_url_template(self):
+        assert IntradayReader("AAPL").url_template == "stock/{symbol}/chart/1d"
+        reader = IntradayReader("AAPL", date="20190101")
+
+        assert reader.url_template == "stock/{symbol}/chart/date/{date}"
+
+    def test_url_template_override(self):
+        series = TimeSeries("REPORTED_FINANCIALS", "AAPL", "10-Q")
+        options = OptionsReader("AAPL", expiration="201904", option_side="call")
+        dates = TradingDatesReader("trade", "next", last=5)
+
+        assert series.url_template == "time-series/{id}/{key}/{subkey}"
+        assert options.url_template == "stock/{symbol}/options/{expiration}/{side}"
+        assert dates.url_template == "ref-data/us/dates/trade/next/{last}"
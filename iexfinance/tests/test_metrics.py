@@ -0,0 +1,178 @@
+from urllib.request import urlopen
+
+import pytest
+
+from iexfinance.data_apis import TimeSeries
+from iexfinance.refdata.base import Sectors
+from iexfinance.stocks import Stock
+from iexfinance.stocks.historical import IntradayReader
+from iexfinance.utils.exceptions import IEXQueryError
+from iexfinance.utils.metrics import Histogram, MetricsRegistry
+
+
+class TestHistogram(object):
+    def test_quantiles(self):
+        histogram = Histogram(buckets=(0.1, 0.2, 0.5, 1.0))
+        for value in [0.05] * 50 + [0.15] * 45 + [0.7] * 5:
+            histogram.observe(value)
+
+        assert histogram.count == 100
+        assert histogram.counts == [50, 45, 0, 5, 0]
+        assert histogram.quantile(0.5) == pytest.approx(0.1)
+        assert 0.1 < histogram.quantile(0.95) <= 0.2
+        assert 0.5 < histogram.quantile(0.99) <= 1.0
+
+    def test_empty(self):
+        assert Histogram().quantile(0.5) is None
+
+    def test_overflow(self):
+        histogram = Histogram(buckets=(0.1,))
+        histogram.observe(5)
+
+        assert histogram.counts == [0, 1]
+        assert histogram.quantile(0.99) == 0.1
+
+
+class TestMetricsRegistry(object):
+    def test_disabled_by_default(self, local_client):
+        assert local_client.metrics is None
+
+    def test_counts_per_endpoint(self, local_server, make_client, batch_route):
+        client = make_client(pause=0, metrics=True)
+        local_server.routes["ref-data/sectors"] = (200, [{"name": "Energy"}])
+        for _ in range(3):
+            Stock("AAPL", client=client).get_quote()
+        Sectors(client=client).fetch()
+
+        snapshot = client.metrics.snapshot()
+        assert set(snapshot) == {"stock/market/batch", "ref-data/sectors"}
+        batch = snapshot["stock/market/batch"]
+        assert batch["calls"] == 3
+        assert batch["requests"] == 3
+        assert batch["retries"] == 0
+        assert batch["errors"] == {}
+        assert batch["bytes"] > 0
+        assert 0 < batch["p50"] <= batch["p95"] <= batch["p99"]
+
+    def test_retries_and_errors(self, local_server, make_client):
+        client = make_client(pause=0, metrics=True)
+        local_server.routes["ref-data/sectors"] = [
+            (503, b"Unavailable"),
+            (200, [{"name": "Energy"}]),
+            (400, b"Bad request"),
+        ]
+        Sectors(client=client).fetch()
+        with pytest.raises(IEXQueryError):
+            Sectors(client=client).fetch()
+
+        sectors = client.metrics.snapshot()["ref-data/sectors"]
+        assert sectors["calls"] == 2
+        assert sectors["requests"] == 3
+        assert sectors["retries"] == 1
+        assert sectors["errors"] == {"400": 1}
+
+    def test_labels_are_templates(self, local_server, make_client):
+        client = make_client(metrics=True)
+        for symbol in ("AAPL", "MSFT"):
+            local_server.routes["time-series/REPORTED_FINANCIALS/%s" % symbol] = (
+                200,
+                [],
+            )
+            TimeSeries(
+                "REPORTED_FINANCIALS", symbol, client=client, output_format="json"
+            ).fetch()
+        for date in ("20190102", "20190103"):
+            local_server.routes["stock/AAPL/chart/date/%s" % date] = (200, [])
+            IntradayReader(
+                "AAPL", date=date, client=client, output_format="json"
+            ).fetch()
+
+        snapshot = client.metrics.snapshot()
+        # request values are not part of the labels
+        assert set(snapshot) == {
+            "time-series/{id}/{key}",
+            "stock/{symbol}/chart/date/{date}",
+        }
+        assert snapshot["time-series/{id}/{key}"]["calls"] == 2
+
+    def test_cache_hits(self, local_server, make_client):
+        local_server.routes["ref-data/sectors"] = (200, [{"name": "Energy"}])
+        client = make_client(cache=True, metrics=True)
+        Sectors(client=client).fetch()
+        Sectors(client=client).fetch()
+
+        sectors = client.metrics.snapshot()["ref-data/sectors"]
+        assert sectors["calls"] == 2
+        assert sectors["requests"] == 1
+        assert sectors["cache_hits"] == {"memory": 1}
+
+    def test_shared_registry(self, local_server, make_client):
+        local_server.routes["ref-data/sectors"] = (200, [{"name": "Energy"}])
+        registry = MetricsRegistry()
+        for _ in range(2):
+            client = make_client(metrics=registry)
+            Sectors(client=client).fetch()
+
+        assert registry.snapshot()["ref-data/sectors"]["calls"] == 2
+
+    def test_render(self, local_server, make_client):
+        client = make_client(pause=0, metrics=True)
+        local_server.routes["ref-data/sectors"] = [
+            (200, [{"name": "Energy"}]),
+            (404, b"Not found"),
+        ]
+        Sectors(client=client).fetch()
+        with pytest.raises(IEXQueryError):
+            Sectors(client=client).fetch()
+
+        text = client.metrics.render()
+        assert "# TYPE iexfinance_call_duration_seconds histogram" in text
+        assert 'iexfinance_calls_total{endpoint="ref-data/sectors"} 2' in text
+        assert (
+            'iexfinance_errors_total{endpoint="ref-data/sectors",status="404"} 1'
+            in text
+        )
+        assert (
+            'iexfinance_call_duration_seconds_bucket{endpoint="ref-data/sectors",'
+            'le="+Inf"} 2' in text
+        )
+        assert (
+            'iexfinance_call_duration_quantile_seconds{endpoint="ref-data/sectors",'
+            'quantile="0.99"}' in text
+        )
+        assert text.endswith("\n")
+
+    def test_label_escaping(self):
+        registry = MetricsRegistry()
+
+        class Event(object):
+            endpoint = 'a"b\\c'
+            attempts, status, bytes, cache, error, total = 1, 200, 10, None, None, 0.1
+            retries = 0
+
+        registry.record(Event())
+
+        assert 'endpoint="a\\"b\\\\c"' in registry.render()
+
+    def test_serve(self, local_server, make_client):
+        client = make_client(pause=0, metrics=True)
+        local_server.routes["ref-data/sectors"] = (200, [{"name": "Energy"}])
+        Sectors(client=client).fetch()
+        server = client.metrics.serve()
+        try:
+            url = "http://127.0.0.1:%s/metrics" % server.server_port
+            with urlopen(url) as response:
+                body = response.read().decode()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert 'iexfinance_calls_total{endpoint="ref-data/sectors"} 1' in body
+
+    def test_reset(self, local_server, make_client):
+        client = make_client(pause=0, metrics=True)
+        local_server.routes["ref-data/sectors"] = (200, [{"name": "Energy"}])
+        Sectors(client=client).fetch()
+        client.metrics.reset()
+
+        assert client.metrics.snapshot() == {}
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from iexfinance import Client
+from iexfinance.refdata.base import Sectors
+from iexfinance.utils.ratelimit import RateLimiter
+
+
+class TestRateLimiter(object):
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            RateLimiter(0)
+        with pytest.raises(ValueError):
+            RateLimiter(1, burst=0)
+
+    def test_burst_without_waiting(self):
+        limiter = RateLimiter(1, burst=5)
+
+        assert [limiter.acquire() for _ in range(5)] == [0] * 5
+        assert not limiter.try_acquire()
+
+    def test_paces_at_rate(self):
+        limiter = RateLimiter(50, burst=1)
+        start = time.monotonic()
+        for _ in range(11):
+            limiter.acquire()
+
+        assert time.monotonic() - start == pytest.approx(0.2, abs=0.05)
+
+    def test_threads_share_bucket(self):
+        limiter = RateLimiter(100, burst=1)
+
+        def work():
+            for _ in range(5):
+                limiter.acquire()
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # 20 tokens, 1 available immediately
+        assert time.monotonic() - start == pytest.approx(0.19, abs=0.05)
+        assert limiter.waits == 19
+
+    def test_asyncio(self):
+        limiter = RateLimiter(100, burst=1)
+
+        async def main():
+            start = time.monotonic()
+            await asyncio.gather(*[limiter.acquire_async() for _ in range(11)])
+            return time.monotonic() - start
+
+        assert asyncio.run(main()) == pytest.approx(0.1, abs=0.05)
+
+    def test_refills_up_to_burst(self):
+        limiter = RateLimiter(1000, burst=2)
+        limiter.acquire(2)
+        time.sleep(0.05)
+
+        assert limiter.available == 2
+
+
+class TestClientRateLimit(object):
+    def test_client_limiter(self):
+        client = Client(rate_limit=10, burst=3)
+
+        assert client.rate_limiter.rate == 10
+        assert client.rate_limiter.burst == 3
+        assert Client().rate_limiter is None
+
+    def test_readers_paced(self, local_server, make_client):
+        local_server.routes["ref-data/sectors"] = (200, [])
+        client = make_client(rate_limit=50)
+        # create the session (and import requests) before timing
+        client.session
+        client.rate_limiter.try_acquire(50)
+        start = time.monotonic()
+        for _ in range(5):
+            Sectors(client=client, output_format="json").fetch()
+
+        assert time.monotonic() - start >= 0.08
+        assert client.rate_limiter.waits == 5
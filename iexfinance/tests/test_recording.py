@@ -0,0 +1,133 @@
+import time
+
+import pytest
+
+from iexfinance import Client
+from iexfinance.refdata.base import Sectors, Symbols
+from iexfinance.stocks import Stock
+from iexfinance.utils.exceptions import IEXQueryError, IEXReplayMissError
+from iexfinance.utils.recording import Archive, make_key
+
+SYMBOLS = [{"symbol": "S%s" % i, "name": "Symbol %s" % i} for i in range(50)]
+
+
+@pytest.fixture
+def archive_path(tmp_path):
+    return str(tmp_path / "responses.jsonl.gz")
+
+
+def _record(make_client, path, calls):
+    client = make_client(pause=0, record=path)
+    with client:
+        for call in calls:
+            call(client)
+
+
+class TestMakeKey(object):
+    def test_token_host_and_version_ignored(self):
+        a = make_key("GET", "https://cloud.iexapis.com/stable/tops?token=A&symbols=X")
+        b = make_key("GET", "http://127.0.0.1:80/v1/tops?symbols=X&token=B")
+
+        assert a == b == "GET tops?symbols=X"
+
+    def test_params_sorted(self):
+        assert make_key("GET", "http://h/stable/a?b=1&a=2") == "GET a?a=2&b=1"
+
+
+class TestRecordReplay(object):
+    def test_round_trip(self, local_server, archive_path, batch_route, make_client):
+        local_server.routes["ref-data/sectors"] = (200, [{"name": "Energy"}])
+        _record(
+            make_client,
+            archive_path,
+            [
+                lambda c: Stock("AAPL", client=c).get_quote(),
+                lambda c: Sectors(client=c).fetch(),
+            ],
+        )
+        requests_made = len(local_server.requests)
+
+        assert len(Archive(archive_path)) == 2
+
+        client = Client(
+            base_url="http://unreachable.invalid/stable/", replay=archive_path
+        )
+        quote = Stock("AAPL", client=client, output_format="json").get_quote()
+        sectors = Sectors(client=client, output_format="json").fetch()
+
+        assert quote == {"symbol": "AAPL", "latestPrice": 100.0}
+        assert sectors == [{"name": "Energy"}]
+        assert len(local_server.requests) == requests_made
+
+    def test_errors_and_order_replayed(self, local_server, archive_path, make_client):
+        local_server.routes["ref-data/sectors"] = [
+            (503, b"Unavailable"),
+            (200, [{"name": "Energy"}]),
+        ]
+        _record(make_client, archive_path, [lambda c: Sectors(client=c).fetch()])
+
+        client = Client(replay=archive_path, pause=0)
+        data = Sectors(client=client, output_format="json").fetch()
+
+        assert data == [{"name": "Energy"}]
+        # the last record is repeated once all have been served
+        assert Sectors(client=client, output_format="json").fetch() == data
+
+    def test_error_status(self, local_server, archive_path, make_client):
+        local_server.routes["ref-data/sectors"] = (404, b"Not found")
+        with pytest.raises(IEXQueryError):
+            _record(make_client, archive_path, [lambda c: Sectors(client=c).fetch()])
+
+        with pytest.raises(IEXQueryError) as exc:
+            Sectors(client=Client(replay=archive_path)).fetch()
+        assert exc.value.status == 404
+
+    def test_miss(self, archive_path):
+        client = Client(replay=archive_path)
+
+        with pytest.raises(IEXReplayMissError):
+            Sectors(client=client).fetch()
+
+    def test_streamed(self, local_server, archive_path, make_client):
+        local_server.routes["ref-data/symbols"] = (200, SYMBOLS)
+        _record(
+            make_client,
+            archive_path,
+            [lambda c: Symbols(client=c, output_format="json", stream=True).fetch()],
+        )
+
+        client = Client(replay=archive_path)
+        reader = Symbols(
+            client=client, output_format="json", stream=True, chunk_size=20
+        )
+
+        assert [len(chunk) for chunk in reader.iter_chunks()] == [20, 20, 10]
+
+    def test_latency(self, local_server, archive_path, make_client):
+        local_server.routes["ref-data/sectors"] = (200, [{"name": "Energy"}])
+        _record(make_client, archive_path, [lambda c: Sectors(client=c).fetch()])
+        client = Client(replay=archive_path, replay_latency=0.2)
+
+        started = time.perf_counter()
+        Sectors(client=client).fetch()
+
+        assert time.perf_counter() - started >= 0.2
+
+    def test_token_not_required(self, monkeypatch, archive_path):
+        monkeypatch.delenv("IEX_TOKEN")
+
+        assert Client(replay=archive_path).get_token() == "replay"
+        assert Client().get_token() is None
+
+    def test_appends(self, local_server, archive_path, make_client):
+        local_server.routes["ref-data/sectors"] = (200, [{"name": "Energy"}])
+        for _ in range(2):
+            _record(make_client, archive_path, [lambda c: Sectors(client=c).fetch()])
+
+        assert len(Archive(archive_path)) == 2
+
+    def test_invalid_options(self, archive_path):
+        with pytest.raises(ValueError):
+            Client(record=archive_path, replay=archive_path)
+        with pytest.raises(ValueError):
+            Client(replay=archive_path, replay_latency="slow").session
@@ -0,0 +1,121 @@
+import time
+
+import pytest
+import requests
+
+from iexfinance import Client
+from iexfinance.refdata.base import Sectors
+from iexfinance.utils.exceptions import IEXQueryError
+from iexfinance.utils.retry import RetryPolicy
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    calls = []
+    monkeypatch.setattr(time, "sleep", calls.append)
+    return calls
+
+
+class TestRetryPolicy(object):
+    def test_statuses(self):
+        policy = RetryPolicy(retries=2)
+
+        assert policy.should_retry(0, status=429)
+        assert policy.should_retry(1, status=503)
+        assert not policy.should_retry(2, status=503)
+        assert not policy.should_retry(0, status=400)
+        assert not policy.should_retry(0, status=404)
+        assert not policy.should_retry(0, method="POST", status=503)
+        assert policy.should_retry(0, error=requests.ConnectionError())
+
+    def test_exponential_backoff(self):
+        policy = RetryPolicy(backoff_factor=0.5, max_backoff=3, jitter=False)
+
+        assert [policy.backoff(n) for n in range(4)] == [0.5, 1, 2, 3]
+
+    def test_jitter(self):
+        policy = RetryPolicy(backoff_factor=1)
+
+        for attempt in range(5):
+            assert 0 <= policy.backoff(attempt) <= 2**attempt
+
+    def test_retry_after(self):
+        assert RetryPolicy.parse_retry_after("3") == 3
+        assert RetryPolicy.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+        assert RetryPolicy.parse_retry_after("garbage") is None
+        assert RetryPolicy.parse_retry_after(None) is None
+
+    def test_attempt_timeout(self):
+        policy = RetryPolicy(timeout=(3, 30))
+
+        assert policy.attempt_timeout(None) == (3, 30)
+        connect, read = policy.attempt_timeout(time.monotonic() + 1)
+        assert connect <= 1 and read <= 1
+
+    def test_replace(self):
+        policy = RetryPolicy(retries=3)
+        new = policy.replace(retries=0)
+
+        assert new.retries == 0
+        assert policy.retries == 3
+        with pytest.raises(TypeError):
+            policy.replace(bad=1)
+
+
+class TestRetries(object):
+    def test_permanent_error_not_retried(self, local_server, local_client, sleeps):
+        local_server.routes["ref-data/sectors"] = (404, b"Not found")
+
+        with pytest.raises(IEXQueryError):
+            Sectors(client=local_client).fetch()
+        assert len(local_server.requests) == 1
+        assert sleeps == []
+
+    def test_transient_error_retried(self, local_server, local_client, sleeps):
+        local_server.routes["ref-data/sectors"] = [
+            (503, b"Unavailable"),
+            (500, b"Error"),
+            (200, [{"name": "Energy"}]),
+        ]
+        data = Sectors(client=local_client, output_format="json").fetch()
+
+        assert data == [{"name": "Energy"}]
+        assert len(local_server.requests) == 3
+        assert len(sleeps) == 2
+
+    def test_retries_exhausted(self, local_server, local_client, sleeps):
+        local_server.routes["ref-data/sectors"] = (503, b"Unavailable")
+
+        with pytest.raises(IEXQueryError):
+            Sectors(client=local_client, retry_count=2).fetch()
+        assert len(local_server.requests) == 3
+
+    def test_retry_after_honoured(self, local_server, local_client, sleeps):
+        local_server.routes["ref-data/sectors"] = [
+            (429, b"Too many requests", {"Retry-After": "7"}),
+            (200, []),
+        ]
+        Sectors(client=local_client, output_format="json").fetch()
+
+        assert sleeps == [7]
+
+    def test_total_deadline(self, local_server, sleeps, make_client):
+        local_server.routes["ref-data/sectors"] = (
+            429,
+            b"Too many requests",
+            {"Retry-After": "60"},
+        )
+        policy = RetryPolicy(total_timeout=5)
+        client = make_client(retry_policy=policy)
+
+        with pytest.raises(IEXQueryError):
+            Sectors(client=client).fetch()
+        assert len(local_server.requests) == 1
+        assert sleeps == []
+
+    def test_connection_error_retried(self, sleeps):
+        client = Client(token="TESTKEY", base_url="http://127.0.0.1:9/stable/")
+
+        with pytest.raises(requests.ConnectionError):
+            Sectors(client=client).fetch()
+        assert len(sleeps) == 3
@@ -0,0 +1,193 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from iexfinance.refdata.base import Sectors
+from iexfinance.utils.exceptions import IEXQueryError
+from iexfinance.utils.singleflight import SingleFlight
+
+
+def _slow(value, delay=0.2):
+    time.sleep(delay)
+    return value
+
+
+def _slow_route(status, body, delay=0.3):
+    def route(params):
+        time.sleep(delay)
+        return status, body
+
+    return route
+
+
+class TestSingleFlight(object):
+    def test_concurrent_calls_coalesced(self):
+        flight = SingleFlight()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            return _slow("value")
+
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(lambda _: flight.do("key", fn), range(8)))
+
+        assert len(calls) == 1
+        assert all(value == "value" and shared for value, shared in results)
+        assert flight.calls == 1
+        assert flight.saved == 7
+
+    def test_sequential_calls_not_coalesced(self):
+        flight = SingleFlight()
+
+        assert flight.do("key", lambda: 1) == (1, False)
+        assert flight.do("key", lambda: 2) == (2, False)
+        assert flight.saved == 0
+
+    def test_different_keys(self):
+        flight = SingleFlight()
+
+        with ThreadPoolExecutor(2) as pool:
+            a = pool.submit(flight.do, "a", _slow, "a")
+            b = pool.submit(flight.do, "b", _slow, "b")
+
+        assert a.result() == ("a", False)
+        assert b.result() == ("b", False)
+
+    def test_error_shared(self):
+        flight = SingleFlight()
+        started = threading.Event()
+
+        def fn():
+            started.set()
+            time.sleep(0.2)
+            raise ValueError("failed")
+
+        with ThreadPoolExecutor(2) as pool:
+            leader = pool.submit(flight.do, "key", fn)
+            started.wait()
+            follower = pool.submit(flight.do, "key", fn)
+
+            with pytest.raises(ValueError):
+                leader.result()
+            with pytest.raises(ValueError):
+                follower.result()
+        assert flight.saved == 1
+
+    def test_do_async(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "value"
+
+        async def main():
+            return await asyncio.gather(*[flight.do_async("key", fn) for _ in range(5)])
+
+        results = asyncio.run(main())
+
+        assert len(calls) == 1
+        assert [value for value, _ in results] == ["value"] * 5
+        assert flight.saved == 4
+
+    def test_do_async_error(self):
+        flight = SingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0.05)
+            raise ValueError("failed")
+
+        async def main():
+            return await asyncio.gather(
+                *[flight.do_async("key", fn) for _ in range(3)], return_exceptions=True
+            )
+
+        results = asyncio.run(main())
+
+        assert all(isinstance(result, ValueError) for result in results)
+
+
+class TestCoalescedRequests(object):
+    def test_concurrent_fetches_share_request(self, local_server, local_client):
+        local_server.routes["ref-data/sectors"] = _slow_route(200, [{"name": "Energy"}])
+
+        def fetch(_):
+            return Sectors(client=local_client, output_format="json").fetch()
+
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(fetch, range(8)))
+
+        assert len(local_server.requests) == 1
+        assert local_client.singleflight.saved == 7
+        assert all(result == [{"name": "Energy"}] for result in results)
+        # every caller receives its own copy
+        assert len({id(result) for result in results}) == 8
+
+    def test_error_shared(self, local_server, local_client):
+        local_server.routes["ref-data/sectors"] = _slow_route(400, b"Bad request")
+
+        def fetch(_):
+            try:
+                Sectors(client=local_client).fetch()
+            except IEXQueryError as e:
+                return e
+
+        with ThreadPoolExecutor(4) as pool:
+            results = list(pool.map(fetch, range(4)))
+
+        assert len(local_server.requests) == 1
+        assert all(isinstance(result, IEXQueryError) for result in results)
+
+    def test_tokens_not_shared(self, local_server, local_client):
+        def route(params):
+            time.sleep(0.3)
+            if params["token"] != "TESTKEY":
+                return 401, b"Unauthorized"
+            return 200, [{"name": "Energy"}]
+
+        local_server.routes["ref-data/sectors"] = route
+
+        def fetch(token):
+            try:
+                return Sectors(client=local_client, token=token).fetch()
+            except IEXQueryError as e:
+                return e
+
+        with ThreadPoolExecutor(2) as pool:
+            good, bad = pool.map(fetch, ["TESTKEY", "BADKEY"])
+
+        assert len(local_server.requests) == 2
+        assert list(good["name"]) == ["Energy"]
+        assert isinstance(bad, IEXQueryError)
+
+    def test_asyncio_front_end(self, local_server, local_client):
+        local_server.routes["ref-data/sectors"] = _slow_route(200, [{"name": "Energy"}])
+
+        async def main():
+            loop = asyncio.get_running_loop()
+            reader = Sectors(client=local_client, output_format="json")
+            return await asyncio.gather(
+                *[loop.run_in_executor(None, reader.fetch) for _ in range(4)]
+            )
+
+        results = asyncio.run(main())
+
+        assert len(local_server.requests) == 1
+        assert results == [[{"name": "Energy"}]] * 4
+
+    def test_coalescing_disabled(self, local_server, make_client):
+        local_server.routes["ref-data/sectors"] = _slow_route(
+            200, [{"name": "Energy"}], delay=0.1
+        )
+        client = make_client(coalesce=False)
+
+        with ThreadPoolExecutor(4) as pool:
+            list(pool.map(lambda _: Sectors(client=client).fetch(), range(4)))
+
+        assert client.singleflight is None
+        assert len(local_server.requests) == 4
@@ -0,0 +1,115 @@
+import json
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+from iexfinance.data_apis import TimeSeries
+from iexfinance.refdata.base import Sectors, Symbols
+from iexfinance.stocks.collections import CollectionsReader
+from iexfinance.utils.exceptions import IEXQueryError
+from iexfinance.utils.streaming import iter_json_array
+
+SYMBOLS = [
+    {"symbol": "S%s" % i, "name": 'Name ]é[, "%s"' % i, "price": i * 1.5}
+    for i in range(2500)
+]
+
+
+def _split(data, size):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+class TestIterJsonArray(object):
+    @pytest.mark.parametrize("size", [1, 2, 7, 4096, 10**7])
+    def test_split_input(self, size):
+        data = SYMBOLS + [123456, -7.25, 1.5e-7, "str", None, True, [1, {}]]
+        raw = json.dumps(data, ensure_ascii=False).encode()
+        chunks = list(iter_json_array(_split(raw, size), chunk_size=1000))
+
+        assert [len(chunk) for chunk in chunks] == [1000, 1000, 507]
+        assert [item for chunk in chunks for item in chunk] == data
+
+    def test_empty_array(self):
+        assert list(iter_json_array([b" [ ", b"] "])) == []
+
+    def test_parse_hooks(self):
+        chunks = list(iter_json_array([b"[1.5, 2]"], parse_float=Decimal))
+
+        assert chunks == [[Decimal("1.5"), 2]]
+
+    @pytest.mark.parametrize(
+        "raw", [b"[1, 2", b"{}", b"[1 2]", b"Unknown symbol", b"", b"[1,]"]
+    )
+    def test_invalid(self, raw):
+        with pytest.raises(ValueError):
+            list(iter_json_array(_split(raw, 1)))
+
+    def test_elements_yielded_before_end(self):
+        def chunks():
+            yield b'[{"a": 1}, {"a": 2},'
+            raise AssertionError("read past the first chunk")
+
+        parsed = iter_json_array(chunks(), chunk_size=2)
+
+        assert next(parsed) == [{"a": 1}, {"a": 2}]
+
+
+class TestStreamingReaders(object):
+    def test_iter_chunks(self, local_server, local_client):
+        local_server.routes["ref-data/symbols"] = (200, SYMBOLS)
+        reader = Symbols(client=local_client, stream=True, chunk_size=1000)
+        chunks = list(reader.iter_chunks())
+
+        assert [len(chunk) for chunk in chunks] == [1000, 1000, 500]
+        assert all(isinstance(chunk, pd.DataFrame) for chunk in chunks)
+
+    def test_fetch_matches_buffered(self, local_server, local_client):
+        local_server.routes["ref-data/symbols"] = (200, SYMBOLS)
+        buffered = Symbols(client=local_client).fetch()
+        streamed = Symbols(client=local_client, stream=True, chunk_size=700).fetch()
+
+        pd.testing.assert_frame_equal(buffered, streamed)
+
+    def test_json_output(self, local_server, local_client):
+        local_server.routes["stock/market/collection/sector"] = (200, SYMBOLS)
+        data = CollectionsReader(
+            "Technology",
+            "sector",
+            client=local_client,
+            output_format="json",
+            stream=True,
+            chunk_size=100,
+        ).fetch()
+
+        assert data == SYMBOLS
+
+    def test_time_series_columns(self, local_server, local_client):
+        items = [{"id": "ID%s" % i, "description": str(i)} for i in range(25)]
+        local_server.routes["time-series"] = (200, items)
+        buffered = TimeSeries(client=local_client).fetch()
+        streamed = TimeSeries(client=local_client, stream=True, chunk_size=10).fetch()
+
+        pd.testing.assert_frame_equal(buffered, streamed)
+
+    def test_empty_response(self, local_server, local_client):
+        local_server.routes["ref-data/symbols"] = (200, [])
+        data = Symbols(client=local_client, stream=True).fetch()
+
+        assert data.empty
+
+    def test_invalid_response(self, local_server, local_client):
+        local_server.routes["ref-data/symbols"] = (200, b"Unknown symbol")
+
+        with pytest.raises(IEXQueryError):
+            Symbols(client=local_client, stream=True).fetch()
+
+    def test_error_status(self, local_server, local_client):
+        local_server.routes["ref-data/symbols"] = (403, b"Forbidden")
+
+        with pytest.raises(IEXQueryError):
+            Symbols(client=local_client, stream=True).fetch()
+
+    def test_not_streamable(self, local_client):
+        with pytest.raises(ValueError):
+            Sectors(client=local_client, stream=True)
@@ -0,0 +1,124 @@
+import datetime
+import sys
+
+import pytest
+
+from iexfinance.refdata.base import Symbols
+from iexfinance.stocks import Stock, get_historical_data
+
+pa = pytest.importorskip("pyarrow")
+
+QUOTES = {
+    "AAPL": {
+        "symbol": "AAPL",
+        "latestPrice": 100,
+        "latestVolume": 10,
+        "latestUpdate": 1596639769652,
+        "primaryExchange": "NASDAQ",
+    },
+    "TSLA": {
+        "symbol": "TSLA",
+        "latestPrice": 200.5,
+        "latestVolume": None,
+        "latestUpdate": 1596639769652,
+        "primaryExchange": "NASDAQ",
+    },
+}
+
+
+BODIES = {
+    "quote": lambda symbol, params: QUOTES[symbol],
+    "chart": [
+        {"date": "2020-01-02", "close": 1.0, "volume": 10},
+        {"date": "2020-01-03", "close": 2.0, "volume": 20},
+        {"date": "2020-02-03", "close": 3.0, "volume": 30},
+    ],
+    "book": {"bids": [], "asks": []},
+}
+
+
+class TestArrow(object):
+    def test_quote(self, local_server, local_client, batch_route):
+        batch_route.bodies.update(BODIES)
+        table = Stock(
+            ["AAPL", "TSLA"], client=local_client, output_format="arrow"
+        ).get_quote()
+
+        assert isinstance(table, pa.Table)
+        assert table.column_names[0] == "symbol"
+        assert table["symbol"].to_pylist() == ["AAPL", "TSLA"]
+        assert table.schema.field("latestPrice").type == pa.float64()
+        assert table["latestVolume"].to_pylist() == [10, None]
+        assert table.schema.field("latestUpdate").type == pa.timestamp("ms")
+        assert pa.types.is_dictionary(table.schema.field("primaryExchange").type)
+
+    def test_field_method(self, local_server, local_client, batch_route):
+        batch_route.bodies.update(BODIES)
+        stock = Stock("AAPL", client=local_client, output_format="arrow")
+
+        assert stock._get_field("quote", "latestPrice") == 100.0
+
+    def test_chart(self, local_server, local_client, batch_route):
+        batch_route.bodies.update(BODIES)
+        table = Stock(
+            ["AAPL", "TSLA"], client=local_client, output_format="arrow"
+        ).get_historical_prices()
+
+        assert table.num_rows == 6
+        assert table["symbol"].to_pylist() == ["AAPL"] * 3 + ["TSLA"] * 3
+
+    def test_no_pandas_endpoint(self, local_server, local_client, batch_route):
+        batch_route.bodies.update(BODIES)
+        stock = Stock("AAPL", client=local_client, output_format="arrow")
+
+        assert stock.get_book() == {"bids": [], "asks": []}
+
+    def test_historical(self, local_server, local_client, batch_route):
+        batch_route.bodies.update(BODIES)
+        table = get_historical_data(
+            ["AAPL", "TSLA"],
+            datetime.date(2020, 1, 1),
+            datetime.date(2020, 1, 31),
+            close_only=True,
+            client=local_client,
+            output_format="arrow",
+        )
+
+        assert table.column_names == ["symbol", "date", "close", "volume"]
+        assert table.num_rows == 4
+        assert table.schema.field("date").type == pa.date32()
+
+    def test_reader(self, local_server, local_client):
+        symbols = [{"symbol": "S%s" % i, "price": i * 1.5} for i in range(25)]
+        local_server.routes["ref-data/symbols"] = (200, symbols)
+        table = Symbols(client=local_client, output_format="arrow").fetch()
+        streamed = Symbols(
+            client=local_client, output_format="arrow", stream=True, chunk_size=10
+        ).fetch()
+
+        assert table.to_pylist() == symbols
+        assert streamed.equals(table)
+
+
+class TestPolars(object):
+    def test_quote(self, local_client, batch_route):
+        pl = pytest.importorskip("polars")
+        batch_route.bodies.update(BODIES)
+        stock = Stock(["AAPL", "TSLA"], client=local_client, output_format="polars")
+        df = stock.get_quote()
+
+        assert isinstance(df, pl.DataFrame)
+        assert df["latestPrice"].to_list() == [100.0, 200.5]
+        assert df.schema["latestUpdate"] == pl.Datetime("ms")
+
+
+class TestFormats(object):
+    def test_invalid(self, local_client):
+        with pytest.raises(ValueError):
+            Stock("AAPL", client=local_client, output_format="parquet")
+
+    def test_not_installed(self, local_client, monkeypatch):
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+        with pytest.raises(ImportError, match="pyarrow"):
+            Stock("AAPL", client=local_client, output_format="arrow")
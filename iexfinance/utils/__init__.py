@@ -1,14 +1,38 @@
 import datetime as dt
+import sys
+from numbers import Number
 
-import pandas as pd
-import requests
-from pandas import to_datetime
-from pandas.api.types import is_number
+# pandas and requests are imported on first use, so that importing
+# iexfinance stays fast for users of the json output format and for
+# short-lived processes
 
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 32
 
-def _init_session(session, retry_count=3):
+
+def _init_session(
+    session,
+    pool_connections=DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize=DEFAULT_POOL_MAXSIZE,
+    pool_block=False,
+    keep_alive=True,
+):
     if session is None:
+        import requests
+
+        from iexfinance.utils.adapters import IEXHTTPAdapter
+
         session = requests.session()
+        # Retries are handled by _IEXBase, so the adapter never retries
+        adapter = IEXHTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not keep_alive:
+            session.headers["Connection"] = "close"
     return session
 
 
@@ -24,18 +48,19 @@ def _sanitize_dates(start, end):
     end : str, int, date, datetime, Timestamp
         Desired end date
     """
+    from pandas import to_datetime
+
     today = dt.date.today()
     today = to_datetime(today)
 
-    if is_number(start):
+    if isinstance(start, Number):
         # regard int as year
         start = dt.datetime(start, 1, 1)
-    start = to_datetime(start)
 
-    if is_number(end):
+    if isinstance(end, Number):
         end = dt.datetime(end, 1, 1)
-    end = to_datetime(end)
 
+    # None must be replaced before conversion, which would turn it into NaT
     if start is None:
         # default to 5 years before today
         start = today - dt.timedelta(days=365 * 15)
@@ -57,7 +82,7 @@ def _sanitize_dates(start, end):
 def _handle_lists(lister, mult=True, err_msg=None):
     if isinstance(lister, (str, int)):
         return [lister] if mult is True else lister
-    elif isinstance(lister, pd.DataFrame) and mult is True:
+    elif _is_dataframe(lister) and mult is True:
         return list(lister.index)
     elif mult is True:
         return list(lister)
@@ -65,5 +90,11 @@ def _handle_lists(lister, mult=True, err_msg=None):
         raise ValueError(err_msg or "Only 1 symbol/market parameter allowed.")
 
 
+def _is_dataframe(obj):
+    # an object cannot be a DataFrame unless pandas has been imported
+    pd = sys.modules.get("pandas")
+    return pd is not None and isinstance(obj, pd.DataFrame)
+
+
 def no_pandas(out):
     return out
@@ -0,0 +1,176 @@
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from iexfinance.utils import DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE  # noqa
+
+
+class PoolStats(object):
+    """
+    Thread-safe connection pool utilisation counters shared by all of the
+    connection pools of an ``IEXHTTPAdapter``
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_use = 0
+        self.waited = 0
+        self.wait_time = 0.0
+        self.connections_created = 0
+
+
+_connect_time = threading.local()
+
+
+def take_connect_time():
+    """Returns the time (seconds) spent opening connections in the calling
+    thread since the previous call, and resets it"""
+    value = getattr(_connect_time, "value", 0.0)
+    _connect_time.value = 0.0
+    return value
+
+
+class _TimedConnectionMixin(object):
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super(_TimedConnectionMixin, self).connect()
+        finally:
+            _connect_time.value = (
+                getattr(_connect_time, "value", 0.0) + time.perf_counter() - start
+            )
+
+
+class _CountingPoolMixin(object):
+    _stats = None
+
+    def _get_conn(self, timeout=None):
+        stats = self._stats
+        pool = self.pool
+        # with blocking pools, an empty queue means the caller will wait
+        # for another thread to release a connection
+        wait = self.block and pool is not None and pool.empty()
+        start = time.perf_counter()
+        try:
+            return super(_CountingPoolMixin, self)._get_conn(timeout=timeout)
+        finally:
+            # urllib3 hands a (possibly None) connection back through
+            # _put_conn even when checking one out fails, so every attempt
+            # is counted
+            with stats.lock:
+                stats.in_use += 1
+                if wait:
+                    stats.waited += 1
+                    stats.wait_time += time.perf_counter() - start
+
+    def _put_conn(self, conn):
+        with self._stats.lock:
+            self._stats.in_use -= 1
+        super(_CountingPoolMixin, self)._put_conn(conn)
+
+    def _new_conn(self):
+        with self._stats.lock:
+            self._stats.connections_created += 1
+        return super(_CountingPoolMixin, self)._new_conn()
+
+    def idle_connections(self):
+        pool = self.pool
+        if pool is None:
+            return 0
+        # unused slots of the queue are filled with None
+        return sum(1 for conn in list(pool.queue) if conn is not None)
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class IEXHTTPAdapter(HTTPAdapter):
+    """
+    Transport adapter mounted on sessions created by ``iexfinance``
+
+    Sizes the underlying urllib3 connection pools and keeps utilisation
+    counters (see ``pool_stats``) to help tune them.
+
+    Parameters
+    ----------
+    pool_connections: int, default 10, optional
+        Number of per-host connection pools to cache
+    pool_maxsize: int, default 32, optional
+        Maximum number of connections kept alive per host
+    pool_block: bool, default False, optional
+        Whether to wait for a free connection once ``pool_maxsize``
+        connections to a host are in use. If ``False``, additional
+        connections are opened and discarded after use.
+    """
+
+    def __init__(
+        self,
+        pool_connections=DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize=DEFAULT_POOL_MAXSIZE,
+        pool_block=False,
+        **kwargs
+    ):
+        self.stats = PoolStats()
+        super(IEXHTTPAdapter, self).__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            **kwargs
+        )
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(IEXHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+        attrs = {"_stats": self.stats}
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type(
+                "CountingHTTPConnectionPool",
+                (_CountingPoolMixin, HTTPConnectionPool),
+                dict(attrs, ConnectionCls=_TimedHTTPConnection),
+            ),
+            "https": type(
+                "CountingHTTPSConnectionPool",
+                (_CountingPoolMixin, HTTPSConnectionPool),
+                dict(attrs, ConnectionCls=_TimedHTTPSConnection),
+            ),
+        }
+
+    def __setstate__(self, state):
+        self.stats = PoolStats()
+        super(IEXHTTPAdapter, self).__setstate__(state)
+
+    def pool_stats(self):
+        """Connection pool utilisation
+
+        Returns
+        -------
+        dict
+            ``in_use``: connections currently checked out of the pools
+            ``idle``: open connections waiting in the pools for reuse
+            ``waited``: number of requests which waited for a connection
+            ``wait_time``: total time (seconds) spent waiting for connections
+            ``connections_created``: number of connections opened
+            ``pools``: number of per-host pools
+            ``maxsize``: maximum number of connections kept per host
+        """
+        container = self.poolmanager.pools
+        with container.lock:
+            pools = list(container._container.values())
+        with self.stats.lock:
+            stats = {
+                "in_use": self.stats.in_use,
+                "waited": self.stats.waited,
+                "wait_time": self.stats.wait_time,
+                "connections_created": self.stats.connections_created,
+            }
+        stats["idle"] = sum(pool.idle_connections() for pool in pools)
+        stats["pools"] = len(pools)
+        stats["maxsize"] = self._pool_maxsize
+        return stats
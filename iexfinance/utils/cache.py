@@ -0,0 +1,239 @@
+import threading
+import time
+from collections import OrderedDict
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# Default maximum age (seconds) of cached responses, by batch ``types`` name
+# or URL template prefix. ``None`` caches forever, ``0`` disables caching.
+DEFAULT_TTLS = {
+    # prices
+    "book": 1,
+    "quote": 5,
+    "price": 5,
+    "delayed-quote": 15,
+    "largest-trades": 15,
+    "ohlc": MINUTE,
+    "intraday-prices": MINUTE,
+    "volume-by-venue": MINUTE,
+    "previous": HOUR,
+    "chart": 15 * MINUTE,
+    "stock/{symbol}/chart/1d": MINUTE,
+    "stock/{symbol}/chart/date/{date}": MINUTE,
+    # profiles
+    "company": DAY,
+    "logo": DAY,
+    "peers": DAY,
+    "insider-roster": DAY,
+    "insider-summary": DAY,
+    "insider-transactions": DAY,
+    # fundamentals
+    "balance-sheet": DAY,
+    "cash-flow": DAY,
+    "dividends": DAY,
+    "earnings": DAY,
+    "financials": DAY,
+    "income": DAY,
+    "splits": DAY,
+    # research
+    "stats": HOUR,
+    "advanced-stats": HOUR,
+    "estimates": DAY,
+    "fund-ownership": DAY,
+    "institutional-ownership": DAY,
+    "price-target": DAY,
+    # news
+    "news": MINUTE,
+    # market
+    "stock/market/collection": 5,
+    "stock/market/list": 5,
+    "stock/market/sector-performance": MINUTE,
+    "stock/market/upcoming-ipos": HOUR,
+    "stock/market/today-earnings": HOUR,
+    # reference data
+    "ref-data": DAY,
+}
+
+
+class _Entry(object):
+    __slots__ = ("value", "size", "stored")
+
+    def __init__(self, value, size, stored):
+        self.value = value
+        self.size = size
+        self.stored = stored
+
+
+class ResponseCache(object):
+    """
+    In-memory LRU cache of parsed IEX Cloud responses
+
+    Responses are cached by URL and query parameters. How long a cached
+    response may be reused depends on the endpoint (see ``ttl_for``): from
+    seconds for quotes and prices to days for company profiles and reference
+    data, and forever for historical prices of closed dates (see
+    ``HistoricalReader`` and ``IntradayReader``). Once the cache
+    holds ``max_entries`` responses or ``max_bytes`` of response bodies, the
+    least recently used responses are evicted.
+
+    The parsed JSON is cached, so that cache hits skip both the request and
+    JSON decoding.
+
+    Parameters
+    ----------
+    max_entries: int, default 1024, optional
+        Maximum number of cached responses
+    max_bytes: int, default 64 MiB, optional
+        Maximum total size of the cached response bodies
+    ttls: dict, optional
+        Maximum age (seconds) of cached responses by batch ``types`` name or
+        URL template prefix, overriding ``DEFAULT_TTLS``. ``None`` caches
+        forever and ``0`` disables caching.
+    default_ttl: float, default 0, optional
+        Maximum age for endpoints which are not found in ``ttls``. Not cached
+        by default.
+    """
+
+    def __init__(
+        self, max_entries=1024, max_bytes=64 * 1024 * 1024, ttls=None, default_ttl=0
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return "{}(entries={}, bytes={})".format(
+            self.__class__.__name__, len(self), self.bytes
+        )
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _lookup_ttl(self, name):
+        try:
+            return True, self.ttls[name]
+        except KeyError:
+            return False, None
+
+    def ttl_for(self, url_template, params):
+        """Maximum age (seconds) of a cached response for a request
+
+        Batch requests use the shortest maximum age of their ``types``. Other
+        requests use the longest matching URL template prefix.
+
+        Returns
+        -------
+        float or None
+            Maximum age in seconds, ``None`` for no limit, ``0`` if the
+            response should not be cached
+        """
+        types = params.get("types")
+        if types:
+            ttls = []
+            for name in types.split(","):
+                found, ttl = self._lookup_ttl(name)
+                ttls.append(ttl if found else self.default_ttl)
+            if any(ttl == 0 for ttl in ttls):
+                return 0
+            finite = [ttl for ttl in ttls if ttl is not None]
+            return min(finite) if finite else None
+        segments = url_template.split("/")
+        for end in range(len(segments), 0, -1):
+            found, ttl = self._lookup_ttl("/".join(segments[:end]))
+            if found:
+                return ttl
+        return self.default_ttl
+
+    @staticmethod
+    def make_key(url, params, *extra):
+        """Cache key for a request (the token is not part of the key)"""
+        items = tuple(sorted((k, str(v)) for k, v in params.items() if k != "token"))
+        return (url, items) + extra
+
+    def get(self, key, max_age=None):
+        """Looks up a cached response
+
+        Parameters
+        ----------
+        key: tuple
+            Cache key (see ``make_key``)
+        max_age: float, optional
+            Maximum age (seconds) of an acceptable response. Any age is
+            accepted if ``None``.
+
+        Returns
+        -------
+        tuple
+            ``(True, value)`` on a hit, ``(False, None)`` on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and max_age is not None:
+                if time.time() - entry.stored > max_age:
+                    self._remove(key)
+                    entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry.value
+
+    def set(self, key, value, size=0):
+        """Caches a response
+
+        Parameters
+        ----------
+        key: tuple
+            Cache key (see ``make_key``)
+        value: object
+            Parsed response
+        size: int, default 0, optional
+            Size of the response body (bytes), counted towards ``max_bytes``
+        """
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(value, size, time.time())
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.bytes -= entry.size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        """Cache statistics
+
+        Returns
+        -------
+        dict
+            ``entries``, ``bytes``, ``hits``, ``misses`` and ``evictions``
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
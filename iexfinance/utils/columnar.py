@@ -0,0 +1,374 @@
+from itertools import chain
+from operator import itemgetter
+
+# schema types which are conversions rather than dtypes
+DATE = "date"
+EPOCH_MS = "epoch_ms"
+
+# output formats built from the JSON values without going through pandas
+TABLE_FORMATS = ("arrow", "polars")
+
+
+def _column(values):
+    """Converts the values of a column to an array when their type is known
+    from the JSON types alone, leaving other columns to pandas' inference"""
+    import numpy as np
+
+    kinds = set(map(type, values))
+    if kinds == {float} or kinds == {float, int}:
+        return np.array(values, dtype="float64")
+    if kinds == {int}:
+        try:
+            return np.array(values, dtype="int64")
+        except OverflowError:
+            return values
+    if kinds == {bool}:
+        return np.array(values, dtype="bool")
+    return values
+
+
+def _typed(values, kind):
+    """Converts the values of a column (list or array) to a schema type"""
+    import numpy as np
+    import pandas as pd
+
+    if kind == EPOCH_MS:
+        if isinstance(values, np.ndarray) and values.dtype == "int64":
+            return values.view("datetime64[ms]")
+        return pd.to_datetime(values, unit="ms", errors="coerce")
+    if kind == DATE:
+        try:
+            return np.fromiter(
+                ("NaT" if value is None else value for value in values),
+                "datetime64[D]",
+                len(values),
+            )
+        except (TypeError, ValueError):
+            return pd.to_datetime(values, format="%Y-%m-%d", errors="coerce")
+    if kind == "category":
+        return pd.Categorical(values)
+    try:
+        return pd.array(values, dtype=kind)
+    except (TypeError, ValueError):
+        # values which do not fit the schema are left as they are
+        return values
+
+
+def _fill(records, field, kind):
+    """Fills a preallocated array with the values of a field, for schema
+    types with a fixed-width representation
+
+    Returns None if the values do not fit the type."""
+    import numpy as np
+    import pandas as pd
+
+    # nulls are read as NaN (or NaT)
+    dtype = "datetime64[D]" if kind == DATE else "float64"
+    count = len(records)
+    try:
+        try:
+            values = np.fromiter(map(itemgetter(field), records), dtype, count)
+        except KeyError:
+            values = np.fromiter(
+                (record.get(field) for record in records), dtype, count
+            )
+    except (TypeError, ValueError):
+        return None
+    if kind in ("float64", DATE):
+        return values
+    # integers (exact up to 2 ** 53) are read as floats so that nulls fit
+    nulls = np.isnan(values)
+    values[nulls] = 0
+    if np.any(values % 1):
+        return None
+    integers = values.astype("int64")
+    if kind == EPOCH_MS:
+        integers[nulls] = np.iinfo("int64").min
+        return integers.view("datetime64[ms]")
+    return pd.arrays.IntegerArray(integers, nulls)
+
+
+# schema types read by _fill
+_FILLED = ("float64", "Int64", DATE, EPOCH_MS)
+
+
+def _build(records, field, kind=None):
+    """Array (or list) of the values of a field of the records"""
+    values = _fill(records, field, kind) if kind in _FILLED else None
+    if values is None:
+        values = _column([record.get(field) for record in records])
+        if kind is not None:
+            values = _typed(values, kind)
+    return values
+
+
+def records_to_frame(records, index=None, schema=None, columns=None):
+    """
+    Builds a DataFrame from a list of records (dicts) column by column
+
+    Each record becomes a row, and each key a column (in order of first
+    appearance; missing keys are null). Numeric and boolean columns are
+    converted to typed arrays directly, so that no column is left as
+    ``object`` because other columns of its row have different types (as
+    when a frame built with records as columns is transposed). Numeric,
+    date and time fields of the schema are read from the records straight
+    into preallocated arrays.
+
+    Parameters
+    ----------
+    records: list of dict
+        Rows of the frame
+    index: list-like, optional
+        Row labels
+    schema: dict, optional
+        Type of some of the fields (see ``apply_schema``)
+    columns: dict, optional
+        Columns of some of the fields which are already built
+
+    Returns
+    -------
+    pandas.DataFrame
+    """
+    import pandas as pd
+
+    schema = schema or {}
+    built = columns or {}
+    fields = dict.fromkeys(chain.from_iterable(records))
+    columns = {}
+    for field in fields:
+        if field in built:
+            columns[field] = built[field]
+        else:
+            columns[field] = _build(records, field, schema.get(field))
+    return pd.DataFrame(columns, index=index, copy=False)
+
+
+def bars_to_frame(bars, label, schema=None, start=None, end=None):
+    """
+    Builds a long-form DataFrame of the bars (records) of several symbols
+
+    The bars of all symbols are read into one array per field, and the
+    ``(symbol, label)`` MultiIndex is built from integer codes rather than
+    from tuples. Bars outside of ``start`` and ``end`` are dropped before
+    the frame is built.
+
+    Parameters
+    ----------
+    bars: dict
+        List of bars of each symbol
+    label: str or callable
+        Field of the bars used as second index level (typed by ``schema``),
+        or a function returning the label of a bar
+    schema: dict, optional
+        Type of some of the fields (see ``apply_schema``)
+    start: datetime-like, optional
+        Earliest label (which must be a ``DATE`` field) of the bars kept
+    end: datetime-like, optional
+        Latest label of the bars kept
+
+    Returns
+    -------
+    pandas.DataFrame
+    """
+    import numpy as np
+    import pandas as pd
+
+    schema = schema or {}
+    symbols = list(bars)
+    counts = [len(bars[symbol]) for symbol in symbols]
+    records = [bar for symbol in symbols for bar in bars[symbol]]
+    symbol_codes = np.repeat(np.arange(len(symbols)), counts)
+    columns = {}
+    if callable(label):
+        labels = np.array([label(bar) for bar in records], dtype=object)
+    else:
+        labels = columns[label] = np.asarray(_build(records, label, schema.get(label)))
+    if start is not None or end is not None:
+        keep = np.ones(len(records), dtype=bool)
+        if start is not None:
+            keep &= labels >= np.datetime64(pd.Timestamp(start))
+        if end is not None:
+            keep &= labels <= np.datetime64(pd.Timestamp(end))
+        if not keep.all():
+            records = [bar for bar, kept in zip(records, keep) if kept]
+            symbol_codes = symbol_codes[keep]
+            labels = labels[keep]
+            if not callable(label):
+                columns[label] = labels
+    label_codes, label_levels = pd.factorize(labels, sort=True)
+    index = pd.MultiIndex(
+        levels=[symbols, label_levels],
+        codes=[symbol_codes, label_codes],
+        verify_integrity=False,
+    )
+    return records_to_frame(records, index=index, schema=schema, columns=columns)
+
+
+def apply_schema(frame, schema):
+    """
+    Converts the columns of a DataFrame to the types of a schema
+
+    Parameters
+    ----------
+    frame: pandas.DataFrame
+        Frame with one column per field
+    schema: dict
+        Type of each field: a dtype, ``DATE`` (``YYYY-MM-DD`` strings) or
+        ``EPOCH_MS`` (milliseconds since the epoch). Fields which are not in
+        the schema, or not in the frame, are ignored.
+
+    Returns
+    -------
+    pandas.DataFrame
+    """
+    import pandas as pd
+
+    if not schema or not any(name in schema for name in frame.columns):
+        return frame
+    columns = {}
+    for name in frame.columns:
+        column = frame[name]
+        kind = schema.get(name)
+        if kind is not None and str(column.dtype) != kind:
+            column = _typed(column.to_numpy(), kind)
+        columns[name] = column
+    return pd.DataFrame(columns, index=frame.index, copy=False)
+
+
+def require(format):
+    """Checks that the package of a table output format is installed
+
+    Raises
+    ------
+    ImportError
+        If the package (``pyarrow``, and also ``polars`` for ``polars``) is
+        not installed
+    """
+    packages = ["pyarrow"]
+    if format == "polars":
+        packages.append("polars")
+    for package in packages:
+        try:
+            __import__(package)
+        except ImportError:
+            raise ImportError(
+                "The %s output format requires %s to be installed." % (format, package)
+            )
+
+
+def _arrow_column(values, kind=None):
+    """Builds an Arrow array from the values of a column, with the type of a
+    schema type if the values fit it"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    types = {
+        "float64": pa.float64(),
+        "Int64": pa.int64(),
+        EPOCH_MS: pa.timestamp("ms"),
+    }
+    try:
+        array = pa.array(values, type=types.get(kind))
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        if kind in types:
+            return _arrow_column(values)
+        # mixed JSON types are kept as strings
+        array = pa.array([None if value is None else str(value) for value in values])
+    if kind == "category" and pa.types.is_string(array.type):
+        array = array.dictionary_encode()
+    elif kind == DATE and pa.types.is_string(array.type):
+        array = pc.strptime(
+            array, format="%Y-%m-%d", unit="s", error_is_null=True
+        ).cast(pa.date32())
+    return array
+
+
+def records_to_table(records, schema=None, format="arrow"):
+    """
+    Builds an Arrow table (or a polars DataFrame) from a list of records
+
+    The columns are built directly from the JSON values, without going
+    through pandas. Each key of the records becomes a column, in order of
+    first appearance; missing keys are null.
+
+    Parameters
+    ----------
+    records: list of dict
+        Rows of the table
+    schema: dict, optional
+        Type of some of the fields (see ``apply_schema``). Categories are
+        dictionary-encoded, and ``DATE`` fields are ``date32``.
+    format: str, default "arrow", optional
+        ``arrow`` for a ``pyarrow.Table``, or ``polars`` for a
+        ``polars.DataFrame`` sharing the table's buffers
+
+    Returns
+    -------
+    pyarrow.Table or polars.DataFrame
+    """
+    import pyarrow as pa
+
+    schema = schema or {}
+    fields = dict.fromkeys(chain.from_iterable(records))
+    table = pa.table(
+        {
+            field: _arrow_column(
+                [record.get(field) for record in records], schema.get(field)
+            )
+            for field in fields
+        }
+    )
+    if format == "polars":
+        import polars as pl
+
+        return pl.from_arrow(table)
+    return table
+
+
+def json_to_records(out, key="key"):
+    """
+    Rows of a JSON response, for conversion to a table
+
+    - a list of objects gives one row per object, and a list of other values
+      one row per value (in a ``value`` column)
+    - an object whose values are all objects (or lists of objects) gives one
+      row per value (or per object of each list), with its name in a
+      ``key`` column
+    - any other object is one row
+
+    Parameters
+    ----------
+    out: list or dict
+        Decoded JSON response
+    key: str, default "key", optional
+        Name of the column of the names of an object's values
+
+    Returns
+    -------
+    list of dict
+    """
+    if isinstance(out, list):
+        if all(isinstance(item, dict) for item in out):
+            return out
+        return [{"value": item} for item in out]
+    if not isinstance(out, dict):
+        return [{"value": out}]
+    if out and all(isinstance(value, dict) for value in out.values()):
+        return [{key: name, **value} for name, value in out.items()]
+    if out and all(
+        isinstance(value, list) and all(isinstance(item, dict) for item in value)
+        for value in out.values()
+    ):
+        return [{key: name, **item} for name, value in out.items() for item in value]
+    return [out]
+
+
+def concat_tables(tables):
+    """Joins tables (or polars DataFrames) built by ``records_to_table``"""
+    import pyarrow as pa
+
+    if isinstance(tables[0], pa.Table):
+        return pa.concat_tables(tables, promote_options="default")
+    import polars as pl
+
+    return pl.concat(tables, how="diagonal_relaxed")
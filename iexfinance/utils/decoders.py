@@ -0,0 +1,71 @@
+import json
+
+
+def _orjson():
+    import orjson
+
+    return orjson.loads
+
+
+def _simdjson():
+    import simdjson
+
+    return simdjson.loads
+
+
+def _ujson():
+    import ujson
+
+    return ujson.loads
+
+
+def _json():
+    return json.loads
+
+
+# JSON decoders in order of preference for "auto"
+DECODERS = {"orjson": _orjson, "simdjson": _simdjson, "ujson": _ujson, "json": _json}
+
+
+def get_decoder(name="auto"):
+    """
+    Resolves a JSON decoder
+
+    Parameters
+    ----------
+    name: str or callable, default "auto", optional
+        ``orjson``, ``simdjson``, ``ujson``, ``json`` (the standard library),
+        ``auto`` for the fastest installed decoder, or a callable decoding
+        ``bytes`` to Python objects
+
+    Returns
+    -------
+    tuple
+        ``(name, loads)``, where ``loads`` decodes a response body (bytes)
+        and raises ``ValueError`` on invalid JSON
+
+    Raises
+    ------
+    ImportError
+        If the requested decoder is not installed
+    ValueError
+        If the decoder name is unknown
+    """
+    if callable(name):
+        return getattr(name, "__name__", "custom"), name
+    if name == "auto":
+        for candidate, loader in DECODERS.items():
+            try:
+                return candidate, loader()
+            except ImportError:
+                continue
+    if name not in DECODERS:
+        raise ValueError(
+            "Please select a valid JSON decoder (%s or auto)." % ", ".join(DECODERS)
+        )
+    try:
+        return name, DECODERS[name]()
+    except ImportError:
+        raise ImportError(
+            "The %s JSON decoder requires %s to be installed." % (name, name)
+        )
@@ -0,0 +1,293 @@
+import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode
+
+from iexfinance.utils.cache import DAY
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chart_rows (
+    symbol TEXT NOT NULL,
+    close_only INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    row TEXT NOT NULL,
+    PRIMARY KEY (symbol, close_only, date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS chart_coverage (
+    symbol TEXT NOT NULL,
+    close_only INTEGER NOT NULL,
+    start TEXT NOT NULL,
+    end TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chart_coverage_symbol
+    ON chart_coverage (symbol, close_only);
+CREATE TABLE IF NOT EXISTS snapshots (
+    key TEXT PRIMARY KEY,
+    stored REAL NOT NULL,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _isodate(date):
+    if isinstance(date, datetime.datetime):
+        date = date.date()
+    return date.isoformat()
+
+
+class DiskCache(object):
+    """
+    Persistent SQLite cache of immutable historical and reference data
+
+    Daily chart rows are stored per ``(symbol, date)`` together with the
+    date ranges which are known to be complete, so that any later request
+    for a range of closed dates can be served without contacting IEX Cloud,
+    even from another process. Reference data (``ref-data`` endpoints) is
+    stored as snapshots which are reused for up to ``snapshot_ttl`` seconds.
+
+    The cache is a single SQLite file in write-ahead-logging mode, which any
+    number of threads and worker processes may read and write concurrently:
+    every thread (and every forked process) opens its own connection, and
+    writers wait for up to ``timeout`` seconds for a competing write to
+    finish.
+
+    Stored bars are not updated when prices are adjusted for a split or
+    dividend. Use ``invalidate`` to drop the bars of an affected symbol.
+
+    Parameters
+    ----------
+    path: str
+        Path of the cache file (created if it does not exist)
+    snapshot_ttl: float, default 86400, optional
+        Maximum age (seconds) of reference data snapshots. ``None`` reuses
+        snapshots forever.
+    timeout: float, default 30, optional
+        Maximum time (seconds) to wait for a lock held by another connection
+    """
+
+    def __init__(self, path, snapshot_ttl=DAY, timeout=30.0):
+        self.path = os.fspath(path)
+        self.snapshot_ttl = snapshot_ttl
+        self.timeout = timeout
+        self._local = threading.local()
+        self._conn.executescript(_SCHEMA)
+
+    def __repr__(self):
+        return "{}(path={!r})".format(self.__class__.__name__, self.path)
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=%d" % int(self.timeout * 1000))
+        return conn
+
+    @property
+    def _conn(self):
+        # SQLite connections must not be shared between threads or carried
+        # across fork(), so each thread of each process opens its own
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            local.conn = self._connect()
+            local.pid = os.getpid()
+        return local.conn
+
+    def _transaction(self):
+        return _Transaction(self._conn)
+
+    # Chart rows
+
+    def get_chart(self, symbol, start, end, close_only=False):
+        """Returns the stored daily chart rows of a symbol between two dates
+
+        Parameters
+        ----------
+        symbol: str
+            Ticker symbol
+        start: datetime.date
+            First date (inclusive)
+        end: datetime.date
+            Last date (inclusive)
+        close_only: bool, default False, optional
+            Whether the rows were requested with ``chartCloseOnly``
+
+        Returns
+        -------
+        list or None
+            Chart rows ordered by date, or ``None`` if the range is not
+            completely stored
+        """
+        start, end = _isodate(start), _isodate(end)
+        conn = self._conn
+        covered = conn.execute(
+            "SELECT 1 FROM chart_coverage WHERE symbol = ? AND close_only = ? "
+            "AND start <= ? AND end >= ? LIMIT 1",
+            (symbol, int(close_only), start, end),
+        ).fetchone()
+        if covered is None:
+            return None
+        rows = conn.execute(
+            "SELECT row FROM chart_rows WHERE symbol = ? AND close_only = ? "
+            "AND date BETWEEN ? AND ? ORDER BY date",
+            (symbol, int(close_only), start, end),
+        )
+        return [json.loads(row) for row, in rows]
+
+    def put_chart(self, symbol, rows, start, end, close_only=False):
+        """Stores daily chart rows covering a range of closed dates
+
+        Parameters
+        ----------
+        symbol: str
+            Ticker symbol
+        rows: list
+            Chart rows (with a ``date`` key). Rows outside the range are
+            ignored.
+        start: datetime.date
+            First date (inclusive) which the rows are complete from
+        end: datetime.date
+            Last date (inclusive) which the rows are complete to. Must be a
+            closed trading date.
+        close_only: bool, default False, optional
+            Whether the rows were requested with ``chartCloseOnly``
+        """
+        start_date = start.date() if isinstance(start, datetime.datetime) else start
+        end_date = end.date() if isinstance(end, datetime.datetime) else end
+        if start_date > end_date:
+            return
+        start, end = start_date.isoformat(), end_date.isoformat()
+        close_only = int(close_only)
+        values = [
+            (symbol, close_only, row["date"], json.dumps(row))
+            for row in rows
+            if start <= row["date"] <= end
+        ]
+        one_day = datetime.timedelta(days=1)
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO chart_rows VALUES (?, ?, ?, ?)", values
+            )
+            # Merge the new range with any overlapping or adjacent ranges
+            adjacent = conn.execute(
+                "SELECT rowid, start, end FROM chart_coverage WHERE symbol = ? "
+                "AND close_only = ? AND start <= ? AND end >= ?",
+                (
+                    symbol,
+                    close_only,
+                    (end_date + one_day).isoformat(),
+                    (start_date - one_day).isoformat(),
+                ),
+            ).fetchall()
+            for rowid, other_start, other_end in adjacent:
+                start = min(start, other_start)
+                end = max(end, other_end)
+                conn.execute("DELETE FROM chart_coverage WHERE rowid = ?", (rowid,))
+            conn.execute(
+                "INSERT INTO chart_coverage VALUES (?, ?, ?, ?)",
+                (symbol, close_only, start, end),
+            )
+
+    def invalidate(self, symbol):
+        """Drops all stored chart rows of a symbol (e.g. after a split)"""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM chart_rows WHERE symbol = ?", (symbol,))
+            conn.execute("DELETE FROM chart_coverage WHERE symbol = ?", (symbol,))
+
+    # Reference data snapshots
+
+    @staticmethod
+    def make_key(url, params):
+        """Snapshot key for a request (the token is not part of the key)"""
+        items = sorted((k, str(v)) for k, v in params.items() if k != "token")
+        return "%s?%s" % (url, urlencode(items))
+
+    def get_snapshot(self, key, max_age=None):
+        """Looks up a stored snapshot
+
+        Parameters
+        ----------
+        key: str
+            Snapshot key (see ``make_key``)
+        max_age: float, optional
+            Maximum age (seconds) of an acceptable snapshot. Defaults to
+            ``snapshot_ttl``.
+
+        Returns
+        -------
+        tuple
+            ``(True, value)`` on a hit, ``(False, None)`` on a miss
+        """
+        if max_age is None:
+            max_age = self.snapshot_ttl
+        row = self._conn.execute(
+            "SELECT stored, value FROM snapshots WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or (max_age is not None and time.time() - row[0] > max_age):
+            return False, None
+        return True, json.loads(row[1])
+
+    def put_snapshot(self, key, value):
+        """Stores a snapshot of parsed JSON data"""
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?)",
+                (key, time.time(), json.dumps(value)),
+            )
+
+    def clear(self):
+        """Drops all stored chart rows and snapshots"""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM chart_rows")
+            conn.execute("DELETE FROM chart_coverage")
+            conn.execute("DELETE FROM snapshots")
+
+    def stats(self):
+        """Numbers of stored chart rows, symbols and snapshots
+
+        Returns
+        -------
+        dict
+            ``chart_rows``, ``chart_symbols`` and ``snapshots``
+        """
+        conn = self._conn
+        return {
+            "chart_rows": conn.execute("SELECT COUNT(*) FROM chart_rows").fetchone()[0],
+            "chart_symbols": conn.execute(
+                "SELECT COUNT(DISTINCT symbol) FROM chart_coverage"
+            ).fetchone()[0],
+            "snapshots": conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0],
+        }
+
+    def close(self):
+        """Closes the connection of the calling thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            conn.close()
+        self._local = threading.local()
+
+
+class _Transaction(object):
+    """Write transaction which takes the database lock up front, so that
+    concurrent writers queue on ``busy_timeout`` instead of failing to
+    upgrade a read lock"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, *args):
+        if exc_type is None:
+            self.conn.execute("COMMIT")
+        else:
+            self.conn.execute("ROLLBACK")
@@ -0,0 +1,146 @@
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class RequestEvent(object):
+    """
+    Timings and metadata of one reader call
+
+    An event is created for every call which queries an endpoint (such as
+    ``fetch`` or ``Stock.get_quote``) and passed to the hooks of the reader
+    and of its client once the output has been converted, or the call has
+    failed. The last event of a reader is also available as
+    ``reader.last_event``.
+
+    All timings are in seconds, and are ``None`` for phases which did not
+    take place (e.g. no request is made on a cache hit).
+
+    Attributes
+    ----------
+    reader: str
+        Name of the reader class
+    endpoint: str
+        URL template of the endpoint (e.g. ``stock/market/batch``)
+    types: str or None
+        Comma-separated batch types (e.g. ``quote``)
+    url: str
+        Request URL (without query string)
+    status: int or None
+        HTTP status of the final attempt
+    bytes: int or None
+        Size of the response body
+    requests: int
+        Number of requests made (more than 1 if the call was split into
+        several requests, 0 if no request was made)
+    attempts: int
+        Number of attempts made for all requests, including retries
+    cache: str or None
+        ``memory`` or ``disk`` if the response was served from a cache,
+        ``shared`` if it was received from a concurrent identical request
+    build: float
+        Preparing the query parameters and looking up the response cache
+    connect: float or None
+        Opening the connection (TCP and TLS), 0 if a pooled connection was
+        reused. Always 0 for sessions which do not use an ``IEXHTTPAdapter``.
+    round_trip: float or None
+        Sending the request until the response headers were received
+        (time to first byte, including ``connect``)
+    download: float or None
+        Reading the response body
+    decode: float or None
+        Decoding the JSON body
+    convert: float or None
+        Converting the decoded data to the output format
+    total: float or None
+        Whole call
+    error: Exception or None
+        Exception raised by the call
+    """
+
+    __slots__ = (
+        "reader",
+        "endpoint",
+        "types",
+        "url",
+        "status",
+        "bytes",
+        "requests",
+        "attempts",
+        "cache",
+        "build",
+        "connect",
+        "round_trip",
+        "download",
+        "decode",
+        "convert",
+        "total",
+        "error",
+        "started",
+    )
+
+    _TIMINGS = ("build", "connect", "round_trip", "download", "decode", "convert")
+
+    def __init__(self, reader, endpoint, url, types=None):
+        self.reader = reader
+        self.endpoint = endpoint
+        self.types = types
+        self.url = url
+        self.status = None
+        self.bytes = None
+        self.requests = 0
+        self.attempts = 0
+        self.cache = None
+        self.build = None
+        self.connect = None
+        self.round_trip = None
+        self.download = None
+        self.decode = None
+        self.convert = None
+        self.total = None
+        self.error = None
+        self.started = time.perf_counter()
+
+    def __repr__(self):
+        timings = ", ".join(
+            "%s=%.6f" % (name, getattr(self, name))
+            for name in self._TIMINGS + ("total",)
+            if getattr(self, name) is not None
+        )
+        return "{}({}, {})".format(self.__class__.__name__, self.label, timings)
+
+    @property
+    def retries(self):
+        """Number of attempts which were retries of a failed attempt"""
+        return self.attempts - self.requests
+
+    @property
+    def label(self):
+        """Endpoint label, with the batch types if any (e.g.
+        ``stock/market/batch[quote]``)"""
+        if self.types:
+            return "%s[%s]" % (self.endpoint, self.types)
+        return self.endpoint
+
+    def as_dict(self):
+        """The event as a dict (e.g. for structured logging)"""
+        out = {name: getattr(self, name) for name in self.__slots__}
+        del out["started"]
+        out["label"] = self.label
+        return out
+
+    def finish(self, hooks, convert=None, error=None):
+        """Records the conversion time or error and calls ``hooks``
+
+        Exceptions raised by hooks are logged, and never propagated to the
+        caller of the reader.
+        """
+        self.convert = convert
+        self.error = error
+        self.total = time.perf_counter() - self.started
+        for hook in hooks:
+            try:
+                hook(self)
+            except Exception:
+                logger.exception("Request hook %r failed" % (hook,))
@@ -35,6 +35,37 @@ class IEXAuthenticationError(Exception):
         return self.msg
 
 
+class IEXMessageBudgetError(Exception):
+    """
+    This error is thrown when a request would exceed the message budget of a
+    client.
+    """
+
+    def __init__(self, used, budget, estimate=0):
+        self.used = used
+        self.budget = budget
+        self.estimate = estimate
+
+    def __str__(self):
+        return (
+            "The message budget has been exceeded: {} of {} messages used "
+            "({} more requested).".format(self.used, self.budget, self.estimate)
+        )
+
+
+class IEXReplayMissError(Exception):
+    """
+    This error is thrown when a request has no recorded response in the
+    archive being replayed.
+    """
+
+    def __init__(self, key):
+        self.key = key
+
+    def __str__(self):
+        return "No recorded response for {}.".format(self.key)
+
+
 class ImmediateDeprecationError(Exception):
     def __init__(self, endpoint):
         self.endpoint = endpoint
@@ -0,0 +1,179 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from iexfinance.utils.exceptions import IEXMessageBudgetError
+
+logger = logging.getLogger(__name__)
+
+MESSAGES_HEADER = "iexcloud-messages-used"
+
+
+class MessageMeter(object):
+    """
+    Accounts for the IEX Cloud message credits used by a client
+
+    Credits are read from the ``iexcloud-messages-used`` header of every
+    successful response and accumulated in total, per endpoint (URL template,
+    e.g. ``stock/market/batch``) and per symbol batch.
+
+    An optional ``budget`` caps the number of messages which may be used.
+    Once it is reached, new requests either raise ``IEXMessageBudgetError``
+    (``on_exceeded="raise"``) or wait until the budget is raised or the meter
+    is reset, for instance at the start of a new billing month
+    (``on_exceeded="defer"``).
+
+    Parameters
+    ----------
+    budget: int, optional
+        Maximum number of messages. Defaults to no budget.
+    on_exceeded: str, default "raise", optional
+        ``raise`` or ``defer``
+    defer_timeout: float, optional
+        Maximum time (seconds) a deferred request waits before raising
+        ``IEXMessageBudgetError``. Defaults to waiting indefinitely.
+    """
+
+    _ON_EXCEEDED = ("raise", "defer")
+
+    def __init__(self, budget=None, on_exceeded="raise", defer_timeout=None):
+        if on_exceeded not in self._ON_EXCEEDED:
+            raise ValueError("on_exceeded must be either raise or defer")
+        self.budget = budget
+        self.on_exceeded = on_exceeded
+        self.defer_timeout = defer_timeout
+        self._cond = threading.Condition()
+        self._reset()
+
+    def __repr__(self):
+        return "{}(used={}, budget={})".format(
+            self.__class__.__name__, self.used, self.budget
+        )
+
+    def _reset(self, used=0):
+        self.used = used
+        self.requests = 0
+        self.by_endpoint = defaultdict(int)
+        self.by_batch = defaultdict(int)
+
+    def record(self, messages, endpoint=None, symbols=None):
+        """Adds used messages to the running totals
+
+        Parameters
+        ----------
+        messages: int
+            Messages used by a request
+        endpoint: str, optional
+            URL template of the endpoint requested
+        symbols: str, optional
+            Comma-separated symbols of a batch request
+        """
+        with self._cond:
+            self.used += messages
+            self.requests += 1
+            if endpoint is not None:
+                self.by_endpoint[endpoint] += messages
+            if symbols:
+                self.by_batch[symbols] += messages
+
+    def record_response(self, response, endpoint=None, symbols=None):
+        """Records the messages used by a ``requests.Response``
+
+        Returns
+        -------
+        int or None
+            Messages used, or None if the response has no message header
+        """
+        try:
+            messages = int(response.headers[MESSAGES_HEADER])
+        except (KeyError, TypeError, ValueError):
+            logger.info("MESSAGES USED: N/A")
+            return None
+        logger.info("MESSAGES USED: %s" % messages)
+        self.record(messages, endpoint=endpoint, symbols=symbols)
+        return messages
+
+    @property
+    def remaining(self):
+        """Messages left in the budget (None if there is no budget)"""
+        if self.budget is None:
+            return None
+        return max(self.budget - self.used, 0)
+
+    def _exceeded(self, estimate):
+        if self.budget is None:
+            return False
+        if estimate:
+            return self.used + estimate > self.budget
+        return self.used >= self.budget
+
+    def check(self, estimate=0):
+        """Ensures that a request fits in the budget
+
+        Called before every request. If the budget is exhausted (or would be
+        by a request estimated to cost ``estimate`` messages), either raises
+        or waits, depending on ``on_exceeded``.
+
+        Raises
+        ------
+        IEXMessageBudgetError
+            If the budget is exceeded and requests are not deferred (or
+            ``defer_timeout`` elapsed)
+        """
+        with self._cond:
+            if not self._exceeded(estimate):
+                return
+            if self.on_exceeded == "defer":
+                logger.warning("Message budget exhausted, deferring request")
+                deadline = None
+                if self.defer_timeout is not None:
+                    deadline = time.monotonic() + self.defer_timeout
+                while self._exceeded(estimate):
+                    timeout = None
+                    if deadline is not None:
+                        timeout = deadline - time.monotonic()
+                        if timeout <= 0:
+                            break
+                    self._cond.wait(timeout)
+                else:
+                    return
+            raise IEXMessageBudgetError(self.used, self.budget, estimate)
+
+    def set_budget(self, budget):
+        """Changes the budget, releasing deferred requests if it allows"""
+        with self._cond:
+            self.budget = budget
+            self._cond.notify_all()
+
+    def reset(self, used=0):
+        """Clears the totals (e.g. at the start of a billing month)
+
+        Parameters
+        ----------
+        used: int, default 0, optional
+            Messages already used, e.g. from
+            ``iexfinance.account.get_usage``
+        """
+        with self._cond:
+            self._reset(used)
+            self._cond.notify_all()
+
+    def totals(self):
+        """Snapshot of the running totals
+
+        Returns
+        -------
+        dict
+            ``used``, ``requests``, ``budget``, ``remaining``,
+            ``by_endpoint`` and ``by_batch``
+        """
+        with self._cond:
+            return {
+                "used": self.used,
+                "requests": self.requests,
+                "budget": self.budget,
+                "remaining": self.remaining,
+                "by_endpoint": dict(self.by_endpoint),
+                "by_batch": dict(self.by_batch),
+            }
@@ -0,0 +1,317 @@
+import bisect
+import threading
+from collections import defaultdict
+
+# Upper bounds (seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram(object):
+    """
+    Cumulative-bucket histogram of observations (Prometheus style)
+
+    Parameters
+    ----------
+    buckets: tuple of float
+        Sorted upper bounds of the buckets. An implicit ``+Inf`` bucket
+        catches larger observations.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Estimates a quantile by linear interpolation within its bucket
+        (like PromQL's ``histogram_quantile``)
+
+        Returns
+        -------
+        float or None
+            Estimated quantile, ``None`` if there are no observations
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if cumulative + count >= rank and count:
+                if i == len(self.buckets):
+                    # no upper bound: report the largest finite bound
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return ",".join('%s="%s"' % (k, _escape(v)) for k, v in sorted(labels.items()))
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry(object):
+    """
+    In-process metrics aggregated per endpoint URL template
+
+    The registry is fed with the ``RequestEvent`` of every reader call (see
+    ``record``) and keeps, per endpoint (e.g. ``stock/market/batch``):
+
+    - the number of calls, of requests sent and of retries
+    - the number of errors, by HTTP status (or exception name for connection
+      errors and timeouts)
+    - the number of calls served from a cache, by cache
+    - the number of response bytes received
+    - a histogram of call latencies, from which p50, p95 and p99 are
+      estimated
+
+    ``render`` exports the metrics in the Prometheus text exposition format,
+    which ``serve`` makes available to a local scraper over HTTP.
+
+    Parameters
+    ----------
+    buckets: tuple of float, optional
+        Upper bounds (seconds) of the latency histogram buckets
+    namespace: str, default "iexfinance", optional
+        Prefix of the exported metric names
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, namespace="iexfinance"):
+        self.buckets = tuple(sorted(buckets))
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __repr__(self):
+        return "{}(endpoints={})".format(self.__class__.__name__, len(self.latency))
+
+    def reset(self):
+        """Clears all metrics"""
+        with self._lock:
+            self.calls = defaultdict(int)
+            self.requests = defaultdict(int)
+            self.retries = defaultdict(int)
+            self.errors = defaultdict(int)
+            self.cache_hits = defaultdict(int)
+            self.bytes = defaultdict(int)
+            self.latency = defaultdict(lambda: Histogram(self.buckets))
+
+    def record(self, event):
+        """Adds a ``RequestEvent`` to the metrics (usable as a client hook)"""
+        endpoint = event.endpoint
+        with self._lock:
+            self.calls[endpoint] += 1
+            if event.attempts:
+                self.requests[endpoint] += event.attempts
+                self.retries[endpoint] += event.retries
+            if event.error is not None:
+                status = event.status
+                if status is None or status == 200:
+                    status = type(event.error).__name__
+                self.errors[(endpoint, str(status))] += 1
+            if event.cache is not None:
+                self.cache_hits[(endpoint, event.cache)] += 1
+            if event.bytes:
+                self.bytes[endpoint] += event.bytes
+            if event.total is not None:
+                self.latency[endpoint].observe(event.total)
+
+    __call__ = record
+
+    def snapshot(self):
+        """Current metrics as a dict, keyed by endpoint
+
+        Returns
+        -------
+        dict
+            For every endpoint: ``calls``, ``requests``, ``retries``,
+            ``errors`` (by status), ``cache_hits`` (by cache), ``bytes`` and
+            the ``p50``, ``p95`` and ``p99`` latencies (seconds)
+        """
+        with self._lock:
+            out = {}
+            for endpoint, histogram in self.latency.items():
+                stats = {
+                    "calls": self.calls[endpoint],
+                    "requests": self.requests[endpoint],
+                    "retries": self.retries[endpoint],
+                    "errors": {
+                        status: count
+                        for (name, status), count in self.errors.items()
+                        if name == endpoint
+                    },
+                    "cache_hits": {
+                        cache: count
+                        for (name, cache), count in self.cache_hits.items()
+                        if name == endpoint
+                    },
+                    "bytes": self.bytes[endpoint],
+                }
+                for q in QUANTILES:
+                    stats["p%d" % (q * 100)] = histogram.quantile(q)
+                out[endpoint] = stats
+            return out
+
+    def render(self):
+        """Metrics in the Prometheus text exposition format (version 0.0.4)
+
+        Returns
+        -------
+        str
+        """
+        ns = self.namespace
+        lines = []
+
+        def family(name, kind, help_, samples):
+            lines.append("# HELP %s_%s %s" % (ns, name, help_))
+            lines.append("# TYPE %s_%s %s" % (ns, name, kind))
+            for suffix, labels, value in samples:
+                lines.append("%s_%s%s{%s} %s" % (ns, name, suffix, labels, value))
+
+        with self._lock:
+            family(
+                "calls_total",
+                "counter",
+                "Reader calls by endpoint",
+                [("", _labels(endpoint=e), n) for e, n in sorted(self.calls.items())],
+            )
+            family(
+                "requests_total",
+                "counter",
+                "HTTP requests sent (including retries) by endpoint",
+                [
+                    ("", _labels(endpoint=e), n)
+                    for e, n in sorted(self.requests.items())
+                ],
+            )
+            family(
+                "retries_total",
+                "counter",
+                "Retried requests by endpoint",
+                [("", _labels(endpoint=e), n) for e, n in sorted(self.retries.items())],
+            )
+            family(
+                "errors_total",
+                "counter",
+                "Failed calls by endpoint and status",
+                [
+                    ("", _labels(endpoint=e, status=s), n)
+                    for (e, s), n in sorted(self.errors.items())
+                ],
+            )
+            family(
+                "cache_hits_total",
+                "counter",
+                "Calls served from a cache by endpoint and cache",
+                [
+                    ("", _labels(endpoint=e, cache=c), n)
+                    for (e, c), n in sorted(self.cache_hits.items())
+                ],
+            )
+            family(
+                "response_bytes_total",
+                "counter",
+                "Response bytes received by endpoint",
+                [("", _labels(endpoint=e), n) for e, n in sorted(self.bytes.items())],
+            )
+            samples = []
+            quantiles = []
+            for endpoint, histogram in sorted(self.latency.items()):
+                cumulative = 0
+                bounds = [_number(b) for b in histogram.buckets] + ["+Inf"]
+                for bound, count in zip(bounds, histogram.counts):
+                    cumulative += count
+                    labels = _labels(endpoint=endpoint, le=bound)
+                    samples.append(("_bucket", labels, cumulative))
+                labels = _labels(endpoint=endpoint)
+                samples.append(("_sum", labels, _number(histogram.sum)))
+                samples.append(("_count", labels, histogram.count))
+                for q in QUANTILES:
+                    labels = _labels(endpoint=endpoint, quantile=q)
+                    quantiles.append(("", labels, _number(histogram.quantile(q))))
+            family(
+                "call_duration_seconds",
+                "histogram",
+                "Reader call latency by endpoint",
+                samples,
+            )
+            family(
+                "call_duration_quantile_seconds",
+                "gauge",
+                "Estimated reader call latency quantiles by endpoint",
+                quantiles,
+            )
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port=0, host="127.0.0.1"):
+        """Serves ``render`` over HTTP (at any path) from a daemon thread
+
+        Parameters
+        ----------
+        port: int, default 0, optional
+            Port to listen on. A free port is chosen by default.
+        host: str, default "127.0.0.1", optional
+            Address to listen on
+
+        Returns
+        -------
+        http.server.ThreadingHTTPServer
+            The running server (see ``server_port``; stop it with
+            ``shutdown``)
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return server
@@ -0,0 +1,112 @@
+import threading
+import time
+
+
+class RateLimiter(object):
+    """
+    Token bucket rate limiter
+
+    The bucket holds up to ``burst`` tokens and is refilled at ``rate``
+    tokens per second; each request consumes one token. Callers which find
+    the bucket empty reserve the next token and wait for it, so concurrent
+    callers are served in order at exactly ``rate`` requests per second and
+    never wait while tokens are available.
+
+    A single limiter can be shared by any number of threads and asyncio
+    tasks. Attach it to a ``Client`` (``rate_limit`` / ``burst`` or
+    ``rate_limiter`` arguments) to pace every reader using that client.
+
+    Parameters
+    ----------
+    rate: float
+        Sustained requests per second
+    burst: int, optional
+        Maximum number of requests which may be made at once after a period
+        of inactivity. Defaults to ``max(1, rate)``.
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1, rate))
+        if self.burst < 1:
+            raise ValueError("burst must be at least 1")
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.wait_time = 0.0
+
+    def __repr__(self):
+        return "{}(rate={}, burst={})".format(
+            self.__class__.__name__, self.rate, self.burst
+        )
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def _reserve(self, tokens):
+        """Takes tokens (possibly on credit) and returns the delay (seconds)
+        until they become available"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            delay = -self._tokens / self.rate
+            self.waits += 1
+            self.wait_time += delay
+            return delay
+
+    @property
+    def available(self):
+        """Number of tokens currently available"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(self._tokens, 0.0)
+
+    def try_acquire(self, tokens=1):
+        """Takes tokens if they are available now, without waiting
+
+        Returns
+        -------
+        bool
+            Whether the tokens were taken
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def acquire(self, tokens=1):
+        """Waits (blocking the current thread) until tokens are available
+
+        Returns
+        -------
+        float
+            Time waited (seconds)
+        """
+        delay = self._reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, tokens=1):
+        """Waits (without blocking the event loop) until tokens are available
+
+        Returns
+        -------
+        float
+            Time waited (seconds)
+        """
+        import asyncio
+
+        delay = self._reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
@@ -0,0 +1,233 @@
+import base64
+import datetime
+import gzip
+import io
+import json
+import os
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from iexfinance.utils.adapters import IEXHTTPAdapter
+from iexfinance.utils.exceptions import IEXReplayMissError
+
+# Path segments of API versions, which are not part of archive keys so that a
+# recording can be replayed against another version (e.g. sandbox) or host
+_VERSIONS = ("stable", "latest", "beta", "v1")
+
+# Response headers kept in archives
+_HEADERS = ("content-type", "iexcloud-messages-used", "retry-after")
+
+
+def make_key(method, url):
+    """
+    Archive key of a request: the method, the endpoint path (without host and
+    API version) and the sorted query parameters (without the token)
+    """
+    parts = urlsplit(url)
+    segments = parts.path.strip("/").split("/")
+    for i, segment in enumerate(segments):
+        if segment in _VERSIONS:
+            segments = segments[i + 1 :]
+            break
+    params = sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k != "token"
+    )
+    key = "%s %s" % (method, "/".join(segments))
+    if params:
+        key += "?" + urlencode(params)
+    return key
+
+
+class Archive(object):
+    """
+    Recorded request/response pairs
+
+    Archives are gzip-compressed JSON lines files with one record per
+    response: its key (see ``make_key``), status, selected headers, body and
+    the time the server took to respond (``elapsed``). Records are appended
+    as responses are received, and several responses for the same key are
+    replayed in the order they were recorded.
+
+    Parameters
+    ----------
+    path: str
+        Path of the archive file
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+        self.records = {}
+        self._served = {}
+        if os.path.exists(path):
+            self.load()
+
+    def __repr__(self):
+        return "{}({!r}, records={})".format(
+            self.__class__.__name__, self.path, len(self)
+        )
+
+    def __len__(self):
+        return sum(len(records) for records in self.records.values())
+
+    def load(self):
+        """Reads all records of the archive"""
+        records = {}
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    records.setdefault(record["key"], []).append(record)
+        with self._lock:
+            self.records = records
+            self._served = {}
+
+    def add(self, key, response):
+        """Appends a response to the archive
+
+        Parameters
+        ----------
+        key: str
+            Key of the request
+        response: requests.Response
+            Response (its body is read)
+        """
+        record = {
+            "key": key,
+            "status": response.status_code,
+            "headers": {
+                name: response.headers[name]
+                for name in _HEADERS
+                if name in response.headers
+            },
+            "elapsed": response.elapsed.total_seconds(),
+        }
+        try:
+            record["body"] = response.content.decode("utf-8")
+        except UnicodeDecodeError:
+            record["body_b64"] = base64.b64encode(response.content).decode("ascii")
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._lock:
+            self.records.setdefault(key, []).append(record)
+            if self._file is None:
+                # each session appends a new gzip member to the file
+                self._file = gzip.open(self.path, "ab")
+            self._file.write(line)
+
+    def next(self, key):
+        """Returns the next record for ``key``
+
+        Records for a key are served in order; the last one is repeated once
+        all have been served.
+
+        Raises
+        ------
+        IEXReplayMissError
+            If no response was recorded for ``key``
+        """
+        with self._lock:
+            records = self.records.get(key)
+            if not records:
+                raise IEXReplayMissError(key)
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+            return records[min(served, len(records) - 1)]
+
+    def rewind(self):
+        """Serves the records of every key from the first one again"""
+        with self._lock:
+            self._served = {}
+
+    def close(self):
+        """Flushes recorded responses to disk"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class RecordingAdapter(IEXHTTPAdapter):
+    """
+    Transport adapter which records every response to an ``Archive``
+
+    Accepts the parameters of ``IEXHTTPAdapter``.
+
+    Parameters
+    ----------
+    archive: Archive
+        Archive to append responses to
+    """
+
+    def __init__(self, archive, **kwargs):
+        self.archive = archive
+        super(RecordingAdapter, self).__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        response = super(RecordingAdapter, self).send(request, **kwargs)
+        # reading the body here keeps it available to iter_content, so
+        # streamed responses are recorded too (but no longer streamed)
+        self.archive.add(make_key(request.method, request.url), response)
+        return response
+
+    def close(self):
+        super(RecordingAdapter, self).close()
+        self.archive.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Transport adapter which serves responses from an ``Archive`` without
+    network access
+
+    Parameters
+    ----------
+    archive: Archive
+        Archive to serve responses from
+    latency: float or str, default 0, optional
+        Simulated time (seconds) to respond to each request, or ``recorded``
+        to wait as long as the server took when the response was recorded
+    """
+
+    def __init__(self, archive, latency=0):
+        if latency != "recorded" and not isinstance(latency, (int, float)):
+            raise ValueError("Please enter a latency in seconds or 'recorded'.")
+        self.archive = archive
+        self.latency = latency
+        super(ReplayAdapter, self).__init__()
+
+    def send(self, request, stream=False, timeout=None, **kwargs):
+        started = time.perf_counter()
+        record = self.archive.next(make_key(request.method, request.url))
+        latency = record["elapsed"] if self.latency == "recorded" else self.latency
+        if latency:
+            time.sleep(latency)
+        if "body" in record:
+            body = record["body"].encode("utf-8")
+        else:
+            body = base64.b64decode(record["body_b64"])
+
+        response = Response()
+        response.status_code = record["status"]
+        response.headers = CaseInsensitiveDict(record["headers"])
+        response.headers["Content-Length"] = str(len(body))
+        response.raw = io.BytesIO(body)
+        response.url = request.url
+        response.request = request
+        response.reason = "Replayed"
+        response.encoding = "utf-8"
+        response.elapsed = datetime.timedelta(seconds=time.perf_counter() - started)
+        if not stream:
+            response._content = body
+            response._content_consumed = True
+        return response
+
+    def close(self):
+        pass
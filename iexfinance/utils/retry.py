@@ -0,0 +1,157 @@
+import datetime
+import random
+import time
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+DEFAULT_TIMEOUT = (3.05, 30)
+
+
+class RetryPolicy(object):
+    """
+    Describes when and how failed IEX Cloud requests are retried
+
+    Only transient failures are retried: connection errors, timeouts and
+    responses with a status in ``statuses``. Permanent errors (such as
+    ``400``, ``401`` or ``404``) fail immediately. Retries wait for an
+    exponentially increasing, randomly jittered delay, or for the delay
+    requested by the server through the ``Retry-After`` header.
+
+    Parameters
+    ----------
+    retries: int, default 3, optional
+        Maximum number of retries after the first attempt
+    backoff_factor: float, default 0.5, optional
+        Base delay (seconds). The delay before retry ``n`` (starting at 0)
+        is at most ``backoff_factor * 2 ** n``.
+    max_backoff: float, default 30, optional
+        Maximum delay between two attempts (seconds)
+    jitter: bool, default True, optional
+        Randomise delays between 0 and the exponential delay ("full jitter")
+        so that concurrent clients do not retry in lockstep
+    statuses: iterable of int, default (429, 500, 502, 503, 504), optional
+        HTTP statuses which are retried
+    retry_connection_errors: bool, default True, optional
+        Whether to retry connection errors and timeouts
+    respect_retry_after: bool, default True, optional
+        Whether to wait for the delay given in a ``Retry-After`` header
+    timeout: float or tuple, default (3.05, 30), optional
+        Per-attempt ``(connect, read)`` timeout (seconds), as accepted by
+        ``requests``
+    total_timeout: float, optional
+        Deadline (seconds) for a request including all of its retries and
+        delays. Defaults to no deadline.
+    methods: iterable of str, default ("GET",), optional
+        Idempotent HTTP methods which may be retried
+    """
+
+    def __init__(
+        self,
+        retries=3,
+        backoff_factor=0.5,
+        max_backoff=30.0,
+        jitter=True,
+        statuses=RETRY_STATUSES,
+        retry_connection_errors=True,
+        respect_retry_after=True,
+        timeout=DEFAULT_TIMEOUT,
+        total_timeout=None,
+        methods=("GET",),
+    ):
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+        self.retry_connection_errors = retry_connection_errors
+        self.respect_retry_after = respect_retry_after
+        self.timeout = timeout
+        self.total_timeout = total_timeout
+        self.methods = frozenset(m.upper() for m in methods)
+
+    def __repr__(self):
+        return "{}(retries={}, backoff_factor={}, total_timeout={})".format(
+            self.__class__.__name__,
+            self.retries,
+            self.backoff_factor,
+            self.total_timeout,
+        )
+
+    def replace(self, **kwargs):
+        """Returns a copy of the policy with the given attributes replaced"""
+        new = self.__class__.__new__(self.__class__)
+        new.__dict__.update(self.__dict__)
+        for key, value in kwargs.items():
+            if key not in new.__dict__:
+                raise TypeError("Unknown retry policy attribute %s" % key)
+            setattr(new, key, value)
+        return new
+
+    def deadline(self):
+        """Returns the monotonic deadline for a new request (or None)"""
+        if self.total_timeout is None:
+            return None
+        return time.monotonic() + self.total_timeout
+
+    def attempt_timeout(self, deadline):
+        """Per-attempt timeout, shortened to fit within ``deadline``"""
+        if deadline is None:
+            return self.timeout
+        remaining = max(deadline - time.monotonic(), 0.001)
+        if isinstance(self.timeout, tuple):
+            return tuple(
+                remaining if t is None else min(t, remaining) for t in self.timeout
+            )
+        if self.timeout is None:
+            return remaining
+        return min(self.timeout, remaining)
+
+    def should_retry(self, attempt, method="GET", status=None, error=None):
+        """Whether a failed attempt (numbered from 0) may be retried
+
+        Parameters
+        ----------
+        attempt: int
+            Number of the attempt which failed
+        method: str
+            HTTP method of the request
+        status: int, optional
+            Response status of the failed attempt
+        error: Exception, optional
+            Connection error or timeout raised by the failed attempt
+        """
+        if attempt >= self.retries or method.upper() not in self.methods:
+            return False
+        if error is not None:
+            return self.retry_connection_errors
+        return status in self.statuses
+
+    def backoff(self, attempt, response=None):
+        """Delay (seconds) before retrying a failed attempt"""
+        if response is not None and self.respect_retry_after:
+            retry_after = self.parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return retry_after
+        delay = min(self.backoff_factor * (2**attempt), self.max_backoff)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    @staticmethod
+    def parse_retry_after(value):
+        """Parses a ``Retry-After`` header (delay-seconds or HTTP-date)"""
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        from email.utils import parsedate_to_datetime
+
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=datetime.timezone.utc)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return max((date - now).total_seconds(), 0.0)
@@ -0,0 +1,143 @@
+import threading
+
+
+class _Call(object):
+    __slots__ = ("event", "value", "error", "dups")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+        self.dups = 0
+
+
+class SingleFlight(object):
+    """
+    Coalesces concurrent calls which share a key into a single call
+
+    The first caller for a key (the leader) runs the function. Callers which
+    arrive with the same key while it is running wait for it and receive its
+    result, or its exception, instead of running the function themselves.
+    Calls made after the leader has finished start a new call.
+
+    ``do`` coalesces calls from threads (including calls made from asyncio
+    code through ``loop.run_in_executor``), ``do_async`` coalesces coroutine
+    calls made from tasks of the same event loop.
+
+    Attributes
+    ----------
+    calls: int
+        Number of calls which ran the function
+    saved: int
+        Number of calls which were served by another call's result
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._futures = {}
+        self.calls = 0
+        self.saved = 0
+
+    def __repr__(self):
+        return "{}(calls={}, saved={})".format(
+            self.__class__.__name__, self.calls, self.saved
+        )
+
+    def do(self, key, fn, *args, **kwargs):
+        """Runs ``fn(*args, **kwargs)`` unless a call with the same key is
+        already running, in which case its result is awaited
+
+        Parameters
+        ----------
+        key: hashable
+            Key identifying identical calls
+        fn: callable
+            Function to run
+
+        Returns
+        -------
+        tuple
+            ``(value, shared)``, where ``shared`` is whether the value was
+            delivered to more than one caller
+
+        Raises
+        ------
+        Exception
+            Any exception raised by the coalesced call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                call.dups += 1
+                self.saved += 1
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+        try:
+            call.value = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                shared = call.dups > 0
+            call.event.set()
+        return call.value, shared
+
+    async def do_async(self, key, fn, *args, **kwargs):
+        """Awaits ``fn(*args, **kwargs)`` unless a call with the same key is
+        already running on the current event loop, in which case its result
+        is awaited
+
+        Parameters
+        ----------
+        key: hashable
+            Key identifying identical calls
+        fn: coroutine function
+            Coroutine function to await
+
+        Returns
+        -------
+        tuple
+            ``(value, shared)`` (see ``do``)
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._futures.get((loop, key))
+            leader = entry is None
+            if leader:
+                entry = self._futures[(loop, key)] = [loop.create_future(), 0]
+                self.calls += 1
+            else:
+                entry[1] += 1
+                self.saved += 1
+        future = entry[0]
+        if not leader:
+            # a cancelled follower must not cancel the shared call
+            return await asyncio.shield(future), True
+        try:
+            value = await fn(*args, **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # mark the exception as retrieved when nobody else awaits it
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            with self._lock:
+                del self._futures[(loop, key)]
+        return value, entry[1] > 0
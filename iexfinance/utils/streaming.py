@@ -0,0 +1,101 @@
+import codecs
+import json
+import re
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+\-]*")
+
+# Parser states
+_START, _FIRST, _NEXT, _VALUE, _DONE = range(5)
+
+
+def iter_json_array(chunks, chunk_size=10000, parse_int=None, parse_float=None):
+    """
+    Incrementally parses a JSON array
+
+    The array is read from an iterable of byte strings (such as
+    ``requests.Response.iter_content``) and its elements are yielded in lists
+    of up to ``chunk_size`` elements, as soon as they have been read. Only the
+    current list and the unparsed end of the last byte string are held in
+    memory, whatever the size of the array.
+
+    Parameters
+    ----------
+    chunks: iterable of bytes
+        UTF-8 encoded JSON array, split at arbitrary positions
+    chunk_size: int, default 10000, optional
+        Maximum number of elements per yielded list
+    parse_int: callable, optional
+        Integer parsing hook (see ``json.loads``)
+    parse_float: callable, optional
+        Floating point parsing hook (see ``json.loads``)
+
+    Yields
+    ------
+    list
+        Consecutive elements of the array
+
+    Raises
+    ------
+    ValueError
+        If the input is not a JSON array or is truncated
+    """
+    decoder = json.JSONDecoder(parse_int=parse_int, parse_float=parse_float)
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    eof = False
+
+    def read():
+        nonlocal eof
+        for data in chunks:
+            text = text_decoder.decode(data)
+            if text:
+                return text
+        eof = True
+        return text_decoder.decode(b"", final=True)
+
+    buf, pos, state, items = "", 0, _START, []
+    while state != _DONE:
+        pos = _WHITESPACE.match(buf, pos).end()
+        if pos == len(buf):
+            if eof:
+                raise ValueError("Truncated JSON array")
+            buf, pos = read(), 0
+            continue
+        char = buf[pos]
+        if state == _START:
+            if char != "[":
+                raise ValueError("Expected a JSON array")
+            pos += 1
+            state = _FIRST
+        elif char == "]" and state in (_FIRST, _NEXT):
+            pos += 1
+            state = _DONE
+        elif state == _NEXT:
+            if char != ",":
+                raise ValueError("Expected ',' or ']' at position %s" % pos)
+            pos += 1
+            state = _VALUE
+        else:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                end = None
+            # A number ending with (or followed by number characters up to)
+            # the end of the buffer may continue in the next chunk, so wait
+            # for more input before accepting it
+            if end is None or (
+                not eof and _NUMBER_TAIL.match(buf, end).end() == len(buf)
+            ):
+                buf, pos = buf[pos:] + read(), 0
+                continue
+            items.append(value)
+            pos = end
+            state = _NEXT
+            if len(items) >= chunk_size:
+                yield items
+                items = []
+    if items:
+        yield items